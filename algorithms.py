@@ -1,217 +1,122 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-from collections import deque
-import heapq
+import os
+import re
+import engine
+from engine import TRACE_FULL, TRACE_SUMMARY, PrintTracer
+from engine.csr import build_csr
+from engine.kpaths import KShortestPaths as _KShortestPaths
+from engine.landmarks import landmarks_for
+from engine.layout import LAYOUT_MAX_NODES, layout_for, level_of_detail, view_positions
+from engine.loaders import load_graph
+from engine.mst import MST as _MST
 
-class Graph:
+# Đồ thị lớn hơn ngưỡng này (số đỉnh + số cạnh) chỉ in bước tóm tắt và chỉ vẽ
+# đường đi, các đỉnh lân cận và các cụm gộp (level of detail)
+LARGE_GRAPH_LIMIT = 2000
+# Chỉ ghi trọng số lên hình khi số cạnh được vẽ không quá ngưỡng này
+EDGE_LABEL_LIMIT = 50
+
+# Đặt GRAPH_EXPORT_DIR để lưu hình ra tệp (GRAPH_EXPORT_FORMAT: png hoặc svg) thay vì mở cửa sổ
+EXPORT_DIR = os.environ.get('GRAPH_EXPORT_DIR')
+EXPORT_FORMAT = os.environ.get('GRAPH_EXPORT_FORMAT', 'png')
+
+class Graph(engine.Graph):
     """Base class for graph representation and visualization."""
-    def __init__(self, num_nodes):
-        if num_nodes <= 0:
-            raise ValueError("Number of nodes must be positive")
-        self.num_nodes = num_nodes
-        self.graph = [[] for _ in range(num_nodes)]
-        self.edges = []
+    def visualize_path(self, path, title="Graph Path", output=None, layout_file=None, tree_edges=None):
+        """Visualize the graph with the given path (or ``tree_edges``, e.g. a spanning tree) highlighted.
 
-    def add_edge(self, u, v, weight=1):
-        """Add an undirected edge to the graph."""
-        if not (0 <= u < self.num_nodes and 0 <= v < self.num_nodes):
-            raise ValueError(f"Nodes must be between 0 and {self.num_nodes - 1}")
-        if weight < 0:
-            raise ValueError("Edge weight cannot be negative")
-        self.graph[u].append((v, weight))
-        self.graph[v].append((u, weight))  # Undirected graph
-        self.edges.append((u, v, weight))
+        Node positions are computed once per graph (kept in memory, and in
+        ``layout_file`` if given). Graphs above LARGE_GRAPH_LIMIT are drawn as
+        a level-of-detail view. With ``output`` (or GRAPH_EXPORT_DIR) the
+        figure is saved as PNG/SVG instead of shown, so no display is needed.
+        """
+        # Thư viện vẽ chỉ được nạp ở lần vẽ đầu tiên để CLI khởi động nhanh
+        import networkx as nx
+        from matplotlib.figure import Figure
+        if output is None and EXPORT_DIR:
+            name = re.sub(r'\W+', '_', title).strip('_').lower() or 'graph'
+            output = os.path.join(EXPORT_DIR, f"{name}.{EXPORT_FORMAT}")
+        csr = (self.graph, self.edges) if self.frozen else build_csr(self.num_nodes, self.edges)
+        positions = None
+        if self.num_nodes <= LAYOUT_MAX_NODES:
+            positions = layout_for(layout_file, self.num_nodes, csr)
 
-    def visualize_path(self, path, title="Graph Path"):
-        """Visualize the graph with the given path highlighted."""
         G = nx.Graph()
-        for u, v, w in self.edges:
-            G.add_edge(u, v, weight=w)
+        clusters = []
+        if self.num_nodes + len(self.edges) <= LARGE_GRAPH_LIMIT:
+            G.add_nodes_from(range(self.num_nodes))
+            for u, v, w in self.edges:
+                G.add_edge(u, v, weight=w)
+            pos = {u: positions[u] for u in range(self.num_nodes)}
+        else:
+            view = level_of_detail(self.num_nodes, csr, path)
+            G.add_nodes_from(view.nodes)
+            for u, v, w in view.edges:
+                G.add_edge(u, v, weight=w)
+            pos, placed = view_positions(view, positions)
+            for i, ((anchor, size), xy) in enumerate(zip(view.clusters, placed)):
+                clusters.append((f"c{i}", anchor, size))
+                pos[f"c{i}"] = xy
+            title += f" ({len(view.nodes)}/{self.num_nodes} đỉnh)"
 
-        pos = nx.spring_layout(G, seed=42)
-        plt.figure(figsize=(8, 6))
-        nx.draw(G, pos, with_labels=True, node_color='lightblue', node_size=800, font_size=12, font_weight='bold')
-        labels = nx.get_edge_attributes(G, 'weight')
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=labels, font_color='black')
+        # Xuất tệp dùng Figure trực tiếp (không qua pyplot) nên không bao giờ mở cửa sổ
+        if output:
+            fig = Figure(figsize=(8, 6))
+        else:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        small = G.number_of_nodes() <= 50
+        nx.draw(G, pos, ax=ax, with_labels=small, node_color='lightblue', node_size=800 if small else 60,
+                font_size=12, font_weight='bold')
+        if G.number_of_edges() <= EDGE_LABEL_LIMIT:
+            labels = nx.get_edge_attributes(G, 'weight')
+            nx.draw_networkx_edge_labels(G, pos, edge_labels=labels, font_color='black', ax=ax)
+        if clusters:
+            # Mỗi cụm gộp các đỉnh ẩn đi qua đỉnh neo của nó; kích thước theo số đỉnh trong cụm
+            C = nx.Graph()
+            C.add_edges_from((name, anchor) for name, anchor, _ in clusters)
+            nx.draw_networkx_edges(C, pos, ax=ax, style='dashed', edge_color='lightgray')
+            nx.draw_networkx_nodes(C, pos, ax=ax, nodelist=[name for name, _, _ in clusters],
+                                   node_color='lightgray', node_size=[60 + 20 * size ** 0.5 for _, _, size in clusters])
+            nx.draw_networkx_labels(C, pos, ax=ax, labels={name: str(size) for name, _, size in clusters}, font_size=8)
 
         if path:
-            path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-            nx.draw_networkx_edges(G, pos, edgelist=path_edges, edge_color='red', width=3)
-        plt.title(title, fontsize=14)
-        plt.show()
+            # Đồ thị lớn có thể chỉ giữ một phần đường đi: bỏ các cạnh có đỉnh không được vẽ
+            path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)
+                          if G.has_node(path[i]) and G.has_node(path[i + 1])]
+            nx.draw_networkx_edges(G, pos, edgelist=path_edges, edge_color='red', width=3, ax=ax)
+        if tree_edges:
+            # Đồ thị lớn chỉ vẽ một phần: tô các cạnh của cây nằm trong phần được vẽ
+            tree = [(u, v) for u, v, _ in tree_edges if G.has_edge(u, v)]
+            nx.draw_networkx_edges(G, pos, edgelist=tree, edge_color='red', width=3, ax=ax)
+        ax.set_title(title, fontsize=14)
+        if output:
+            fig.savefig(output)
+            print(f"Đã lưu hình: {output}")
+        else:
+            plt.show()
 
-class BFS(Graph):
+# Thuật toán nằm trong engine (dùng chung với api.py); CLI chỉ thêm phần hiển thị.
+class BFS(engine.BFS, Graph):
     """Breadth-First Search implementation."""
-    def bfs(self, start):
-        if not (0 <= start < self.num_nodes):
-            raise ValueError(f"Start node must be between 0 and {self.num_nodes - 1}")
-        visited = [False] * self.num_nodes
-        queue = deque([start])
-        visited[start] = True
-        path = []
-        step = 0
-        print(f"\nBước 1: Đặt đỉnh bắt đầu {start} vào hàng đợi và đánh dấu đã thăm.")
-        while queue:
-            current = queue.popleft()
-            path.append(current)
-            step += 1
-            print(f"\nBước {step+1}: Lấy đỉnh {current} ra khỏi hàng đợi, duyệt các đỉnh kề:")
-            for neighbor, _ in self.graph[current]:
-                if not visited[neighbor]:
-                    visited[neighbor] = True
-                    queue.append(neighbor)
-                    print(f"  → Thêm đỉnh {neighbor} vào hàng đợi và đánh dấu đã thăm.")
-        print(f"\nKết thúc BFS. Số bước duyệt: {len(path)}")
-        print(f"Số đỉnh đã duyệt: {len(path)}")
-        print(f"Thứ tự duyệt: {path}\n")
-        return path
 
-class DFS(Graph):
+class DFS(engine.DFS, Graph):
     """Depth-First Search implementation."""
-    def dfs(self, start):
-        if not (0 <= start < self.num_nodes):
-            raise ValueError(f"Start node must be between 0 and {self.num_nodes - 1}")
-        visited = [False] * self.num_nodes
-        path = []
-        step = 0
-        def dfs_visit(u):
-            nonlocal step
-            visited[u] = True
-            path.append(u)
-            step += 1
-            print(f"\nBước {step}: Đến đỉnh {u}, duyệt các đỉnh kề:")
-            for v, _ in self.graph[u]:
-                if not visited[v]:
-                    print(f"  → Đi sâu đến đỉnh {v} từ đỉnh {u}.")
-                    dfs_visit(v)
-        print(f"\nBắt đầu DFS từ đỉnh {start}.")
-        dfs_visit(start)
-        print(f"\nKết thúc DFS. Số bước duyệt: {len(path)}")
-        print(f"Số đỉnh đã duyệt: {len(path)}")
-        print(f"Thứ tự duyệt: {path}\n")
-        return path
 
-class Dijkstra(Graph):
+class Dijkstra(engine.Dijkstra, Graph):
     """Dijkstra's algorithm implementation for shortest paths."""
-    def dijkstra(self, start):
-        if not (0 <= start < self.num_nodes):
-            raise ValueError(f"Start node must be between 0 and {self.num_nodes - 1}")
-        dist = [float('inf')] * self.num_nodes
-        dist[start] = 0
-        prev = [-1] * self.num_nodes
-        heap = [(0, start)]
-        visited_count = 0
-        update_count = 0
-        print(f"\nKhởi tạo khoảng cách từ đỉnh {start} đến các đỉnh khác là vô cùng, riêng {start} là 0.")
-        while heap:
-            d, u = heapq.heappop(heap)
-            if d > dist[u]:
-                continue
-            visited_count += 1
-            print(f"\nXét đỉnh {u} với khoảng cách hiện tại {d}.")
-            for v, w in self.graph[u]:
-                if dist[v] > dist[u] + w:
-                    dist[v] = dist[u] + w
-                    prev[v] = u
-                    heapq.heappush(heap, (dist[v], v))
-                    update_count += 1
-                    print(f"  → Cập nhật khoảng cách đến đỉnh {v}: {dist[v]} (qua {u})")
-        print(f"\nKết thúc Dijkstra. Số đỉnh đã xét: {visited_count}")
-        print(f"Số lần cập nhật khoảng cách: {update_count}\n")
-        return dist, prev
-
-    def reconstruct_path(self, prev, target):
-        """Reconstruct the shortest path from start to target."""
-        if not (0 <= target < self.num_nodes):
-            raise ValueError(f"Target node must be between 0 and {self.num_nodes - 1}")
-        path = []
-        while target != -1:
-            path.append(target)
-            target = prev[target]
-        path = path[::-1]
-        return path if path[0] == prev[path[0]] else []
 
-class BellmanFord(Graph):
+class BellmanFord(engine.BellmanFord, Graph):
     """Bellman-Ford algorithm implementation for shortest paths."""
-    def bellman_ford(self, start):
-        if not (0 <= start < self.num_nodes):
-            raise ValueError(f"Start node must be between 0 and {self.num_nodes - 1}")
-        dist = [float('inf')] * self.num_nodes
-        dist[start] = 0
-        prev = [-1] * self.num_nodes
-        update_count = 0
-        print(f"\nKhởi tạo khoảng cách từ đỉnh {start} đến các đỉnh khác là vô cùng, riêng {start} là 0.")
-        for i in range(self.num_nodes - 1):
-            print(f"\nLặp lần thứ {i+1}:")
-            for u, v, w in self.edges:
-                if dist[u] + w < dist[v]:
-                    dist[v] = dist[u] + w
-                    prev[v] = u
-                    update_count += 1
-                    print(f"  → Cập nhật khoảng cách: {u} → {v} = {dist[v]}")
-                if dist[v] + w < dist[u]:
-                    dist[u] = dist[v] + w
-                    prev[u] = v
-                    update_count += 1
-                    print(f"  → Cập nhật khoảng cách: {v} → {u} = {dist[u]}")
-        # Check for negative cycles
-        for u, v, w in self.edges:
-            if dist[u] + w < dist[v]:
-                print("\nĐồ thị có chu trình âm!")
-                return None, None
-        print(f"\nKết thúc Bellman-Ford. Số lần cập nhật khoảng cách: {update_count}\n")
-        return dist, prev
-
-    def reconstruct_path(self, prev, target):
-        """Reconstruct the shortest path from start to target."""
-        if not (0 <= target < self.num_nodes):
-            raise ValueError(f"Target node must be between 0 and {self.num_nodes - 1}")
-        path = []
-        while target != -1:
-            path.append(target)
-            target = prev[target]
-        path = path[::-1]
-        return path if path[0] == prev[path[0]] else []
 
-class AStar(Graph):
+class AStar(engine.AStar, Graph):
     """A* algorithm implementation for shortest path with heuristic."""
-    def __init__(self, num_nodes, heuristic):
-        super().__init__(num_nodes)
-        if len(heuristic) != num_nodes:
-            raise ValueError(f"Heuristic list must have {num_nodes} values")
-        self.heuristic = heuristic
-    def a_star(self, start, goal):
-        if not (0 <= start < self.num_nodes and 0 <= goal < self.num_nodes):
-            raise ValueError(f"Start and goal nodes must be between 0 and {self.num_nodes - 1}")
-        open_set = [(self.heuristic[start], 0, start, -1)]  # (f, g, node, parent)
-        visited = {}
-        step = 0
-        print(f"\nKhởi tạo: Đưa đỉnh bắt đầu {start} vào hàng đợi ưu tiên với heuristic = {self.heuristic[start]}.")
-        while open_set:
-            f, g, current, parent = heapq.heappop(open_set)
-            if current in visited:
-                continue
-            visited[current] = parent
-            step += 1
-            print(f"\nBước {step}: Lấy đỉnh {current} ra khỏi hàng đợi (f = {f}, g = {g}).")
-            if current == goal:
-                print(f"  → Đã đến đỉnh đích {goal}.")
-                break
-            for neighbor, weight in self.graph[current]:
-                if neighbor not in visited:
-                    new_g = g + weight
-                    new_f = new_g + self.heuristic[neighbor]
-                    heapq.heappush(open_set, (new_f, new_g, neighbor, current))
-                    print(f"  → Thêm đỉnh {neighbor} vào hàng đợi với f = {new_f} (g = {new_g}, heuristic = {self.heuristic[neighbor]}).")
-        # Truy vết đường đi
-        path = []
-        node = goal
-        while node != -1:
-            path.append(node)
-            node = visited.get(node, -1)
-        path = path[::-1]
-        print(f"\nKết thúc A*. Số bước mở rộng đỉnh: {step}")
-        return path if path[0] == start else []
+
+class MST(_MST, Graph):
+    """Kruskal and Prim minimum spanning tree implementation."""
+
+class KShortestPaths(_KShortestPaths, Graph):
+    """Yen's algorithm implementation for the k shortest loopless paths."""
 
 def create_graph(num_nodes, edges):
     """Create a graph instance based on the algorithm choice."""
@@ -259,7 +164,9 @@ def input_edges(num_edges, num_nodes, allow_negative_weights=True):
 def input_heuristic(num_nodes):
     while True:
         try:
-            s = input(f"Enter heuristic values for {num_nodes} nodes (space-separated): ").split()
+            s = input(f"Enter heuristic values for {num_nodes} nodes (space-separated, empty = landmarks): ").split()
+            if not s:
+                return None  # A* tự tính cận dưới bằng landmark
             if len(s) != num_nodes:
                 print(f"Expected {num_nodes} heuristic values.")
                 continue
@@ -271,6 +178,22 @@ def input_heuristic(num_nodes):
         except ValueError:
             print("Invalid input. Please enter integers only.")
 
+def input_heuristic_file(num_nodes):
+    while True:
+        path = input("Tệp heuristic (Enter = tự động tính bằng landmark): ").strip()
+        if not path:
+            return None
+        try:
+            with open(path) as f:
+                heuristic = [int(x) for x in f.read().split()]
+        except (OSError, ValueError) as e:
+            print("Không đọc được tệp heuristic:", e)
+            continue
+        if len(heuristic) != num_nodes or any(h < 0 for h in heuristic):
+            print(f"Tệp phải có đúng {num_nodes} số nguyên không âm.")
+            continue
+        return heuristic
+
 def run():
     while True:
         try:
@@ -280,105 +203,179 @@ def run():
             print("3. Dijkstra (đầu vào: số đỉnh, cạnh có trọng số >= 0, đỉnh bắt đầu, đỉnh kết thúc)")
             print("4. Bellman-Ford (đầu vào: số đỉnh, cạnh có trọng số bất kỳ, đỉnh bắt đầu, đỉnh kết thúc)")
             print("5. A* (đầu vào: số đỉnh, cạnh có trọng số >= 0, heuristic, đỉnh bắt đầu, đỉnh kết thúc)")
+            print("6. Kruskal - cây khung nhỏ nhất (đầu vào: số đỉnh, cạnh có trọng số bất kỳ)")
+            print("7. Prim - cây khung nhỏ nhất (đầu vào: số đỉnh, cạnh có trọng số bất kỳ, đỉnh bắt đầu)")
+            print("8. Yen - k đường đi ngắn nhất (đầu vào: số đỉnh, cạnh có trọng số >= 0, đỉnh bắt đầu, đỉnh kết thúc, k)")
             print("\nLưu ý: Các đỉnh được đánh số từ 0 đến n-1.")
-            choice = input_int("Nhập lựa chọn thuật toán (1-5): ", 1, 5)
+            choice = input_int("Nhập lựa chọn thuật toán (1-8): ", 1, 8)
 
-            print("\nNhập số đỉnh của đồ thị (n > 0):")
-            num_nodes = input_int("Số đỉnh: ", 1)
-            print("\nNhập số cạnh của đồ thị (>= 0):")
-            num_edges = input_int("Số cạnh: ", 0)
+            print("\nNạp đồ thị từ tệp? Nhập đường dẫn tệp edge list (SNAP/CSV/TSV: u v [weight]")
+            print("mỗi dòng) hoặc tệp nhị phân, để trống rồi Enter để nhập tay.")
+            graph_file = input("Tệp đồ thị: ").strip()
+            if graph_file:
+                num_nodes, csr = load_graph(graph_file)
+                edges = csr[1]
+                print(f"Đã nạp đồ thị: {num_nodes} đỉnh, {len(edges)} cạnh.")
+            else:
+                csr = None
+                print("\nNhập số đỉnh của đồ thị (n > 0):")
+                num_nodes = input_int("Số đỉnh: ", 1)
+                print("\nNhập số cạnh của đồ thị (>= 0):")
+                num_edges = input_int("Số cạnh: ", 0)
 
-            allow_negative_weights = (choice == 4)
-            if choice in [3, 5]:
-                print("Lưu ý: Không được nhập cạnh có trọng số âm cho Dijkstra hoặc A*.")
-            print("\nNhập từng cạnh theo định dạng: u v weight")
-            print("  - u, v là hai đỉnh (0 <= u, v < n)")
-            print("  - weight là trọng số của cạnh (số nguyên)")
-            print("Ví dụ: 0 1 5 (cạnh nối từ đỉnh 0 đến đỉnh 1, trọng số 5)")
-            edges = input_edges(num_edges, num_nodes, allow_negative_weights=allow_negative_weights)
+                allow_negative_weights = choice in [4, 6, 7]
+                if choice in [3, 5, 8]:
+                    print("Lưu ý: Không được nhập cạnh có trọng số âm cho Dijkstra, A* hoặc Yen.")
+                print("\nNhập từng cạnh theo định dạng: u v weight")
+                print("  - u, v là hai đỉnh (0 <= u, v < n)")
+                print("  - weight là trọng số của cạnh (số nguyên)")
+                print("Ví dụ: 0 1 5 (cạnh nối từ đỉnh 0 đến đỉnh 1, trọng số 5)")
+                edges = input_edges(num_edges, num_nodes, allow_negative_weights=allow_negative_weights)
 
-            # Hiển thị cấu trúc graph dạng dict
-            graph_dict = {i: [] for i in range(num_nodes)}
-            for u, v, w in edges:
-                graph_dict[u].append((v, w))
-                graph_dict[v].append((u, w))  # Đồ thị vô hướng
-            print("\nCấu trúc đồ thị bạn vừa nhập:")
-            print("graph = {")
-            for k in graph_dict:
-                print(f"    {k}: {graph_dict[k]},")
-            print("}")
+                # Hiển thị cấu trúc graph dạng dict
+                graph_dict = {i: [] for i in range(num_nodes)}
+                for u, v, w in edges:
+                    graph_dict[u].append((v, w))
+                    graph_dict[v].append((u, w))  # Đồ thị vô hướng
+                print("\nCấu trúc đồ thị bạn vừa nhập:")
+                print("graph = {")
+                for k in graph_dict:
+                    print(f"    {k}: {graph_dict[k]},")
+                print("}")
+            large = num_nodes + len(edges) > LARGE_GRAPH_LIMIT
+            # Bố cục hình vẽ lưu cạnh tệp đồ thị, lần chạy sau không phải tính lại
+            layout_file = graph_file + '.layout' if graph_file else None
+            tracer = PrintTracer(TRACE_SUMMARY if large else TRACE_FULL)
 
             if choice in [1, 2]:
                 print("\nNhập đỉnh bắt đầu (0 <= start < n):")
                 start = input_int("Đỉnh bắt đầu: ", 0, num_nodes - 1)
                 if choice == 1:
                     print("\n--- Breadth-First Search ---")
-                    bfs = BFS(num_nodes)
-                    for u, v, w in edges:
-                        bfs.add_edge(u, v)
-                    path = bfs.bfs(start)
-                    bfs.visualize_path(path, "BFS Path")
+                    bfs = BFS(num_nodes, csr=csr)
+                    if csr is None:
+                        for u, v, w in edges:
+                            bfs.add_edge(u, v)
+                    path = bfs.bfs(start, tracer)
+                    bfs.visualize_path(path, "BFS Path", layout_file=layout_file)
                 else:
                     print("\n--- Depth-First Search ---")
-                    dfs = DFS(num_nodes)
-                    for u, v, w in edges:
-                        dfs.add_edge(u, v)
-                    path = dfs.dfs(start)
-                    dfs.visualize_path(path, "DFS Path")
+                    dfs = DFS(num_nodes, csr=csr)
+                    if csr is None:
+                        for u, v, w in edges:
+                            dfs.add_edge(u, v)
+                    path = dfs.dfs(start, tracer)
+                    dfs.visualize_path(path, "DFS Path", layout_file=layout_file)
             elif choice == 3:
                 print("\n--- Dijkstra's Algorithm ---")
                 print("Nhập đỉnh bắt đầu (0 <= start < n):")
                 start = input_int("Đỉnh bắt đầu: ", 0, num_nodes - 1)
                 print("Nhập đỉnh kết thúc (0 <= end < n):")
                 end = input_int("Đỉnh kết thúc: ", 0, num_nodes - 1)
-                dij = Dijkstra(num_nodes)
-                for u, v, w in edges:
-                    dij.add_edge(u, v, w)
-                dist, prev = dij.dijkstra(start)
-                path = dij.reconstruct_path(prev, end)
+                dij = Dijkstra(num_nodes, csr=csr)
+                if csr is None:
+                    for u, v, w in edges:
+                        dij.add_edge(u, v, w)
+                dist, prev = dij.dijkstra(start, tracer, targets=[end])
+                path = dij.reconstruct_path(prev, end, start)
                 if path:
                     print(f"Độ dài đường đi ngắn nhất từ {start} đến {end}: {dist[end]}")
                     print(f"Đường đi ngắn nhất: {path}\n")
                 else:
                     print("Không tồn tại đường đi.\n")
-                dij.visualize_path(path, "Dijkstra's Shortest Path")
+                dij.visualize_path(path, "Dijkstra's Shortest Path", layout_file=layout_file)
             elif choice == 4:
                 print("\n--- Bellman-Ford Algorithm ---")
                 print("Nhập đỉnh bắt đầu (0 <= start < n):")
                 start = input_int("Đỉnh bắt đầu: ", 0, num_nodes - 1)
                 print("Nhập đỉnh kết thúc (0 <= end < n):")
                 end = input_int("Đỉnh kết thúc: ", 0, num_nodes - 1)
-                bell = BellmanFord(num_nodes)
-                for u, v, w in edges:
-                    bell.add_edge(u, v, w)
-                dist, prev = bell.bellman_ford(start)
+                bell = BellmanFord(num_nodes, csr=csr)
+                if csr is None:
+                    for u, v, w in edges:
+                        bell.add_edge(u, v, w)
+                dist, prev = bell.bellman_ford(start, tracer)
                 if dist:
-                    path = bell.reconstruct_path(prev, end)
+                    path = bell.reconstruct_path(prev, end, start)
                     if path:
                         print(f"Độ dài đường đi ngắn nhất từ {start} đến {end}: {dist[end]}")
                         print(f"Đường đi ngắn nhất: {path}\n")
                     else:
                         print("Không tồn tại đường đi.\n")
-                    bell.visualize_path(path, "Bellman-Ford Shortest Path")
+                    bell.visualize_path(path, "Bellman-Ford Shortest Path", layout_file=layout_file)
             elif choice == 5:
                 print("\n--- A* Algorithm ---")
-                print(f"Nhập heuristic cho từng đỉnh (cách nhau bởi dấu cách, {num_nodes} số nguyên không âm):")
-                print(f"Ví dụ: 7 6 2 0 nếu có 4 đỉnh")
-                heuristic = input_heuristic(num_nodes)
+                if csr is not None:
+                    print(f"Nhập đường dẫn tệp heuristic ({num_nodes} số nguyên không âm, cách nhau bởi khoảng trắng):")
+                    heuristic = input_heuristic_file(num_nodes)
+                else:
+                    print(f"Nhập heuristic cho từng đỉnh (cách nhau bởi dấu cách, {num_nodes} số nguyên không âm),")
+                    print("hoặc để trống để tự động tính bằng landmark:")
+                    print(f"Ví dụ: 7 6 2 0 nếu có 4 đỉnh")
+                    heuristic = input_heuristic(num_nodes)
                 print("Nhập đỉnh bắt đầu (0 <= start < n):")
                 start = input_int("Đỉnh bắt đầu: ", 0, num_nodes - 1)
                 print("Nhập đỉnh kết thúc (0 <= end < n):")
                 end = input_int("Đỉnh kết thúc: ", 0, num_nodes - 1)
-                astar = AStar(num_nodes, heuristic)
-                for u, v, w in edges:
-                    astar.add_edge(u, v, w)
-                path = astar.a_star(start, end)
+                landmarks = None
+                if heuristic is None and csr is not None:
+                    # Bảng landmark lưu cạnh tệp đồ thị, lần chạy sau không phải tính lại
+                    landmarks = landmarks_for(graph_file + '.landmarks', num_nodes, csr)
+                astar = AStar(num_nodes, heuristic, csr=csr, landmarks=landmarks)
+                if csr is None:
+                    for u, v, w in edges:
+                        astar.add_edge(u, v, w)
+                path = astar.a_star(start, end, tracer)
                 if path:
                     print(f"Độ dài đường đi ngắn nhất từ {start} đến {end}: {len(path) - 1}")
                     print(f"Đường đi ngắn nhất: {path}\n")
                 else:
                     print("Không tồn tại đường đi.\n")
-                astar.visualize_path(path, "A* Shortest Path")
+                astar.visualize_path(path, "A* Shortest Path", layout_file=layout_file)
+            elif choice in [6, 7]:
+                mst = MST(num_nodes, csr=csr)
+                if csr is None:
+                    for u, v, w in edges:
+                        mst.add_edge(u, v, w)
+                if choice == 6:
+                    print("\n--- Kruskal's Algorithm ---")
+                    weight, tree = mst.kruskal(tracer)
+                    name = "Kruskal"
+                else:
+                    print("\n--- Prim's Algorithm ---")
+                    print("Nhập đỉnh bắt đầu (0 <= start < n):")
+                    start = input_int("Đỉnh bắt đầu: ", 0, num_nodes - 1)
+                    weight, tree = mst.prim(start, tracer)
+                    name = "Prim"
+                trees = mst.stats['trees']
+                if trees > 1:
+                    print(f"Đồ thị không liên thông: rừng khung gồm {trees} cây.")
+                print(f"Tổng trọng số cây khung nhỏ nhất: {weight}")
+                if not large:
+                    print(f"Các cạnh của cây khung: {tree}\n")
+                mst.visualize_path([], f"{name} Minimum Spanning Tree", layout_file=layout_file, tree_edges=tree)
+            elif choice == 8:
+                print("\n--- Yen's K Shortest Paths ---")
+                print("Nhập đỉnh bắt đầu (0 <= start < n):")
+                start = input_int("Đỉnh bắt đầu: ", 0, num_nodes - 1)
+                print("Nhập đỉnh kết thúc (0 <= end < n):")
+                end = input_int("Đỉnh kết thúc: ", 0, num_nodes - 1)
+                print("Nhập số đường đi cần tìm (k >= 1):")
+                k = input_int("k: ", 1)
+                yen = KShortestPaths(num_nodes, csr=csr)
+                if csr is None:
+                    for u, v, w in edges:
+                        yen.add_edge(u, v, w)
+                found = yen.k_shortest(start, end, k, tracer)
+                if found:
+                    for i, (distance, path) in enumerate(found, 1):
+                        print(f"Đường đi thứ {i} (độ dài {distance}): {path}")
+                    if len(found) < k:
+                        print(f"Chỉ có {len(found)} đường đi không lặp đỉnh từ {start} đến {end}.")
+                    print()
+                else:
+                    print("Không tồn tại đường đi.\n")
+                yen.visualize_path(found[0][1] if found else [], "Yen's Shortest Path", layout_file=layout_file)
             again = input("\nBạn có muốn thử qua thuật toán khác không? (y/n): ").strip().lower()
             if again != 'y':
                 print("Tạm biệt!")
@@ -1,177 +1,306 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
+import cProfile
+import gzip
+import io
+import json
+import pstats
+import time
 import traceback
 import os
+import shutil
+import tempfile
 
-# --- Thuật toán giữ nguyên như trước ---
-import networkx as nx
-from collections import deque
-import heapq
-
-class Graph:
-    def __init__(self, num_nodes):
-        if num_nodes <= 0:
-            raise ValueError("Number of nodes must be positive")
-        self.num_nodes = num_nodes
-        self.graph = [[] for _ in range(num_nodes)]
-        self.edges = []
-    def add_edge(self, u, v, weight=1):
-        self.graph[u].append((v, weight))
-        self.graph[v].append((u, weight))
-        self.edges.append((u, v, weight))
-
-class BFS(Graph):
-    def bfs(self, start):
-        visited = [False] * self.num_nodes
-        queue = deque([start])
-        visited[start] = True
-        path = []
-        steps = [f"Bước 1: Đặt đỉnh bắt đầu {start} vào hàng đợi và đánh dấu đã thăm."]
-        step = 1
-        while queue:
-            current = queue.popleft()
-            path.append(current)
-            step += 1
-            steps.append(f"\nBước {step}: Lấy đỉnh {current} ra khỏi hàng đợi, duyệt các đỉnh kề:")
-            for neighbor, _ in self.graph[current]:
-                if not visited[neighbor]:
-                    visited[neighbor] = True
-                    queue.append(neighbor)
-                    steps.append(f"  → Thêm đỉnh {neighbor} vào hàng đợi và đánh dấu đã thăm.")
-        steps.append(f"\nKết thúc BFS. Số bước duyệt: {len(path)}")
-        steps.append(f"Số đỉnh đã duyệt: {len(path)}")
-        steps.append(f"Thứ tự duyệt: {path}")
-        return steps, path
-
-class DFS(Graph):
-    def dfs(self, start):
-        visited = [False] * self.num_nodes
-        path = []
-        steps = []
-        step = 0
-        def dfs_visit(u):
-            nonlocal step
-            visited[u] = True
-            path.append(u)
-            step += 1
-            steps.append(f"\nBước {step}: Đến đỉnh {u}, duyệt các đỉnh kề:")
-            for v, _ in self.graph[u]:
-                if not visited[v]:
-                    steps.append(f"  → Đi sâu đến đỉnh {v} từ đỉnh {u}.")
-                    dfs_visit(v)
-        steps.append(f"\nBắt đầu DFS từ đỉnh {start}.")
-        dfs_visit(start)
-        steps.append(f"\nKết thúc DFS. Số bước duyệt: {len(path)}")
-        steps.append(f"Số đỉnh đã duyệt: {len(path)}")
-        steps.append(f"Thứ tự duyệt: {path}")
-        return steps, path
-
-class Dijkstra(Graph):
-    def dijkstra(self, start):
-        dist = [float('inf')] * self.num_nodes
-        dist[start] = 0
-        prev = [-1] * self.num_nodes
-        heap = [(0, start)]
-        visited_count = 0
-        update_count = 0
-        steps = [f"Khởi tạo khoảng cách từ đỉnh {start} đến các đỉnh khác là vô cùng, riêng {start} là 0."]
-        while heap:
-            d, u = heapq.heappop(heap)
-            if d > dist[u]:
-                continue
-            visited_count += 1
-            steps.append(f"\nXét đỉnh {u} với khoảng cách hiện tại {d}.")
-            for v, w in self.graph[u]:
-                if dist[v] > dist[u] + w:
-                    dist[v] = dist[u] + w
-                    prev[v] = u
-                    heapq.heappush(heap, (dist[v], v))
-                    update_count += 1
-                    steps.append(f"  → Cập nhật khoảng cách đến đỉnh {v}: {dist[v]} (qua {u})")
-        steps.append(f"\nKết thúc Dijkstra. Số đỉnh đã xét: {visited_count}")
-        steps.append(f"Số lần cập nhật khoảng cách: {update_count}")
-        return steps, dist, prev
-    def reconstruct_path(self, prev, target):
-        path = []
-        while target != -1:
-            path.append(target)
-            target = prev[target]
-        path = path[::-1]
-        return path if path and prev[path[0]] == path[0] or prev[path[0]] == -1 else []
-
-class BellmanFord(Graph):
-    def bellman_ford(self, start):
-        dist = [float('inf')] * self.num_nodes
-        dist[start] = 0
-        prev = [-1] * self.num_nodes
-        update_count = 0
-        steps = [f"Khởi tạo khoảng cách từ đỉnh {start} đến các đỉnh khác là vô cùng, riêng {start} là 0."]
-        for i in range(self.num_nodes - 1):
-            steps.append(f"\nLặp lần thứ {i+1}:")
-            for u, v, w in self.edges:
-                if dist[u] + w < dist[v]:
-                    dist[v] = dist[u] + w
-                    prev[v] = u
-                    update_count += 1
-                    steps.append(f"  → Cập nhật khoảng cách: {u} → {v} = {dist[v]}")
-                if dist[v] + w < dist[u]:
-                    dist[u] = dist[v] + w
-                    prev[u] = v
-                    update_count += 1
-                    steps.append(f"  → Cập nhật khoảng cách: {v} → {u} = {dist[u]}")
-        for u, v, w in self.edges:
-            if dist[u] + w < dist[v]:
-                steps.append("Đồ thị có chu trình âm!")
-                return steps, None, None
-        steps.append(f"\nKết thúc Bellman-Ford. Số lần cập nhật khoảng cách: {update_count}")
-        return steps, dist, prev
-    def reconstruct_path(self, prev, target):
-        path = []
-        while target != -1:
-            path.append(target)
-            target = prev[target]
-        path = path[::-1]
-        return path if path and prev[path[0]] == path[0] or prev[path[0]] == -1 else []
-
-class AStar(Graph):
-    def __init__(self, num_nodes, heuristic):
-        super().__init__(num_nodes)
-        self.heuristic = heuristic
-    def a_star(self, start, goal):
-        open_set = [(self.heuristic[start], 0, start, -1)]
-        visited = {}
-        step = 0
-        steps = [f"Khởi tạo: Đưa đỉnh bắt đầu {start} vào hàng đợi ưu tiên với heuristic = {self.heuristic[start]}."]
-        while open_set:
-            open_set.sort()
-            f, g, current, parent = open_set.pop(0)
-            if current in visited:
-                continue
-            visited[current] = parent
-            step += 1
-            steps.append(f"\nBước {step}: Lấy đỉnh {current} ra khỏi hàng đợi (f = {f}, g = {g}).")
-            if current == goal:
-                steps.append(f"  → Đã đến đỉnh đích {goal}.")
-                break
-            for neighbor, weight in self.graph[current]:
-                if neighbor not in visited:
-                    new_g = g + weight
-                    new_f = new_g + self.heuristic[neighbor]
-                    open_set.append((new_f, new_g, neighbor, current))
-                    steps.append(f"  → Thêm đỉnh {neighbor} vào hàng đợi với f = {new_f} (g = {new_g}, heuristic = {self.heuristic[neighbor]}).")
-        path = []
-        node = goal
-        while node != -1:
-            path.append(node)
-            node = visited.get(node, -1)
-        path = path[::-1]
-        steps.append(f"\nKết thúc A*. Số bước mở rộng đỉnh: {step}")
-        return steps, path if path and path[0] == start else []
+from engine import ALGORITHMS, TRACE_FULL, TRACE_MODES, TRACE_SUMMARY, Tracer, run_query
+from engine.allpairs import UNREACHABLE, all_pairs
+from engine.batch import batch_shortest_paths
+from engine.cache import ResultCache
+from engine.components import components_for, multi_source_bfs
+from engine.csr import build_csr, csr_digest
+from engine.formats import BINARY, JSON, MSGPACK, encode_binary, encode_msgpack, formats, json_result
+from engine.jobs import DONE, JobManager, JobStore, follow
+from engine.landmarks import landmarks_for
+from engine.layout import (
+    DEFAULT_HOPS, LAYOUT_MAX_NODES, LOD_MAX_NODES, layout_for, level_of_detail, view_positions,
+)
+from engine.metrics import Metrics, Phases
+from engine.query import is_point_to_point
+from engine.registry import GraphRegistry
+from engine.steps import StepStore
+from engine.streaming import stream_query
 
 # --- Flask App ---
 app = Flask(__name__, static_folder='static', template_folder='templates')
 CORS(app)
 
+# Đồ thị lớn hơn ngưỡng này (số đỉnh + số cạnh) mặc định chỉ trả về bước tóm tắt
+TRACE_FULL_LIMIT = 2000
+
+# Kích thước tối đa của tệp đồ thị tải lên (mặc định 4GB) và cỡ khối khi ghi ra đĩa
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_BYTES', 4 * 2 ** 30))
+UPLOAD_CHUNK_BYTES = 2 ** 20
+
+# Giới hạn số đỉnh cho truy vấn mọi cặp đỉnh (ma trận n x n trả về dạng JSON)
+ALL_PAIRS_MAX_NODES = int(os.environ.get('ALL_PAIRS_MAX_NODES', 2000))
+
+# Giới hạn số đường đi k của thuật toán Yen (mỗi đường đi thêm cần thêm nhiều lần chạy Dijkstra)
+YEN_MAX_K = int(os.environ.get('YEN_MAX_K', 50))
+
+# Kho đồ thị dùng chung giữa các worker gunicorn (thư mục trên đĩa + LRU trong từng worker);
+# đồ thị không được tải lên hay dùng tới trong GRAPH_MAX_AGE giây bị xóa cùng các tệp đi kèm (0: giữ mãi)
+registry = GraphRegistry(
+    os.environ.get('GRAPH_STORE_DIR', os.path.join(tempfile.gettempdir(), 'k34-graphs')),
+    int(os.environ.get('GRAPH_CACHE_BYTES', 256 * 2 ** 20)),
+    int(os.environ.get('GRAPH_MAX_AGE', 24 * 3600)) or None,
+)
+
+# Bộ đệm kết quả: LRU trong từng worker, thêm tệp SQLite dùng chung cho mọi worker nếu đặt RESULT_CACHE_DB
+result_cache = ResultCache(
+    int(os.environ.get('RESULT_CACHE_BYTES', 64 * 2 ** 20)),
+    os.environ.get('RESULT_CACHE_DB') or None,
+)
+
+# Chế độ job: truy vấn dài chạy trong tiến trình riêng, giới hạn số job chạy cùng lúc (trên cả máy),
+# thời gian và bộ nhớ của mỗi job; trạng thái lưu trên đĩa nên worker nào cũng trả lời được
+job_store = JobStore(os.environ.get('JOB_DIR', os.path.join(tempfile.gettempdir(), 'k34-jobs')))
+jobs = JobManager(
+    job_store, registry.directory,
+    workers=int(os.environ.get('JOB_WORKERS', os.cpu_count() or 1)),
+    timeout=float(os.environ.get('JOB_TIMEOUT', 300)),
+    memory_bytes=int(os.environ.get('JOB_MEMORY_BYTES', 4 * 2 ** 30)) or None,
+    max_queued=int(os.environ.get('JOB_QUEUE_MAX', 100)),
+    cache_path=os.environ.get('RESULT_CACHE_DB') or None,
+)
+
+# Các bước của truy vấn yêu cầu "steps": "paged" được lưu trên đĩa (dùng chung mọi worker)
+# và đọc từng trang qua GET /steps/<steps_id>
+step_store = StepStore(
+    os.environ.get('STEPS_DIR', os.path.join(tempfile.gettempdir(), 'k34-steps')),
+    int(os.environ.get('STEPS_MAX_AGE', 3600)),
+)
+STEPS_PAGE_SIZE = 200
+STEPS_PAGE_MAX = 1000
+
+# Nén gzip các response lớn hơn ngưỡng này nếu client chấp nhận
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
+# Số liệu theo từng worker (thời gian từng pha, bộ đếm của thuật toán) cho /metrics;
+# ?profile=1 trả về thêm bảng cProfile gồm PROFILE_LINES hàm tốn thời gian nhất
+metrics = Metrics()
+PROFILE_LINES = 30
+
+@app.before_request
+def _start_timing():
+    g.phases = Phases()
+    g.started = time.perf_counter()
+
+@app.after_request
+def _record_timing(response):
+    # Với response dạng luồng, thời gian chỉ tính đến lúc bắt đầu gửi
+    phases = g.get('phases')
+    if phases is not None:
+        elapsed = time.perf_counter() - g.started
+        response.headers['Server-Timing'] = ', '.join(
+            filter(None, [phases.server_timing(), f"total;dur={elapsed * 1000:.2f}"]))
+        metrics.record(request.endpoint or 'unknown', response.status_code, elapsed, phases)
+    return response
+
+@app.after_request
+def _compress(response):
+    # Đăng ký sau _record_timing nên chạy trước, thời gian nén được tính vào Server-Timing
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or 'gzip' not in request.accept_encodings or 'Content-Encoding' in response.headers):
+        return response
+    data = response.get_data()
+    if len(data) < GZIP_MIN_BYTES:
+        return response
+    with g.phases.phase('gzip'):
+        data = gzip.compress(data, GZIP_LEVEL)
+    response.set_data(data)
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def _json():
+    """Body JSON của request; thời gian giải mã tính vào pha 'decode'."""
+    with g.phases.phase('decode'):
+        return request.json
+
+def _profile_text(profiler):
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_LINES)
+    return out.getvalue()
+
+def _check_query(data, num_nodes, num_edges):
+    """Kiểm tra thuật toán và chế độ trace; trả về (algo, mode) hoặc response lỗi 400."""
+    algo = data.get('algorithm')
+    mode = data.get('trace')
+    if mode is None:
+        mode = TRACE_SUMMARY if num_nodes + num_edges > TRACE_FULL_LIMIT else TRACE_FULL
+    if mode not in TRACE_MODES:
+        return None, (jsonify({'error': 'Chế độ trace không hợp lệ!'}), 400)
+    if algo not in ALGORITHMS:
+        return None, (jsonify({'error': 'Thuật toán không hợp lệ!'}), 400)
+    k = data.get('k')
+    # JSON true/false là bool, lớp con của int trong Python: không được coi là k = 1 hay 0
+    if algo == 'yen' and k is not None and not (isinstance(k, int) and not isinstance(k, bool) and 1 <= k <= YEN_MAX_K):
+        return None, (jsonify({'error': f'Số đường đi k phải là số nguyên từ 1 đến {YEN_MAX_K}!'}), 400)
+    return (algo, mode), None
+
+def _run(data, num_nodes, num_edges, edges=None, csr=None, graph_id=None):
+    """Chạy một truy vấn theo tham số trong ``data`` và trả về response JSON."""
+    checked, error = _check_query(data, num_nodes, num_edges)
+    if error:
+        return error
+    algo, mode = checked
+    g.phases.algorithm = algo
+    if request.args.get('profile') not in ('1', 'true'):
+        return _run_query(data, algo, mode, num_nodes, edges, csr, graph_id)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return _run_query(data, algo, mode, num_nodes, edges, csr, graph_id, profiler)
+    finally:
+        profiler.disable()
+
+def _run_query(data, algo, mode, num_nodes, edges, csr, graph_id, profiler=None):
+    phases = g.phases
+    heuristic = data.get('heuristic') or None
+    search = data.get('search', 'full')
+    start, end = data.get('start'), data.get('end')
+    # Chỉ đồ thị đã tải lên kho (có graph_id) mới được lưu dữ liệu tiền xử lý cạnh nó;
+    # đồ thị gửi kèm request không có tệp .graph nên không được ghi gì vào kho
+    stored = graph_id is not None
+    if algo == 'ch' and not stored:
+        # Phân cấp co đỉnh chỉ đáng dựng khi truy vấn nhiều lần trên cùng một đồ thị
+        return jsonify({'error': 'CH cần đồ thị đã tải lên: gửi đồ thị tới POST /graphs '
+                                 'rồi truy vấn qua POST /graphs/<graph_id>/run!'}), 400
+    components = None
+    if end is not None and is_point_to_point(algo, search):
+        # Hai đỉnh thuộc hai thành phần liên thông khác nhau thì trả lời "không có đường đi" ngay;
+        # nhãn thành phần được tính một lần cho mỗi đồ thị: lưu cạnh đồ thị trong kho hoặc
+        # (đồ thị gửi kèm) chỉ giữ trong bộ nhớ
+        if csr is None:
+            with phases.phase('build'):
+                csr = build_csr(num_nodes, edges)
+        with phases.phase('components'):
+            if stored:
+                components, _ = registry.components(graph_id, num_nodes, csr)
+            else:
+                graph_id = csr_digest(num_nodes, csr)
+                components, _ = components_for(None, num_nodes, csr, digest=graph_id)
+    separated = (components is not None
+                 and all(isinstance(u, int) and not isinstance(u, bool) and 0 <= u < num_nodes for u in (start, end))
+                 and components[start] != components[end])
+    landmarks = hierarchy = None
+    if ((algo == 'astar' and heuristic is None) or algo == 'ch') and not separated:
+        # A* không có heuristic dùng cận dưới landmark, CH dùng phân cấp co đỉnh; cả hai được
+        # tiền xử lý một lần, lưu cạnh đồ thị trong kho hoặc (đồ thị gửi kèm) chỉ giữ trong bộ nhớ
+        if csr is None:
+            with phases.phase('build'):
+                csr = build_csr(num_nodes, edges)
+        with phases.phase('preprocess'):
+            graph_id = graph_id or csr_digest(num_nodes, csr)
+            if algo == 'ch':
+                hierarchy = registry.hierarchy(graph_id, num_nodes, csr)
+            elif stored:
+                landmarks = registry.landmarks(graph_id, num_nodes, csr)
+            else:
+                landmarks = landmarks_for(None, num_nodes, csr, digest=graph_id)
+    query = dict(algo=algo, num_nodes=num_nodes, edges=edges, start=start, end=end,
+                 heuristic=heuristic, csr=csr, search=search,
+                 cache=result_cache if data.get('cache', True) else None, graph_id=graph_id, landmarks=landmarks,
+                 hierarchy=hierarchy, components=components, k=data.get('k'))
+    accept = request.headers.get('Accept', '')
+    if data.get('stream') or 'application/x-ndjson' in accept or 'text/event-stream' in accept:
+        return _stream(mode, query, sse='text/event-stream' in accept)
+    fmt = request.accept_mimetypes.best_match(formats()) if accept else JSON
+    if fmt is None:
+        return jsonify({'error': f"Định dạng kết quả không được hỗ trợ, chọn một trong: {', '.join(formats())}"}), 406
+    # Dạng nhị phân/msgpack không kèm văn bản các bước: các bước luôn được đọc theo trang
+    paged = data.get('steps') == 'paged' or fmt != JSON
+    tracer = step_store.writer(mode) if paged else Tracer(mode)
+    try:
+        result = run_query(tracer=tracer, phases=phases, **query)
+    except Exception:
+        if paged:
+            tracer.discard()
+        raise
+    with phases.phase('steps'):
+        if paged:
+            body = {**result, 'steps_id': tracer.close(), 'steps_total': tracer.count}
+        else:
+            body = {'steps': tracer.lines(), **result}
+    if profiler is not None:
+        profiler.disable()
+        body['profile'] = {**phases.summary(), 'cprofile': _profile_text(profiler)}
+    with phases.phase('serialize'):
+        if fmt == MSGPACK:
+            return Response(encode_msgpack(body), mimetype=MSGPACK)
+        if fmt == BINARY:
+            return Response(encode_binary(body), mimetype=BINARY)
+        # JSON chuẩn không có Infinity: đỉnh không tới được trả về null
+        return jsonify(json_result(body))
+
+def _stream(mode, query, sse=False):
+    """Gửi từng lô bước ngay khi thuật toán chạy (NDJSON hoặc Server-Sent Events)."""
+    if query['csr'] is None:
+        # Dựng đồ thị trước để lỗi dữ liệu vẫn trả về 400 thay vì nằm giữa luồng
+        query['csr'] = build_csr(query['num_nodes'], query.pop('edges'))
+    return _stream_response(stream_query(mode, **query), sse)
+
+def _stream_response(messages, sse=False):
+    """Gửi các message dạng NDJSON hoặc Server-Sent Events."""
+    def generate():
+        for message in messages:
+            if 'result' in message:
+                # JSON chuẩn không có Infinity: đỉnh không tới được trả về null
+                message['result'] = json_result(message['result'])
+            line = json.dumps(message, ensure_ascii=False)
+            yield f"data: {line}\n\n" if sse else line + "\n"
+
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _view(data, num_nodes, csr, graph_id=None):
+    """Phần đồ thị cần vẽ quanh đường đi (đường đi, lân cận k bước và các cụm gộp) kèm tọa độ."""
+    path = [int(u) for u in data.get('path') or []]
+    for u in path:
+        if not 0 <= u < num_nodes:
+            raise ValueError(f"Nodes must be between 0 and {num_nodes - 1}")
+    hops = int(data.get('hops', DEFAULT_HOPS))
+    max_nodes = min(int(data.get('max_nodes', LOD_MAX_NODES)), LOD_MAX_NODES)
+    view = level_of_detail(num_nodes, csr, path, hops, max_nodes)
+    positions = None
+    if num_nodes <= LAYOUT_MAX_NODES:
+        # Bố cục toàn đồ thị được tính một lần, vị trí các đỉnh không đổi giữa các lần vẽ; chỉ đồ thị
+        # trong kho mới lưu bố cục cạnh nó, đồ thị gửi kèm request chỉ giữ trong bộ nhớ (LRU)
+        if graph_id is not None:
+            positions = registry.layout(graph_id, num_nodes, csr)
+        else:
+            positions = layout_for(None, num_nodes, csr)
+    coords, placed = view_positions(view, positions)
+    return jsonify({
+        'nodes': [{'id': u, 'x': coords[u][0], 'y': coords[u][1]} for u in view.nodes],
+        'edges': view.edges,
+        'clusters': [{'anchor': anchor, 'size': size, 'x': x, 'y': y}
+                     for (anchor, size), (x, y) in zip(view.clusters, placed)],
+        'unreached': view.unreached,
+    })
+
+def _run_batch(data, num_nodes, csr):
+    """Trả lời nhiều cặp (start, end) trong một request: {'dist': [...], 'paths': [...]}."""
+    queries = [(int(s), int(t)) for s, t in data.get('queries', [])]
+    with_paths = bool(data.get('paths', True))
+    dists, paths = batch_shortest_paths(data.get('algorithm', 'dijkstra'), num_nodes, csr, queries, with_paths,
+                                        vectorized=bool(data.get('vectorized', False)))
+    result = {'dist': dists}
+    if with_paths:
+        result['paths'] = paths
+    return jsonify(result)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -179,65 +308,299 @@ def index():
 @app.route('/run-algorithm', methods=['POST'])
 def run_algorithm():
     try:
-        data = request.json
-        algo = data.get('algorithm')
+        data = _json()
         num_nodes = int(data.get('num_nodes'))
         edges = data.get('edges')  # List of [u, v, w]
-        start = data.get('start')
-        end = data.get('end')
-        heuristic = data.get('heuristic', [])
-        if algo == 'bfs':
-            bfs = BFS(num_nodes)
-            for u, v, w in edges:
-                bfs.add_edge(u, v)
-            steps, path = bfs.bfs(start)
-            return jsonify({'steps': steps, 'path': path})
-        elif algo == 'dfs':
-            dfs = DFS(num_nodes)
-            for u, v, w in edges:
-                dfs.add_edge(u, v)
-            steps, path = dfs.dfs(start)
-            return jsonify({'steps': steps, 'path': path})
-        elif algo == 'dijkstra':
-            dij = Dijkstra(num_nodes)
-            for u, v, w in edges:
-                dij.add_edge(u, v, w)
-            steps, dist, prev = dij.dijkstra(start)
-            path = []
-            if prev:
-                node = end
-                while node != -1:
-                    path.append(node)
-                    node = prev[node]
-                path = path[::-1]
-                if not (path and path[0] == start):
-                    path = []
-            return jsonify({'steps': steps, 'dist': dist, 'path': path})
-        elif algo == 'bellmanford':
-            bell = BellmanFord(num_nodes)
-            for u, v, w in edges:
-                bell.add_edge(u, v, w)
-            steps, dist, prev = bell.bellman_ford(start)
-            path = []
-            if dist and prev:
-                node = end
-                while node != -1:
-                    path.append(node)
-                    node = prev[node]
-                path = path[::-1]
-                if not (path and path[0] == start):
-                    path = []
-            return jsonify({'steps': steps, 'dist': dist, 'path': path})
-        elif algo == 'astar':
-            astar = AStar(num_nodes, heuristic)
-            for u, v, w in edges:
-                astar.add_edge(u, v, w)
-            steps, path = astar.a_star(start, end)
-            return jsonify({'steps': steps, 'path': path})
+        return _run(data, num_nodes, len(edges), edges=edges)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/steps/<steps_id>', methods=['GET'])
+def step_page(steps_id):
+    """Một trang các bước của truy vấn chạy với "steps": "paged" (?offset=0&limit=200)."""
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = min(int(request.args.get('limit', STEPS_PAGE_SIZE)), STEPS_PAGE_MAX)
+        if offset < 0 or limit < 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': 'offset và limit phải là số nguyên không âm!'}), 400
+    try:
+        steps, total = step_store.page(steps_id, offset, limit)
+    except KeyError:
+        return jsonify({'error': 'Không tìm thấy các bước (có thể đã hết hạn)!'}), 404
+    end = offset + len(steps)
+    return jsonify({'steps': steps, 'offset': offset, 'total': total, 'next': end if end < total else None})
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """Số lần trúng/trượt bộ đệm kết quả của worker hiện tại."""
+    return jsonify(result_cache.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Số liệu của worker hiện tại theo định dạng văn bản Prometheus."""
+    cache = result_cache.stats()
+    samples = [
+        ('result_cache_hits_total', 'counter', "Result cache hits in memory.", cache['hits']),
+        ('result_cache_disk_hits_total', 'counter', "Result cache hits in the shared SQLite file.", cache['disk_hits']),
+        ('result_cache_misses_total', 'counter', "Result cache misses.", cache['misses']),
+        ('result_cache_entries', 'gauge', "Entries in the in-memory result cache.", cache['entries']),
+        ('result_cache_bytes', 'gauge', "Bytes held by the in-memory result cache.", cache['bytes']),
+    ]
+    return Response(metrics.render(samples), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/run-batch', methods=['POST'])
+def run_batch():
+    try:
+        data = _json()
+        num_nodes = int(data.get('num_nodes'))
+        return _run_batch(data, num_nodes, build_csr(num_nodes, data.get('edges')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graph-view', methods=['POST'])
+def graph_view():
+    """Thu gọn đồ thị lớn để vẽ trên trình duyệt (chỉ đường đi, lân cận và các cụm)."""
+    try:
+        data = _json()
+        num_nodes = int(data.get('num_nodes'))
+        return _view(data, num_nodes, build_csr(num_nodes, data.get('edges')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graphs', methods=['POST'])
+def upload_graph():
+    """Lưu đồ thị một lần, trả về graph_id để chạy nhiều truy vấn sau đó."""
+    try:
+        data = _json()
+        num_nodes = int(data.get('num_nodes'))
+        graph_id = registry.put(num_nodes, data.get('edges'))
+        _, csr = registry.get(graph_id)
+        return jsonify({'graph_id': graph_id, 'num_nodes': num_nodes, 'num_edges': len(csr[1])}), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graphs/upload', methods=['POST'])
+def upload_graph_file():
+    """Nạp đồ thị lớn từ tệp: edge list (SNAP/CSV/TSV) hoặc tệp nhị phân CSR.
+
+    Gửi multipart với trường ``file`` (tùy chọn ``num_nodes``), hoặc gửi thẳng nội dung tệp trong body.
+    """
+    fd, path = tempfile.mkstemp(suffix='.upload', dir=registry.directory)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            upload = request.files.get('file')
+            if upload is not None:
+                upload.save(out)
+            else:
+                shutil.copyfileobj(request.stream, out, UPLOAD_CHUNK_BYTES)
+        num_nodes = request.values.get('num_nodes')
+        graph_id = registry.put_file(path, int(num_nodes) if num_nodes else None)
+        num_nodes, csr = registry.get(graph_id)
+        return jsonify({'graph_id': graph_id, 'num_nodes': num_nodes, 'num_edges': len(csr[1])}), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+    finally:
+        os.remove(path)
+
+@app.route('/graphs/<graph_id>', methods=['GET'])
+def graph_info(graph_id):
+    try:
+        num_nodes, csr = registry.get(graph_id)
+    except KeyError:
+        return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+    return jsonify({'graph_id': graph_id, 'num_nodes': num_nodes, 'num_edges': len(csr[1])})
+
+@app.route('/graphs/<graph_id>/run', methods=['POST'])
+def run_on_graph(graph_id):
+    try:
+        try:
+            num_nodes, csr = registry.get(graph_id)
+        except KeyError:
+            return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+        return _run(_json(), num_nodes, len(csr[1]), csr=csr, graph_id=graph_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graphs/<graph_id>/batch', methods=['POST'])
+def run_batch_on_graph(graph_id):
+    try:
+        try:
+            num_nodes, csr = registry.get(graph_id)
+        except KeyError:
+            return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+        return _run_batch(_json(), num_nodes, csr)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graphs/<graph_id>/view', methods=['POST'])
+def view_graph(graph_id):
+    try:
+        try:
+            num_nodes, csr = registry.get(graph_id)
+        except KeyError:
+            return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+        return _view(request.get_json(silent=True) or {}, num_nodes, csr, graph_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graphs/<graph_id>/components', methods=['GET'])
+def graph_components(graph_id):
+    """Số thành phần liên thông và nhãn thành phần của từng đỉnh."""
+    try:
+        num_nodes, csr = registry.get(graph_id)
+    except KeyError:
+        return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+    labels, count = registry.components(graph_id, num_nodes, csr)
+    return jsonify({'num_components': count, 'labels': labels.tolist()})
+
+@app.route('/graphs/<graph_id>/connected', methods=['POST'])
+def graph_connected(graph_id):
+    """Kiểm tra nhiều cặp đỉnh có liên thông không: {"pairs": [[u, v], ...]}."""
+    try:
+        try:
+            num_nodes, csr = registry.get(graph_id)
+        except KeyError:
+            return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+        pairs = [(int(u), int(v)) for u, v in _json().get('pairs', [])]
+        for u, v in pairs:
+            if not (0 <= u < num_nodes and 0 <= v < num_nodes):
+                raise ValueError(f"Nodes must be between 0 and {num_nodes - 1}")
+        labels, _ = registry.components(graph_id, num_nodes, csr)
+        return jsonify({'connected': [labels[u] == labels[v] for u, v in pairs]})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graphs/<graph_id>/hops', methods=['POST'])
+def graph_hops(graph_id):
+    """BFS nhiều nguồn: số cạnh tới nguồn gần nhất và nguồn đó cho mọi đỉnh; null nếu không tới được."""
+    try:
+        try:
+            num_nodes, csr = registry.get(graph_id)
+        except KeyError:
+            return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+        seeds = [int(s) for s in _json().get('seeds', [])]
+        hops, source = multi_source_bfs(csr[0], num_nodes, seeds)
+        return jsonify({'hops': [None if h == -1 else h for h in hops],
+                        'source': [None if s == -1 else s for s in source]})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/graphs/<graph_id>/all-pairs', methods=['POST'])
+def run_all_pairs(graph_id):
+    """Ma trận khoảng cách ngắn nhất giữa mọi cặp đỉnh; null nếu không tới được."""
+    try:
+        try:
+            num_nodes, csr = registry.get(graph_id)
+        except KeyError:
+            return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+        if num_nodes > ALL_PAIRS_MAX_NODES:
+            return jsonify({'error': f'Đồ thị quá lớn cho truy vấn mọi cặp đỉnh (tối đa {ALL_PAIRS_MAX_NODES} đỉnh)!'}), 400
+        data = request.get_json(silent=True) or {}
+        matrix = all_pairs(num_nodes, csr, method=data.get('method', 'auto'))
+        if matrix.dtype.kind == 'f':
+            dist = [[None if d == float('inf') else d for d in row] for row in matrix.tolist()]
         else:
-            return jsonify({'error': 'Thuật toán không hợp lệ!'}), 400
+            dist = [[None if d == UNREACHABLE else d for d in row] for row in matrix.tolist()]
+        return jsonify({'dist': dist})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
 
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Gửi truy vấn chạy nền (đồ thị trong ``edges`` hoặc ``graph_id`` đã lưu); trả về job_id ngay."""
+    try:
+        data = _json()
+        graph_id = data.get('graph_id')
+        if graph_id is not None:
+            try:
+                num_nodes, csr = registry.get(graph_id)
+            except KeyError:
+                return jsonify({'error': 'Không tìm thấy đồ thị!'}), 404
+        else:
+            num_nodes = int(data.get('num_nodes'))
+            graph_id = registry.put(num_nodes, data.get('edges'))
+            num_nodes, csr = registry.get(graph_id)
+        checked, error = _check_query(data, num_nodes, len(csr[1]))
+        if error:
+            return error
+        algo, mode = checked
+        for key, name in (('start', "Start"), ('end', "Goal")):
+            node = data.get(key)
+            if node is not None and not (isinstance(node, int) and not isinstance(node, bool) and 0 <= node < num_nodes):
+                raise ValueError(f"{name} node must be between 0 and {num_nodes - 1}")
+        spec = {'graph_id': graph_id, 'algorithm': algo, 'trace': mode, 'start': data.get('start'),
+                'end': data.get('end'), 'heuristic': data.get('heuristic') or None,
+                'search': data.get('search', 'full'), 'k': data.get('k')}
+        try:
+            job_id = jobs.submit(spec)
+        except OverflowError:
+            return jsonify({'error': 'Hàng đợi job đã đầy, vui lòng thử lại sau!'}), 503
+        return jsonify({'job_id': job_id, 'status': 'queued'}), 202, {'Location': f'/jobs/{job_id}'}
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Trạng thái job; khi xong kèm kết quả (các bước và kết quả như /run-algorithm)."""
+    try:
+        record = job_store.get(job_id)
+    except KeyError:
+        record = None
+    if record is None:
+        return jsonify({'error': 'Không tìm thấy job!'}), 404
+    if record['status'] == DONE:
+        steps, _ = job_store.read_steps(job_id)
+        record['result'] = {'steps': steps, **job_store.result(job_id)}
+    record.pop('owner', None)
+    return jsonify(record)
+
+@app.route('/jobs/<job_id>/stream', methods=['GET'])
+def job_stream(job_id):
+    """Theo dõi job: các bước được gửi dần khi job chạy, cuối cùng là kết quả hoặc lỗi."""
+    try:
+        if job_store.get(job_id) is None:
+            raise KeyError(job_id)
+    except KeyError:
+        return jsonify({'error': 'Không tìm thấy job!'}), 404
+    return _stream_response(follow(job_store, job_id), sse='text/event-stream' in request.headers.get('Accept', ''))
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Hủy job đang chờ hoặc đang chạy."""
+    try:
+        record = jobs.cancel(job_id)
+    except KeyError:
+        record = None
+    if record is None:
+        return jsonify({'error': 'Không tìm thấy job!'}), 404
+    record.pop('owner', None)
+    return jsonify(record), 202
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""All-pairs distances: one Dijkstra per source in a loop vs engine.allpairs.
+
+Usage: python -m benchmarks.bench_allpairs [num_nodes ...]
+"""
+import os
+import sys
+import time
+
+from benchmarks.generators import random_sparse
+from engine import Dijkstra
+from engine.allpairs import UNREACHABLE, all_pairs
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def loop(num_nodes, graph):
+    return [graph.dijkstra(source)[0] for source in range(num_nodes)]
+
+
+def bench(num_nodes, workers):
+    graph = Dijkstra.from_edges(num_nodes, random_sparse(num_nodes, 8, seed=num_nodes))
+    csr = (graph.graph, graph.edges)
+    expected, loop_s = timed(loop, num_nodes, graph)
+    row = f"{num_nodes:>8}{len(graph.edges):>9}{loop_s:>10.2f}"
+    for kwargs in ({'method': 'dijkstra', 'workers': workers}, {'method': 'floyd'}):
+        if kwargs['method'] == 'floyd' and num_nodes > 2000:
+            row += f"{'-':>10}"
+            continue
+        matrix, seconds = timed(all_pairs, num_nodes, csr, **kwargs)
+        for source in range(0, num_nodes, max(1, num_nodes // 20)):
+            got = [float('inf') if d == UNREACHABLE else d for d in matrix[source].tolist()]
+            assert got == expected[source]
+        row += f"{seconds:>10.2f}"
+    print(row + f"{matrix.nbytes / 2 ** 20:>9.1f}")
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [500, 1000, 2000]
+    workers = os.cpu_count() or 1
+    print(f"{'nodes':>8}{'edges':>9}{'loop':>10}{f'pool x{workers}':>10}{'floyd':>10}{'MB':>9}")
+    for n in sizes:
+        bench(n, workers)
@@ -0,0 +1,66 @@
+"""A* expansions per second on grid graphs: heap-based engine versus the old sort-and-pop loop.
+
+Usage: python -m benchmarks.bench_astar [side ...]   (a side of 1000 is a 10^6-node grid)
+
+The old loop is quadratic in the frontier size, so it is only run up to
+LEGACY_MAX_NODES unless --legacy-all is given.
+"""
+import sys
+import time
+
+from benchmarks.generators import grid, grid_heuristic
+from engine import AStar
+
+LEGACY_MAX_NODES = 40_000
+
+
+def legacy_a_star(graph, heuristic, start, goal):
+    """The previous /run-algorithm A*: open_set.sort() + pop(0) on every iteration."""
+    open_set = [(heuristic[start], 0, start, -1)]
+    visited = {}
+    step = 0
+    while open_set:
+        open_set.sort()
+        f, g, current, parent = open_set.pop(0)
+        if current in visited:
+            continue
+        visited[current] = parent
+        step += 1
+        if current == goal:
+            break
+        for neighbor, weight in graph.graph[current]:
+            if neighbor not in visited:
+                new_g = g + weight
+                open_set.append((new_g + heuristic[neighbor], new_g, neighbor, current))
+    return step
+
+
+def bench(side, run_legacy):
+    num_nodes = side * side
+    goal = num_nodes - 1
+    heuristic = grid_heuristic(side, side, goal)
+    graph = AStar.from_edges(num_nodes, grid(side, side, seed=side), heuristic)
+
+    t0 = time.perf_counter()
+    graph.a_star(0, goal)
+    heap_s = time.perf_counter() - t0
+    expansions = graph.stats['visited_count']
+    line = f"{num_nodes:>10}{expansions:>12}{expansions / heap_s:>14.0f}"
+
+    if run_legacy:
+        t0 = time.perf_counter()
+        legacy_steps = legacy_a_star(graph, heuristic, 0, goal)
+        legacy_s = time.perf_counter() - t0
+        line += f"{legacy_steps / legacy_s:>14.0f}{legacy_s / heap_s:>10.1f}x"
+    else:
+        line += f"{'-':>14}{'-':>11}"
+    print(line)
+
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    legacy_all = '--legacy-all' in sys.argv
+    sides = [int(a) for a in args] or [10, 32, 100, 200, 316, 1000]
+    print(f"{'nodes':>10}{'expanded':>12}{'heap exp/s':>14}{'legacy exp/s':>14}{'speedup':>11}")
+    for side in sides:
+        bench(side, legacy_all or side * side <= LEGACY_MAX_NODES)
@@ -0,0 +1,54 @@
+"""Bellman-Ford on mostly-positive sparse graphs: fixed n-1 passes vs early exit vs queue rounds.
+
+Usage: python -m benchmarks.bench_bellman_ford [num_nodes ...]
+
+The fixed-pass loop is O(V * E) and is only run up to LEGACY_MAX_NODES.
+"""
+import sys
+import time
+
+from benchmarks.generators import random_sparse
+from engine import BellmanFord
+
+LEGACY_MAX_NODES = 3000
+
+
+def legacy_bellman_ford(graph, start):
+    """The previous implementation: always num_nodes - 1 full passes."""
+    dist = [float('inf')] * graph.num_nodes
+    dist[start] = 0
+    for _ in range(graph.num_nodes - 1):
+        for u, v, w in graph.edges:
+            if dist[u] + w < dist[v]:
+                dist[v] = dist[u] + w
+            if dist[v] + w < dist[u]:
+                dist[u] = dist[v] + w
+    return dist
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def bench(num_nodes):
+    graph = BellmanFord.from_edges(num_nodes, random_sparse(num_nodes, seed=num_nodes))
+    (queue_dist, _), queue_s = timed(graph.bellman_ford, 0, method='queue')
+    queue_rounds = graph.stats['rounds']
+    (pass_dist, _), pass_s = timed(graph.bellman_ford, 0, method='passes')
+    pass_rounds = graph.stats['rounds']
+    assert queue_dist == pass_dist
+    line = f"{num_nodes:>9}{queue_s:>10.3f}{queue_rounds:>8}{pass_s:>10.3f}{pass_rounds:>8}"
+    if num_nodes <= LEGACY_MAX_NODES:
+        legacy_dist, legacy_s = timed(legacy_bellman_ford, graph, 0)
+        assert legacy_dist == queue_dist
+        line += f"{legacy_s:>10.3f}{legacy_s / queue_s:>10.0f}x"
+    print(line)
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 3000, 30_000, 300_000]
+    print(f"{'nodes':>9}{'queue s':>10}{'rounds':>8}{'passes s':>10}{'passes':>8}{'legacy s':>10}{'speedup':>11}")
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,53 @@
+"""Contraction hierarchy: preprocessing time vs query speedup over target-mode Dijkstra.
+
+The break-even column is how many queries it takes before preprocessing has
+paid for itself. Random sparse graphs are only run at small sizes: they have
+no road-like hierarchy, so building one takes minutes beyond a few thousand nodes.
+
+Usage: python -m benchmarks.bench_ch [grid_side ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.generators import grid, random_sparse
+from engine import Dijkstra
+from engine.ch import CH, build_hierarchy
+
+RANDOM_MAX_NODES = 2500
+
+
+def bench(name, num_nodes, edges, queries=100):
+    dij = Dijkstra.from_edges(num_nodes, edges)
+    csr = (dij.graph, dij.edges)
+    t0 = time.perf_counter()
+    hierarchy = build_hierarchy(num_nodes, csr)
+    build_s = time.perf_counter() - t0
+    ch = CH(num_nodes, csr=csr, hierarchy=hierarchy)
+    rng = random.Random(num_nodes)
+    pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(queries)]
+    dij_s = ch_s = 0.0
+    for s, t in pairs:
+        t0 = time.perf_counter()
+        dist, _ = dij.dijkstra(s, targets=[t])
+        dij_s += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        distance, path = ch.query(s, t)
+        ch_s += time.perf_counter() - t0
+        assert distance == dist[t]
+        assert sum(min(w for v, w in csr[0][a] if v == b) for a, b in zip(path, path[1:])) == dist[t]
+    saved = (dij_s - ch_s) / queries
+    break_even = f"{build_s / saved:.0f}" if saved > 0 else "-"
+    print(f"{name:>16}{num_nodes:>9}{hierarchy.num_edges():>10}{build_s:>9.2f}{dij_s / queries * 1000:>10.2f}"
+          f"{ch_s / queries * 1000:>10.3f}{dij_s / ch_s:>9.1f}x{break_even:>11}")
+
+
+if __name__ == '__main__':
+    sides = [int(a) for a in sys.argv[1:]] or [50, 100, 200]
+    print(f"{'graph':>16}{'nodes':>9}{'up edges':>10}{'build s':>9}{'dij ms':>10}{'ch ms':>10}{'speedup':>10}"
+          f"{'break-even':>11}")
+    for side in sides:
+        n = side * side
+        bench(f"grid {side}x{side}", n, grid(side, side))
+        if n <= RANDOM_MAX_NODES:
+            bench("random sparse", n, random_sparse(n, 4, seed=side))
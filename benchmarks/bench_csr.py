@@ -0,0 +1,72 @@
+"""Memory and throughput of the CSR graph layout versus the list-of-tuples layout.
+
+Usage: python -m benchmarks.bench_csr [num_nodes ...]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generators import random_sparse
+from engine import BFS, Dijkstra
+
+
+def build_lists(cls, num_nodes, edges):
+    graph = cls(num_nodes)
+    for u, v, w in edges:
+        graph.add_edge(u, v, w)
+    return graph
+
+
+def build_csr(cls, num_nodes, edges):
+    return cls.from_edges(num_nodes, edges)
+
+
+def measure_build(builder, cls, num_nodes, edges):
+    """Time the build untraced, then rebuild under tracemalloc for memory figures."""
+    gc.collect()
+    t0 = time.perf_counter()
+    builder(cls, num_nodes, edges)
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    tracemalloc.start()
+    graph = builder(cls, num_nodes, edges)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, elapsed, current, peak
+
+
+def scan(graph):
+    """Touch every adjacency entry once; returns the number of entries."""
+    count = 0
+    for u in range(graph.num_nodes):
+        for _v, _w in graph.graph[u]:
+            count += 1
+    return count
+
+
+def bench(num_nodes):
+    edges = random_sparse(num_nodes, seed=num_nodes)
+    print(f"\nn = {num_nodes}, m = {len(edges)}")
+    print(f"{'layout':<8}{'build s':>10}{'retained MB':>14}{'peak MB':>10}{'scan Medge/s':>15}{'dijkstra s':>12}")
+    for name, builder in (('lists', build_lists), ('csr', build_csr)):
+        graph, build_s, current, peak = measure_build(builder, Dijkstra, num_nodes, edges)
+        t0 = time.perf_counter()
+        entries = scan(graph)
+        scan_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        graph.dijkstra(0)
+        dij_s = time.perf_counter() - t0
+        print(f"{name:<8}{build_s:>10.3f}{current / 2**20:>14.1f}{peak / 2**20:>10.1f}"
+              f"{entries / scan_s / 1e6:>15.2f}{dij_s:>12.3f}")
+        del graph
+    bfs_lists = build_lists(BFS, num_nodes, edges)
+    bfs_csr = build_csr(BFS, num_nodes, edges)
+    same = bfs_lists.bfs(0) == bfs_csr.bfs(0)
+    print(f"BFS order identical: {same}")
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,25 @@
+"""Iterative DFS on long chains: time per vertex should stay flat as the chain grows.
+
+Usage: python -m benchmarks.bench_dfs [num_nodes ...]
+"""
+import sys
+import time
+
+from benchmarks.generators import chain
+from engine import DFS
+
+
+def bench(num_nodes):
+    graph = DFS.from_edges(num_nodes, chain(num_nodes))
+    t0 = time.perf_counter()
+    result = graph.dfs_tree(0)
+    elapsed = time.perf_counter() - t0
+    assert len(result.pre) == num_nodes
+    print(f"{num_nodes:>10}{elapsed:>10.3f}{elapsed / num_nodes * 1e9:>12.0f}")
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'nodes':>10}{'time s':>10}{'ns/vertex':>12}")
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,72 @@
+"""Incremental shortest-path tree repair vs recomputing Dijkstra after every edge update.
+
+Applies a random mix of insertions, deletions and reweights (small weights,
+so most updates touch the tree) and checks after each one that the repaired
+distances equal a full recomputation and that every checked path has that cost.
+
+Usage: python -m benchmarks.bench_dynamic [num_nodes ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.generators import grid, random_sparse
+from engine import Dijkstra
+from engine.dynamic import DynamicDijkstra
+
+OPS = ('insert', 'delete', 'reweight')
+
+
+def path_cost(graph, path):
+    return sum(graph.graph.weight(a, b) for a, b in zip(path, path[1:]))
+
+
+def bench(name, num_nodes, edges, updates=200, max_weight=10, seed=0):
+    rng = random.Random(seed)
+    dyn = DynamicDijkstra.from_edges(num_nodes, edges)
+    start = rng.randrange(num_nodes)
+    dyn.track(start)
+    current = list(edges)
+    repair_s = full_s = 0.0
+    changed = 0
+    for _ in range(updates):
+        op = rng.choice(OPS) if current else 'insert'
+        if op == 'insert':
+            u, v, w = rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, max_weight)
+            t0 = time.perf_counter()
+            changed += dyn.insert_edge(u, v, w)
+            repair_s += time.perf_counter() - t0
+            current.append((u, v, w))
+        else:
+            i = rng.randrange(len(current))
+            u, v, w = current[i]
+            if op == 'delete':
+                current[i] = current[-1]
+                current.pop()
+                t0 = time.perf_counter()
+                changed += dyn.delete_edge(u, v, w)
+            else:
+                new = rng.randint(1, max_weight)
+                current[i] = (u, v, new)
+                t0 = time.perf_counter()
+                changed += dyn.update_weight(u, v, new, w)
+            repair_s += time.perf_counter() - t0
+        full = Dijkstra.from_edges(num_nodes, current)
+        t0 = time.perf_counter()
+        dist, _ = full.dijkstra(start)
+        full_s += time.perf_counter() - t0
+        assert dyn.dist == dist
+        for t in rng.sample(range(num_nodes), min(5, num_nodes)):
+            path = dyn.path(t)
+            assert (path_cost(dyn, path) == dist[t]) if path else dist[t] == float('inf')
+    print(f"{name:>16}{num_nodes:>9}{len(current):>9}{full_s / updates * 1000:>10.2f}"
+          f"{repair_s / updates * 1000:>11.3f}{full_s / repair_s:>9.1f}x{changed / updates:>10.1f}")
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f"{'graph':>16}{'nodes':>9}{'edges':>9}{'full ms':>10}{'repair ms':>11}{'speedup':>10}{'changed':>10}")
+    for n in sizes:
+        side = int(n ** 0.5)
+        bench(f"grid {side}x{side}", side * side, grid(side, side))
+        bench("random sparse", n, random_sparse(n, 4, max_weight=10, seed=n))
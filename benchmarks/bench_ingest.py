@@ -0,0 +1,53 @@
+"""Loading a large SNAP-style edge list: text parse vs the memory-mapped binary format.
+
+Usage: python -m benchmarks.bench_ingest [num_edges ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from engine import loaders
+from engine.csr import save_csr
+from engine.loaders import load_graph
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def write_edge_list(path, num_nodes, num_edges, seed=0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    edges = np.column_stack([rng.integers(0, num_nodes, num_edges), rng.integers(0, num_nodes, num_edges),
+                             rng.integers(1, 100, num_edges)])
+    with open(path, 'w') as f:
+        f.write("# FromNodeId\tToNodeId\tWeight\n")
+        np.savetxt(f, edges, fmt='%d', delimiter='\t')
+
+
+def bench(num_edges, directory):
+    text = os.path.join(directory, 'edges.txt')
+    binary = os.path.join(directory, 'graph.csr')
+    write_edge_list(text, max(2, num_edges // 5), num_edges)
+    (num_nodes, csr), parse_s = timed(load_graph, text)
+    _, save_s = timed(save_csr, binary, num_nodes, csr)
+    _, mmap_s = timed(load_graph, binary)
+    _, read_s = timed(load_graph, binary, None, False)
+    row = f"{num_edges:>10}{os.path.getsize(text) / 2 ** 20:>9.1f}{parse_s:>10.3f}{save_s:>9.3f}{mmap_s:>9.4f}{read_s:>9.3f}"
+    if num_edges <= 10 ** 6:
+        loaders.HAVE_NUMPY = False
+        _, python_s = timed(load_graph, text)
+        loaders.HAVE_NUMPY = True
+        row += f"{python_s:>10.3f}"
+    print(row)
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10 ** 5, 10 ** 6, 10 ** 7]
+    print(f"{'edges':>10}{'text MB':>9}{'parse np':>10}{'save':>9}{'mmap':>9}{'read':>9}{'parse py':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for m in sizes:
+            bench(m, directory)
@@ -0,0 +1,60 @@
+"""Yen's k shortest paths on graphs of 10^5 edges and more.
+
+Every spur search runs on the shared adjacency with vertices and edges
+masked out. The "copy ms" column is what building a graph without them
+would add to each of those searches instead: one build_csr of the
+remaining edges.
+
+Usage: python -m benchmarks.bench_kpaths [k] [num_nodes ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.generators import grid, random_sparse
+from engine.csr import build_csr
+from engine.kpaths import KShortestPaths
+
+
+def check(graph, start, goal, found):
+    distances = [d for d, _ in found]
+    assert distances == sorted(distances)
+    assert len({tuple(p) for _, p in found}) == len(found)
+    for distance, path in found:
+        assert path[0] == start and path[-1] == goal and len(set(path)) == len(path)
+        assert sum(graph.edge_weight(u, v) for u, v in zip(path, path[1:])) == distance
+    dist, _ = graph.dijkstra(start, targets=[goal])
+    assert not found or distances[0] == dist[goal]
+
+
+def bench(name, num_nodes, edges, k, queries=5):
+    graph = KShortestPaths.from_edges(num_nodes, edges)
+    rng = random.Random(num_nodes)
+    yen_s = 0.0
+    searches = paths = 0
+    for _ in range(queries):
+        s, t = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        t0 = time.perf_counter()
+        found = graph.k_shortest(s, t, k)
+        yen_s += time.perf_counter() - t0
+        searches += graph.stats['searches']
+        paths += len(found)
+        check(graph, s, t, found)
+    t0 = time.perf_counter()
+    build_csr(num_nodes, [e for e in graph.edges if e[0] != s])
+    copy_s = time.perf_counter() - t0
+    print(f"{name:>16}{num_nodes:>9}{len(edges):>10}{paths / queries:>7.1f}{yen_s / queries:>9.2f}"
+          f"{searches / queries:>10.0f}{yen_s / searches * 1000:>11.2f}{copy_s * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    k = args[0] if args else 5
+    sizes = args[1:] or [50000, 100000]
+    print(f"k = {k}")
+    print(f"{'graph':>16}{'nodes':>9}{'edges':>10}{'paths':>7}{'yen s':>9}{'searches':>10}{'search ms':>11}"
+          f"{'copy ms':>10}")
+    for n in sizes:
+        side = int(n ** 0.5)
+        bench(f"grid {side}x{side}", side * side, grid(side, side, seed=n), k)
+        bench("random sparse", n, random_sparse(n, 4, seed=n), k)
@@ -0,0 +1,45 @@
+"""A* with landmark (ALT) bounds vs target-mode Dijkstra on point-to-point queries.
+
+Usage: python -m benchmarks.bench_landmarks [grid_side ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.generators import grid, random_sparse
+from engine import AStar, Dijkstra
+from engine.landmarks import build_landmarks
+
+
+def bench(name, num_nodes, edges, queries=50, k=8):
+    dij = Dijkstra.from_edges(num_nodes, edges)
+    csr = (dij.graph, dij.edges)
+    t0 = time.perf_counter()
+    table = build_landmarks(num_nodes, csr, k)
+    build_s = time.perf_counter() - t0
+    astar = AStar(num_nodes, csr=csr, landmarks=table)
+    rng = random.Random(num_nodes)
+    pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(queries)]
+    dij_s = alt_s = 0.0
+    dij_settled = alt_settled = 0
+    for s, t in pairs:
+        t0 = time.perf_counter()
+        dist, _ = dij.dijkstra(s, targets=[t])
+        dij_s += time.perf_counter() - t0
+        dij_settled += dij.stats['visited_count']
+        t0 = time.perf_counter()
+        path = astar.a_star(s, t)
+        alt_s += time.perf_counter() - t0
+        alt_settled += astar.stats['visited_count']
+        assert sum(min(w for v, w in csr[0][a] if v == b) for a, b in zip(path, path[1:])) == dist[t]
+    print(f"{name:>16}{num_nodes:>9}{build_s:>9.2f}{dij_s / queries * 1000:>10.1f}{alt_s / queries * 1000:>10.1f}"
+          f"{dij_settled // queries:>10}{alt_settled // queries:>10}")
+
+
+if __name__ == '__main__':
+    sides = [int(a) for a in sys.argv[1:]] or [50, 100, 200]
+    print(f"{'graph':>16}{'nodes':>9}{'build s':>9}{'dij ms':>10}{'alt ms':>10}{'dij set':>10}{'alt set':>10}")
+    for side in sides:
+        n = side * side
+        bench(f"grid {side}x{side}", n, grid(side, side))
+        bench("random sparse", n, random_sparse(n, 4, seed=side))
@@ -0,0 +1,35 @@
+"""Kruskal vs Prim minimum spanning trees on graphs of 10^5 edges and more.
+
+Both must find the same total weight; Kruskal's time includes sorting the edges.
+
+Usage: python -m benchmarks.bench_mst [num_nodes ...]
+"""
+import sys
+import time
+
+from benchmarks.generators import grid, random_sparse, scale_free
+from engine.mst import MST
+
+
+def bench(name, num_nodes, edges):
+    mst = MST.from_edges(num_nodes, edges)
+    t0 = time.perf_counter()
+    kruskal_weight, kruskal_tree = mst.kruskal()
+    kruskal_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    prim_weight, prim_tree = mst.prim()
+    prim_s = time.perf_counter() - t0
+    assert kruskal_weight == prim_weight and len(kruskal_tree) == len(prim_tree)
+    print(f"{name:>16}{num_nodes:>9}{len(edges):>10}{kruskal_weight:>12}{kruskal_s:>11.3f}{prim_s:>9.3f}"
+          f"{len(edges) / kruskal_s / 1e6:>10.2f}{len(edges) / prim_s / 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [50000, 100000, 250000]
+    print(f"{'graph':>16}{'nodes':>9}{'edges':>10}{'weight':>12}{'kruskal s':>11}{'prim s':>9}"
+          f"{'kr Me/s':>10}{'prim Me/s':>10}")
+    for n in sizes:
+        side = int(n ** 0.5)
+        bench(f"grid {side}x{side}", side * side, grid(side, side, seed=n))
+        bench("random sparse", n, random_sparse(n, 4, seed=n))
+        bench("scale-free", n, scale_free(n, 2, seed=n))
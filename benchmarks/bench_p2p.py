@@ -0,0 +1,48 @@
+"""Point-to-point Dijkstra: full search vs early exit vs bidirectional.
+
+Reports the mean number of settled vertices and mean query time over
+random (start, end) pairs on large sparse graphs.
+
+Usage: python -m benchmarks.bench_p2p [num_nodes ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.generators import grid, random_sparse
+from engine import Dijkstra
+
+QUERIES = 20
+
+
+def run(graph, pairs, search):
+    settled = 0
+    t0 = time.perf_counter()
+    for s, t in pairs:
+        if search == 'full':
+            graph.dijkstra(s)
+        elif search == 'target':
+            graph.dijkstra(s, targets=[t])
+        else:
+            graph.bidirectional(s, t)
+        settled += graph.stats['visited_count']
+    return settled / len(pairs), (time.perf_counter() - t0) / len(pairs)
+
+
+def bench(name, num_nodes, edges):
+    graph = Dijkstra.from_edges(num_nodes, edges)
+    rng = random.Random(num_nodes)
+    pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(QUERIES)]
+    print(f"\n{name}: n = {num_nodes}, m = {len(edges)}")
+    print(f"{'search':<15}{'settled':>12}{'ms/query':>12}")
+    for search in ('full', 'target', 'bidirectional'):
+        settled, per_query = run(graph, pairs, search)
+        print(f"{search:<15}{settled:>12.0f}{per_query * 1e3:>12.2f}")
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in sizes:
+        bench('random sparse', n, random_sparse(n, seed=n))
+        side = int(n ** 0.5)
+        bench('grid', side * side, grid(side, side, seed=side))
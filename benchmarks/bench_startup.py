@@ -0,0 +1,61 @@
+"""Cold-start cost: import time and peak RSS of the CLI, the API and the engine.
+
+Every measurement runs in a fresh interpreter (median of several runs).
+Exits with status 1 if importing the CLI or the API pulls in the
+visualization stack (networkx, matplotlib), which must only load on the
+first drawing.
+
+Usage: python -m benchmarks.bench_startup [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# name -> (statement, modules that must not be loaded afterwards)
+TARGETS = {
+    'engine': ("import engine", ('networkx', 'matplotlib')),
+    'cli': ("import algorithms", ('networkx', 'matplotlib')),
+    'api': ("import api", ('networkx', 'matplotlib')),
+    'visualization': ("import networkx, matplotlib.pyplot", ()),
+}
+HEAVY = ('numpy', 'networkx', 'matplotlib', 'flask')
+
+_PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{'seconds': elapsed, 'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', _PROBE.format(statement=statement, heavy=HEAVY)],
+                             cwd=ROOT, capture_output=True, text=True, check=True,
+                             env={**os.environ, 'MPLBACKEND': 'Agg'})
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return (statistics.median(s['seconds'] for s in samples),
+            statistics.median(s['rss_kb'] for s in samples),
+            samples[0]['loaded'])
+
+
+def main(runs):
+    print(f"{'target':>14}{'import ms':>11}{'rss MB':>9}  heavy modules loaded")
+    failed = []
+    for name, (statement, forbidden) in TARGETS.items():
+        seconds, rss_kb, loaded = measure(statement, runs)
+        print(f"{name:>14}{seconds * 1000:>11.0f}{rss_kb / 1024:>9.1f}  {', '.join(loaded) or '-'}")
+        failed.extend(f"{name} imports {m}" for m in forbidden if m in loaded)
+    for message in failed:
+        print(f"REGRESSION: {message}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
@@ -0,0 +1,206 @@
+"""Benchmark suite: every algorithm on every generated graph family, CLI and API code paths.
+
+For each family, size, algorithm and implementation this records
+
+* build: seconds to turn the edge list into the graph the implementation
+  uses (``add_edge`` per edge for the CLI classes in algorithms.py,
+  build_csr for run_query, which is what api.py calls);
+* seconds: wall time of the search itself (best of ``--repeat`` runs);
+* edges_per_s: graph edges per second of search, the traversed-edges
+  rate of the Graph500 benchmark, comparable across implementations;
+* peak_mb: peak memory allocated by the search, from a separate run under
+  tracemalloc so tracing does not distort the timings.
+
+Slow combinations are skipped above the limits in MAX_NODES. Results are
+saved as JSON; ``--compare`` prints the time ratio against an earlier file
+and exits with status 1 if anything got slower than ``--threshold``.
+
+Usage: python -m benchmarks.bench_suite [--sizes 100 1000 ...] [--families grid ...]
+       [--algorithms bfs ...] [--impls cli api] [--out results.json] [--compare old.json]
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import algorithms
+from benchmarks.generators import chain, grid, grid_heuristic, random_dense, random_sparse, scale_free
+from engine import Tracer, TRACE_SUMMARY, build_csr, run_query
+
+SIZES = [10 ** k for k in range(2, 7)]
+ALGORITHM_NAMES = ['bfs', 'dfs', 'dijkstra', 'bellmanford', 'astar']
+IMPLS = ['cli', 'api']
+
+# family -> (nodes -> edges, nodes actually built), largest node count to run it at
+FAMILIES = {
+    'grid': (lambda n: (grid(math.isqrt(n), math.isqrt(n), seed=n), math.isqrt(n) ** 2), 10 ** 6),
+    'sparse': (lambda n: (random_sparse(n, seed=n), n), 10 ** 6),
+    'dense': (lambda n: (random_dense(n, density=0.1, seed=n), n), 3000),
+    'scale_free': (lambda n: (scale_free(n, seed=n), n), 10 ** 6),
+    'chain': (lambda n: (chain(n, max_weight=10, seed=n), n), 10 ** 6),
+}
+# algorithm -> largest node count to run it at
+MAX_NODES = {'bellmanford': 10 ** 5}
+
+_CLI_CLASSES = {
+    'bfs': algorithms.BFS, 'dfs': algorithms.DFS, 'dijkstra': algorithms.Dijkstra,
+    'bellmanford': algorithms.BellmanFord, 'astar': algorithms.AStar,
+}
+
+
+def _heuristic(family, num_nodes, goal):
+    if family == 'grid':
+        side = math.isqrt(num_nodes)
+        return grid_heuristic(side, side, goal)
+    return [0] * num_nodes
+
+
+def build_cli(algo, num_nodes, edges, heuristic):
+    """The graph as the CLI builds it from typed-in edges."""
+    cls = _CLI_CLASSES[algo]
+    graph = cls(num_nodes, heuristic) if algo == 'astar' else cls(num_nodes)
+    for u, v, w in edges:
+        graph.add_edge(u, v, w)
+    return graph
+
+
+def search_cli(algo, graph, start, end):
+    """The search the CLI runs for the menu choice."""
+    if algo == 'bfs':
+        graph.bfs(start)
+    elif algo == 'dfs':
+        graph.dfs(start)
+    elif algo == 'dijkstra':
+        graph.dijkstra(start, targets=[end])
+    elif algo == 'bellmanford':
+        graph.bellman_ford(start)
+    else:
+        graph.a_star(start, end)
+
+
+def search_api(algo, csr, start, end, heuristic):
+    """run_query as /run-algorithm calls it, step text included."""
+    run_query(algo, len(csr[0]), csr=csr, start=start, end=end,
+              heuristic=heuristic if algo == 'astar' else None, tracer=Tracer(TRACE_SUMMARY))
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def peak_bytes(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_case(family, num_nodes, edges, algo, impl, repeat, memory):
+    start, end = 0, num_nodes - 1
+    heuristic = _heuristic(family, num_nodes, end)
+    if impl == 'cli':
+        build_s, graph = timed(lambda: build_cli(algo, num_nodes, edges, heuristic), 1)
+        search = lambda: search_cli(algo, graph, start, end)  # noqa: E731
+    else:
+        build_s, csr = timed(lambda: build_csr(num_nodes, edges), 1)
+        search = lambda: search_api(algo, csr, start, end, heuristic)  # noqa: E731
+    seconds, _ = timed(search, repeat)
+    return {
+        'family': family, 'nodes': num_nodes, 'edges': len(edges), 'algorithm': algo, 'impl': impl,
+        'build': build_s, 'seconds': seconds,
+        'edges_per_s': len(edges) / seconds if seconds else None,
+        'peak_mb': peak_bytes(search) / 2 ** 20 if memory else None,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, families, algos, impls, repeat=3, memory=True):
+    results = []
+    print(f"{'family':>11}{'nodes':>9}{'edges':>10}{'algorithm':>12}{'impl':>5}{'build s':>9}{'search s':>10}"
+          f"{'Medge/s':>8}{'peak MB':>9}")
+    for family in families:
+        generate, family_max = FAMILIES[family]
+        for size in sizes:
+            if size > family_max:
+                continue
+            edges, num_nodes = generate(size)
+            for algo in algos:
+                if num_nodes > MAX_NODES.get(algo, float('inf')):
+                    continue
+                for impl in impls:
+                    r = bench_case(family, num_nodes, edges, algo, impl, repeat, memory)
+                    results.append(r)
+                    peak = '-' if r['peak_mb'] is None else f"{r['peak_mb']:.1f}"
+                    print(f"{family:>11}{num_nodes:>9}{len(edges):>10}{algo:>12}{impl:>5}{r['build']:>9.3f}"
+                          f"{r['seconds']:>10.4f}{(r['edges_per_s'] or 0) / 1e6:>8.2f}{peak:>9}", flush=True)
+            del edges
+    return results
+
+
+def compare(results, old_path, threshold):
+    """Print search time ratios against an earlier run; returns the cases slower than threshold."""
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    key = lambda r: (r['family'], r['nodes'], r['algorithm'], r['impl'])  # noqa: E731
+    before = {key(r): r for r in old['results']}
+    slower = []
+    print(f"\nCompared with {old_path} (commit {old.get('commit') or '?'}):")
+    for r in results:
+        b = before.get(key(r))
+        if b is None:
+            continue
+        ratio = r['seconds'] / b['seconds'] if b['seconds'] else 1.0
+        flag = ''
+        if ratio > threshold:
+            slower.append(r)
+            flag = '  SLOWER'
+        print(f"{r['family']:>11}{r['nodes']:>9}{r['algorithm']:>12}{r['impl']:>5}{ratio:>8.2f}x{flag}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--families', nargs='+', choices=list(FAMILIES), default=list(FAMILIES))
+    parser.add_argument('--algorithms', nargs='+', choices=ALGORITHM_NAMES, default=ALGORITHM_NAMES)
+    parser.add_argument('--impls', nargs='+', choices=IMPLS, default=IMPLS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc runs")
+    parser.add_argument('--out', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.families, args.algorithms, args.impls, args.repeat, not args.no_memory)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'commit': _commit(), 'python': platform.python_version(), 'created': time.time(),
+                       'results': results}, f, indent=1)
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Pure-Python vs NumPy Bellman-Ford and BFS on dense-edge graphs.
+
+Usage: python -m benchmarks.bench_vectorized [num_nodes ...]
+"""
+import sys
+import time
+
+from benchmarks.generators import random_dense
+from engine import BFS, BellmanFord
+from engine.vectorized import NumpyBFS, NumpyBellmanFord
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def bench(num_nodes, density):
+    edges = random_dense(num_nodes, density, seed=num_nodes)
+    row = f"{num_nodes:>8}{len(edges):>10}"
+    for pure_cls, numpy_cls, method in ((BFS, NumpyBFS, 'bfs'), (BellmanFord, NumpyBellmanFord, 'bellman_ford')):
+        pure = pure_cls.from_edges(num_nodes, edges)
+        fast = numpy_cls(num_nodes, csr=(pure.graph, pure.edges))
+        expected, pure_s = timed(getattr(pure, method), 0)
+        got, numpy_s = timed(getattr(fast, method), 0)
+        if method == 'bfs':
+            assert got == expected
+        else:
+            assert got[0] == expected[0]
+        row += f"{pure_s:>10.3f}{numpy_s:>10.3f}{pure_s / numpy_s:>8.1f}x"
+    print(row)
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 3000, 10_000]
+    print(f"{'nodes':>8}{'edges':>10}{'bfs py':>10}{'bfs np':>10}{'speedup':>9}{'bf py':>10}{'bf np':>10}{'speedup':>9}")
+    for n in sizes:
+        bench(n, density=min(0.2, 200 / n))
@@ -0,0 +1,62 @@
+"""Seeded synthetic graph generators used by the benchmark scripts."""
+import random
+
+
+def random_sparse(num_nodes, avg_degree=4, max_weight=100, seed=0):
+    """Connected random graph: a random spanning tree plus extra random edges."""
+    rng = random.Random(seed)
+    edges = []
+    for v in range(1, num_nodes):
+        edges.append((rng.randrange(v), v, rng.randint(1, max_weight)))
+    extra = max(0, num_nodes * avg_degree // 2 - len(edges))
+    for _ in range(extra):
+        edges.append((rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, max_weight)))
+    return edges
+
+
+def grid(rows, cols, max_weight=10, seed=0):
+    """4-connected rows x cols grid; vertex (r, c) is numbered r * cols + c."""
+    rng = random.Random(seed)
+    edges = []
+    for r in range(rows):
+        base = r * cols
+        for c in range(cols):
+            u = base + c
+            if c + 1 < cols:
+                edges.append((u, u + 1, rng.randint(1, max_weight)))
+            if r + 1 < rows:
+                edges.append((u, u + cols, rng.randint(1, max_weight)))
+    return edges
+
+
+def grid_heuristic(rows, cols, goal):
+    """Manhattan distance to goal; admissible for grid() since every weight is >= 1."""
+    gr, gc = divmod(goal, cols)
+    return [abs(r - gr) + abs(c - gc) for r in range(rows) for c in range(cols)]
+
+
+def chain(num_nodes, max_weight=1, seed=0):
+    """Path graph 0 - 1 - ... - (n-1): the worst case for recursive DFS."""
+    rng = random.Random(seed)
+    return [(v - 1, v, rng.randint(1, max_weight)) for v in range(1, num_nodes)]
+
+
+def random_dense(num_nodes, density=0.1, max_weight=100, seed=0):
+    """Random graph with about density * n * (n - 1) / 2 edges (plus a spanning tree)."""
+    return random_sparse(num_nodes, avg_degree=max(1, int(density * (num_nodes - 1))),
+                         max_weight=max_weight, seed=seed)
+
+
+def scale_free(num_nodes, edges_per_node=2, max_weight=100, seed=0):
+    """Barabasi-Albert preferential attachment: a few hubs, many low-degree vertices."""
+    rng = random.Random(seed)
+    edges = []
+    # Every edge endpoint once, so a uniform pick from it is a degree-proportional pick of a vertex
+    endpoints = []
+    for v in range(1, num_nodes):
+        picked = {rng.choice(endpoints) if endpoints else 0 for _ in range(min(v, edges_per_node))}
+        for u in picked:
+            edges.append((u, v, rng.randint(1, max_weight)))
+            endpoints.append(u)
+            endpoints.append(v)
+    return edges
@@ -0,0 +1,9 @@
+"""Graph algorithm engine shared by the CLI (algorithms.py) and the Flask API (api.py)."""
+from .csr import CSRAdjacency, EdgeArray, build_csr
+from .graph import Graph
+from .query import ALGORITHMS, make_graph, run_query
+from .search import BFS, DFS, DFSResult, Dijkstra, BellmanFord, AStar
+from .tracing import (
+    TRACE_FULL, TRACE_MODES, TRACE_NONE, TRACE_SUMMARY,
+    NullTracer, PrintTracer, Tracer, format_event,
+)
@@ -0,0 +1,150 @@
+"""All-pairs shortest path distances.
+
+Sources are sharded over a ProcessPoolExecutor. Nothing is pickled per
+task except a list of source vertices: the graph is written once in the
+binary CSR format to a RAM-backed temp directory and every worker maps
+it with ``load_csr(mmap=True)``, so all processes share the same pages.
+Workers write their rows straight into the distance matrix, an ``.npy``
+file that is also memory-mapped (and kept on disk if ``out`` is given).
+
+The matrix is compact: integer weights give an int32 matrix (int64 if
+distances could overflow) with ``UNREACHABLE`` (-1) for unreachable
+pairs; float weights give float64 with ``inf``. Small or dense graphs use a
+vectorized Floyd-Warshall instead of one Dijkstra per source.
+
+Requires NumPy.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import tempfile
+
+from .csr import load_csr, save_csr, typecode_of
+from .search import Dijkstra
+from .vectorized import HAVE_NUMPY, as_numpy, np
+
+UNREACHABLE = -1
+METHODS = ('auto', 'dijkstra', 'floyd')
+# 'auto' picks Floyd-Warshall for graphs this small, and up to FLOYD_DENSE_MAX_NODES
+# when at least FLOYD_MIN_DENSITY of all vertex pairs are edges
+FLOYD_MAX_NODES = 600
+FLOYD_DENSE_MAX_NODES = 1500
+FLOYD_MIN_DENSITY = 0.05
+# Below this many nodes the pool costs more than it saves
+PARALLEL_MIN_NODES = 300
+
+
+def matrix_dtype(num_nodes, csr):
+    """int32/int64 for integer weights (whichever holds every distance), float64 otherwise."""
+    edges = csr[1]
+    if typecode_of(edges.ws) == 'd':
+        return np.dtype(np.float64)
+    # A shortest path uses each edge at most once
+    bound = int(np.abs(as_numpy(edges.ws)).sum())
+    return np.dtype(np.int32 if bound < 2 ** 31 else np.int64)
+
+
+def _store_row(matrix, source, dist):
+    row = np.array(dist, dtype=np.float64)
+    if matrix.dtype.kind == 'f':
+        matrix[source] = row
+    else:
+        matrix[source] = np.where(np.isinf(row), UNREACHABLE, row)
+
+
+_worker = {}
+
+
+def _init_worker(graph_path, matrix_path):
+    num_nodes, csr = load_csr(graph_path, mmap=True)
+    _worker['graph'] = Dijkstra(num_nodes, csr=csr)
+    _worker['matrix'] = np.load(matrix_path, mmap_mode='r+')
+
+
+def _run_sources(sources):
+    graph = _worker['graph']
+    matrix = _worker['matrix']
+    for source in sources:
+        dist, _ = graph.dijkstra(source)
+        _store_row(matrix, source, dist)
+    matrix.flush()
+    return len(sources)
+
+
+def floyd_warshall(num_nodes, csr):
+    """Dense float64 distance matrix (inf when unreachable), one vectorized row/column update per k."""
+    edges = csr[1]
+    dist = np.full((num_nodes, num_nodes), np.inf)
+    us = as_numpy(edges.us)
+    vs = as_numpy(edges.vs)
+    ws = as_numpy(edges.ws).astype(np.float64)
+    # Parallel edges: keep the lightest one
+    np.minimum.at(dist, (us, vs), ws)
+    np.minimum.at(dist, (vs, us), ws)
+    np.fill_diagonal(dist, 0)
+    for k in range(num_nodes):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist
+
+
+def _use_floyd(num_nodes, csr, method):
+    if method == 'auto':
+        if num_nodes <= FLOYD_MAX_NODES:
+            return True
+        return num_nodes <= FLOYD_DENSE_MAX_NODES and 2 * len(csr[1]) >= FLOYD_MIN_DENSITY * num_nodes * num_nodes
+    return method == 'floyd'
+
+
+def all_pairs(num_nodes, csr, out=None, workers=None, method='auto'):
+    """Return the num_nodes x num_nodes distance matrix as a NumPy array.
+
+    With ``out`` the matrix is written to that ``.npy`` path and returned
+    memory-mapped (read it back later with ``np.load(out, mmap_mode='r')``).
+    ``workers`` defaults to the CPU count; 1 runs in this process.
+    """
+    if not HAVE_NUMPY:
+        raise ImportError("NumPy is required for all-pairs shortest paths")
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {', '.join(METHODS)}")
+    # Checks the node count and rejects negative weights, as Dijkstra does
+    graph = Dijkstra(num_nodes, csr=csr)
+    dtype = matrix_dtype(num_nodes, csr)
+
+    if _use_floyd(num_nodes, csr, method):
+        dist = floyd_warshall(num_nodes, csr)
+        if dtype.kind != 'f':
+            dist = np.where(np.isinf(dist), UNREACHABLE, dist)
+        if out is None:
+            return dist.astype(dtype)
+        matrix = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=(num_nodes, num_nodes))
+        matrix[:] = dist
+        matrix.flush()
+        return matrix
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or num_nodes < PARALLEL_MIN_NODES:
+        matrix = (np.empty((num_nodes, num_nodes), dtype=dtype) if out is None else
+                  np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=(num_nodes, num_nodes)))
+        for source in range(num_nodes):
+            dist, _ = graph.dijkstra(source)
+            _store_row(matrix, source, dist)
+        return matrix
+
+    # /dev/shm is RAM-backed on Linux; elsewhere the OS page cache does the sharing
+    scratch = tempfile.mkdtemp(prefix='allpairs-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    try:
+        graph_path = os.path.join(scratch, 'graph.csr')
+        save_csr(graph_path, num_nodes, csr)
+        matrix_path = out or os.path.join(scratch, 'dist.npy')
+        np.lib.format.open_memmap(matrix_path, mode='w+', dtype=dtype, shape=(num_nodes, num_nodes)).flush()
+        # Several shards per worker so a slow shard does not hold up the end
+        size = max(1, num_nodes // (workers * 8))
+        shards = [range(lo, min(lo + size, num_nodes)) for lo in range(0, num_nodes, size)]
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(graph_path, matrix_path)) as pool:
+            for _ in pool.map(_run_sources, shards):
+                pass
+        matrix = np.load(matrix_path, mmap_mode='r')
+        return matrix if out is not None else np.array(matrix)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
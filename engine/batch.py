@@ -0,0 +1,47 @@
+"""Answer many (start, end) queries on one graph with one search per distinct start."""
+from .query import make_graph
+from .vectorized import NumpyBellmanFord
+
+BATCH_ALGORITHMS = ('dijkstra', 'bellmanford')
+
+
+def batch_shortest_paths(algo, num_nodes, csr, queries, with_paths=True, vectorized=False):
+    """Return (dists, paths) aligned with ``queries``.
+
+    Queries sharing a start vertex reuse one shortest-path tree: the search
+    runs once, stops (for Dijkstra) as soon as all of that start's targets
+    are settled, and every target is read from the same dist/prev arrays.
+    Unreachable targets get a distance of None and an empty path; with a
+    negative cycle every query from that start is unreachable. ``vectorized``
+    runs Bellman-Ford with the NumPy kernel (same distances; on ties the
+    path may differ but has the same cost).
+    """
+    if algo not in BATCH_ALGORITHMS:
+        raise ValueError(f"Batch queries support {', '.join(BATCH_ALGORITHMS)}")
+    if vectorized and algo == 'bellmanford':
+        graph = NumpyBellmanFord(num_nodes, csr=csr)
+    else:
+        graph = make_graph(algo, num_nodes, csr)
+    by_start = {}
+    for i, (start, end) in enumerate(queries):
+        graph.check_node(start)
+        graph.check_node(end, "Target")
+        by_start.setdefault(start, []).append(i)
+
+    dists = [None] * len(queries)
+    paths = [[] for _ in queries] if with_paths else None
+    inf = float('inf')
+    for start, indices in by_start.items():
+        if algo == 'dijkstra':
+            dist, prev = graph.dijkstra(start, targets=[queries[i][1] for i in indices])
+        else:
+            dist, prev = graph.bellman_ford(start)
+        if dist is None:
+            continue
+        for i in indices:
+            end = queries[i][1]
+            if dist[end] != inf:
+                dists[i] = dist[end]
+                if with_paths:
+                    paths[i] = graph.reconstruct_path(prev, end, start)
+    return dists, paths
@@ -0,0 +1,150 @@
+"""Cache of search results keyed by graph content and query.
+
+A single-source search (Dijkstra over the whole graph, Bellman-Ford) does
+not depend on the end vertex, so one cached ``dist``/``prev`` answers every
+``end`` asked later from the same start, e.g. when the web UI switches
+targets. Entries are pickled, so their size is known exactly, and kept in
+a memory-bounded LRU. With ``path`` set, entries also go to a SQLite file
+that every gunicorn worker on the machine reads and writes.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+
+from .tracing import TRACE_NONE, Tracer
+
+# Rough memory of one recorded step event (a small tuple of ints)
+EVENT_BYTES = 100
+
+
+class RecordingTracer(Tracer):
+    """Forwards events to another tracer and keeps a copy to replay on cache hits.
+
+    At most ``max_events`` are kept. A longer trace could not be cached
+    anyway, so the copy is then dropped and ``complete`` becomes False;
+    the events still reach ``inner``.
+    """
+
+    def __init__(self, inner, max_events=None):
+        super().__init__(inner.mode)
+        self.inner = inner
+        self.max_events = max_events
+        self.complete = True
+
+    def emit(self, *event):
+        if self.complete:
+            if self.max_events is not None and len(self.events) >= self.max_events:
+                self.complete = False
+                self.events = []
+            else:
+                self.events.append(event)
+        self.inner.emit(*event)
+
+
+def query_key(graph_key, algo, start, end=None, heuristic=None, mode=TRACE_NONE):
+    """Canonical cache key; ``end`` and ``heuristic`` only matter for A*."""
+    parts = [graph_key, algo, str(start), mode]
+    if algo == 'astar':
+        parts.append(str(end))
+        parts.append(hashlib.sha1(repr(list(heuristic or [])).encode()).hexdigest())
+    return ':'.join(parts)
+
+
+class ResultCache:
+    def __init__(self, max_bytes=64 * 2 ** 20, path=None, max_disk_bytes=1024 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.cached_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()  # key -> pickled value
+        self._lock = threading.Lock()
+        if path is not None:
+            with self._connect() as db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("CREATE TABLE IF NOT EXISTS results "
+                           "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, used REAL)")
+                db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:  # commit on success
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key):
+        """Return the cached value for key, or None."""
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            return pickle.loads(data)
+        if self.path is not None:
+            with self._connect() as db:
+                row = db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            if row is not None:
+                data = row[0]
+                self._remember(key, data)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return pickle.loads(data)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def max_events(self):
+        """How many step events a recorded trace may hold and still fit in the cache."""
+        return self.max_bytes // EVENT_BYTES
+
+    def put(self, key, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._remember(key, data)
+        if self.path is not None and len(data) <= self.max_disk_bytes:
+            with self._connect() as db:
+                db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, data, len(data), time.time()))
+                # Drop the least recently used rows once the file holds too much
+                total = db.execute("SELECT SUM(size) FROM results").fetchone()[0]
+                while total > self.max_disk_bytes:
+                    oldest, size = db.execute("SELECT key, size FROM results ORDER BY used LIMIT 1").fetchone()
+                    db.execute("DELETE FROM results WHERE key = ?", (oldest,))
+                    total -= size
+
+    def _remember(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self.cached_bytes -= len(old)
+            self._cache[key] = data
+            self.cached_bytes += len(data)
+            while self.cached_bytes > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self.cached_bytes -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'entries': len(self._cache), 'bytes': self.cached_bytes}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.cached_bytes = 0
+        if self.path is not None:
+            with self._connect() as db:
+                db.execute("DELETE FROM results")
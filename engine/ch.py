@@ -0,0 +1,309 @@
+"""Contraction hierarchies: preprocess once, then answer point-to-point queries fast.
+
+Preprocessing contracts vertices one by one, least important first (by
+edge difference, already contracted neighbours and hierarchy depth, with
+lazy updates). Contracting v adds a shortcut u-w of weight
+d(u, v) + d(v, w) unless a bounded witness search finds a path that is
+no longer without v. Every vertex keeps its edges to higher-ranked
+vertices: that upward graph is all a query needs.
+
+A query runs Dijkstra upward from both ends (the graph is undirected, so
+both searches use the same upward edges) and stops once neither queue
+can beat the best meeting vertex. Shortcuts remember the vertex they
+bypass, so the path is unpacked back to original edges.
+
+Preprocessing pays off for sparse, road-like graphs queried many times.
+Random expander-like graphs have no such hierarchy: their last vertices
+form a dense core, so building is slow and queries barely beat Dijkstra.
+The hierarchy is saved next to the graph (``<graph>.ch``).
+"""
+from array import array
+import heapq
+import mmap
+import os
+import struct
+
+from .csr import _index_typecode, csr_digest, map_arrays, typecode_of
+from .graph import Graph
+from .tracing import NullTracer
+
+# Witness searches give up after settling this many vertices; a failed search
+# only costs an unnecessary shortcut, never a wrong distance.
+WITNESS_SETTLE_LIMIT = 100
+
+_MAGIC = b'CH1\0\0\0'
+_HEADER = struct.Struct('<qqcc40s')  # num_nodes, upward edges, index/weight typecodes, graph digest
+
+
+class Hierarchy:
+    """Vertex ranks plus the upward graph in CSR form (``middles`` is -1 for original edges)."""
+    __slots__ = ('rank', 'offsets', 'targets', 'weights', 'middles')
+
+    def __init__(self, rank, offsets, targets, weights, middles):
+        self.rank = rank
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.middles = middles
+
+    def __len__(self):
+        return len(self.rank)
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def up(self, u):
+        lo = self.offsets[u]
+        hi = self.offsets[u + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def middle(self, a, b):
+        """Vertex bypassed by the upward edge between a and b, or -1 for an original edge."""
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        targets = self.targets
+        for i in range(self.offsets[low], self.offsets[low + 1]):
+            if targets[i] == high:
+                return self.middles[i]
+        raise KeyError((a, b))
+
+    def unpack(self, path):
+        """Expand a path over upward edges into a path over original edges."""
+        if not path:
+            return []
+        out = [path[0]]
+        for a, b in zip(path, path[1:]):
+            stack = [(a, b)]
+            while stack:
+                x, y = stack.pop()
+                m = self.middle(x, y)
+                if m == -1:
+                    out.append(y)
+                else:
+                    stack.append((m, y))
+                    stack.append((x, m))
+        return out
+
+
+def _witness_search(adjacency, source, excluded, max_dist, targets):
+    """Bounded Dijkstra from source that avoids ``excluded``; returns tentative distances."""
+    dist = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    remaining = len(targets)
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if d > max_dist:
+            break
+        if u in targets:
+            remaining -= 1
+            if remaining == 0:
+                break
+        settled += 1
+        if settled >= WITNESS_SETTLE_LIMIT:
+            break
+        for v, (w, _) in adjacency[u].items():
+            if v == excluded:
+                continue
+            nd = d + w
+            if nd < dist.get(v, nd + 1):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _shortcuts(adjacency, v):
+    """Shortcuts (u, w, weight) that contracting v would need."""
+    neighbors = list(adjacency[v].items())
+    needed = []
+    for i, (u, (to_u, _)) in enumerate(neighbors):
+        rest = neighbors[i + 1:]
+        if not rest:
+            break
+        max_dist = to_u + max(to_w for _, (to_w, _) in rest)
+        dist = _witness_search(adjacency, u, v, max_dist, {w for w, _ in rest})
+        for w, (to_w, _) in rest:
+            via = to_u + to_w
+            if dist.get(w, via + 1) > via:
+                needed.append((u, w, via))
+    return needed
+
+
+def build_hierarchy(num_nodes, csr):
+    """Contract every vertex of the graph and return its Hierarchy."""
+    edges = csr[1]
+    adjacency = [{} for _ in range(num_nodes)]  # v -> {neighbour: (weight, middle)}
+    for u, v, w in edges:
+        if u == v:
+            continue
+        old = adjacency[u].get(v)
+        if old is None or w < old[0]:
+            adjacency[u][v] = (w, -1)
+            adjacency[v][u] = (w, -1)
+    contracted_neighbors = [0] * num_nodes
+    level = [0] * num_nodes
+
+    def priority(v, shortcuts):
+        return 2 * (len(shortcuts) - len(adjacency[v])) + contracted_neighbors[v] + level[v]
+
+    heap = [(priority(v, _shortcuts(adjacency, v)), v) for v in range(num_nodes)]
+    heapq.heapify(heap)
+    rank = [0] * num_nodes
+    upward = [None] * num_nodes
+    order = 0
+    while heap:
+        _, v = heapq.heappop(heap)
+        shortcuts = _shortcuts(adjacency, v)
+        # Lazy update: the stored priority may be stale since neighbours were contracted
+        current = priority(v, shortcuts)
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, v))
+            continue
+        rank[v] = order
+        order += 1
+        upward[v] = [(u, w, middle) for u, (w, middle) in adjacency[v].items()]
+        for u, w, via in shortcuts:
+            old = adjacency[u].get(w)
+            if old is None or via < old[0]:
+                adjacency[u][w] = (via, v)
+                adjacency[w][u] = (via, v)
+        for u in adjacency[v]:
+            del adjacency[u][v]
+            contracted_neighbors[u] += 1
+            level[u] = max(level[u], level[v] + 1)
+        adjacency[v] = {}
+
+    idx = _index_typecode(num_nodes)
+    wt = typecode_of(edges.ws)
+    offsets = array('q', [0])
+    targets = array(idx)
+    weights = array(wt)
+    middles = array(idx)
+    for v in range(num_nodes):
+        for u, w, middle in upward[v]:
+            targets.append(u)
+            weights.append(w)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return Hierarchy(array('q', rank), offsets, targets, weights, middles)
+
+
+def save_hierarchy(path, num_nodes, csr, hierarchy, digest=None):
+    digest = digest or csr_digest(num_nodes, csr)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_HEADER.pack(num_nodes, hierarchy.num_edges(), typecode_of(hierarchy.targets).encode(),
+                             typecode_of(hierarchy.weights).encode(), digest.encode()))
+        for arr in (hierarchy.rank, hierarchy.offsets, hierarchy.targets, hierarchy.weights, hierarchy.middles):
+            f.write(arr)
+    os.replace(tmp, path)
+
+
+def load_hierarchy(path, num_nodes, csr, digest=None):
+    """Map a saved hierarchy into memory; None if it is missing or belongs to a different graph."""
+    try:
+        with open(path, 'rb') as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError):
+        return None
+    pos = len(_MAGIC) + _HEADER.size
+    if len(view) < pos or view[:len(_MAGIC)] != _MAGIC:
+        return None
+    stored_nodes, num_edges, idx, wt, stored_digest = _HEADER.unpack(view[len(_MAGIC):pos])
+    if stored_nodes != num_nodes or stored_digest.decode() != (digest or csr_digest(num_nodes, csr)):
+        return None
+    idx, wt = idx.decode(), wt.decode()
+    try:
+        arrays = map_arrays(view, pos, (('q', num_nodes), ('q', num_nodes + 1), (idx, num_edges),
+                                        (wt, num_edges), (idx, num_edges)))
+    except ValueError:
+        return None
+    return Hierarchy(*arrays)
+
+
+def hierarchy_for(path, num_nodes, csr, digest=None):
+    """Load the hierarchy stored at ``path`` or build and store it."""
+    digest = digest or csr_digest(num_nodes, csr)
+    hierarchy = load_hierarchy(path, num_nodes, csr, digest)
+    if hierarchy is None:
+        hierarchy = build_hierarchy(num_nodes, csr)
+        save_hierarchy(path, num_nodes, csr, hierarchy, digest)
+    return hierarchy
+
+
+class CH(Graph):
+    """Point-to-point shortest paths over a contraction hierarchy.
+
+    The hierarchy is built on the first query unless one is passed in.
+    """
+    def __init__(self, num_nodes, csr=None, hierarchy=None):
+        super().__init__(num_nodes, csr=csr)
+        self.hierarchy = hierarchy
+
+    def hierarchy_table(self):
+        if self.hierarchy is None:
+            self.freeze()
+            self.hierarchy = build_hierarchy(self.num_nodes, (self.graph, self.edges))
+        return self.hierarchy
+
+    def query(self, start, goal, tracer=None):
+        """Return (distance, path); (inf, []) when goal is unreachable."""
+        self.check_node(start)
+        self.check_node(goal, "Goal")
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        hierarchy = self.hierarchy_table()
+        inf = float('inf')
+        dist = ({start: 0}, {goal: 0})
+        prev = ({start: -1}, {goal: -1})
+        heaps = ([(0, start)], [(0, goal)])
+        best = 0 if start == goal else inf
+        meet = start if start == goal else -1
+        visited_count = 0
+        if tracer.enabled:
+            tracer.emit('ch_start', start, goal, hierarchy.num_edges())
+        while heaps[0] or heaps[1]:
+            top = [heap[0][0] if heap else inf for heap in heaps]
+            # Upward searches: each side alone must reach the meeting vertex
+            if min(top) >= best:
+                break
+            side = 0 if top[0] <= top[1] else 1
+            d, u = heapq.heappop(heaps[side])
+            mine = dist[side]
+            if d > mine[u]:
+                continue
+            visited_count += 1
+            if full:
+                tracer.emit('bidi_settle', u, 'xuôi' if side == 0 else 'ngược', d)
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best = d + other
+                meet = u
+                if full:
+                    tracer.emit('ch_meet', u, best)
+            parent = prev[side]
+            for v, w in hierarchy.up(u):
+                nd = d + w
+                if nd < mine.get(v, inf):
+                    mine[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+        self.stats = {'visited_count': visited_count}
+        if tracer.enabled:
+            tracer.emit('ch_done', visited_count)
+        if meet == -1:
+            return inf, []
+        path = []
+        node = meet
+        while node != -1:
+            path.append(node)
+            node = prev[0][node]
+        path.reverse()
+        node = prev[1][meet]
+        while node != -1:
+            path.append(node)
+            node = prev[1][node]
+        return best, hierarchy.unpack(path)
@@ -0,0 +1,218 @@
+"""Connected components and multi-source BFS.
+
+``UnionFind`` (path compression, union by rank) answers "are u and v
+connected" in near-constant time and takes edges one at a time, so
+``Components.add_edge`` keeps it current while a graph is being typed in.
+
+For stored graphs the components are computed once into a label array
+(``labels[u] == labels[v]`` iff u and v are connected), kept in a small
+in-process LRU keyed by the graph's content hash and, with a path, saved
+next to the graph (``<graph>.components``) and memory-mapped on later runs.
+run_query uses it to answer point-to-point queries between different
+components without searching.
+"""
+from array import array
+from collections import OrderedDict
+import mmap
+import os
+import struct
+import threading
+
+from .csr import _index_typecode, csr_digest, map_arrays
+from .graph import Graph
+from .tracing import NullTracer
+
+COMPONENTS_CACHE_SIZE = 16
+
+_MAGIC = b'CC1\0\0\0'
+_HEADER = struct.Struct('<qqc40s')  # num_nodes, components, label typecode, graph digest
+
+_recent = OrderedDict()  # digest -> (labels, count)
+_recent_lock = threading.Lock()
+
+
+class UnionFind:
+    """Disjoint sets over vertices 0..n-1."""
+    __slots__ = ('parent', 'rank', 'count')
+
+    def __init__(self, num_nodes):
+        self.parent = array(_index_typecode(num_nodes), range(num_nodes))
+        self.rank = bytearray(num_nodes)  # ranks never exceed log2(n)
+        self.count = num_nodes
+
+    @classmethod
+    def from_edges(cls, num_nodes, edges):
+        """Union-find of an EdgeArray (or any iterable of (u, v, weight) triples)."""
+        uf = cls(num_nodes)
+        union = uf.union
+        if hasattr(edges, 'us'):
+            for u, v in zip(edges.us, edges.vs):
+                union(u, v)
+        else:
+            for u, v, _ in edges:
+                union(u, v)
+        return uf
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression: point every vertex on the way straight at the root
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, u, v):
+        """Merge the sets of u and v; returns False if they were already one set."""
+        ru = self.find(u)
+        rv = self.find(v)
+        if ru == rv:
+            return False
+        rank = self.rank
+        if rank[ru] < rank[rv]:
+            ru, rv = rv, ru
+        self.parent[rv] = ru
+        if rank[ru] == rank[rv]:
+            rank[ru] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, u, v):
+        return self.find(u) == self.find(v)
+
+    def labels(self):
+        """Component number (0..count-1, in order of first vertex) of every vertex."""
+        n = len(self.parent)
+        labels = array(_index_typecode(n), [0]) * n
+        numbers = {}
+        for u in range(n):
+            labels[u] = numbers.setdefault(self.find(u), len(numbers))
+        return labels
+
+
+def multi_source_bfs(adjacency, num_nodes, seeds, tracer=None):
+    """Hop distances from the nearest of ``seeds`` in one BFS: (hops, source).
+
+    ``hops[v]`` is -1 and ``source[v]`` is -1 for vertices no seed reaches;
+    ``source[v]`` is the seed v is closest to (ties go to the earlier seed).
+    """
+    if tracer is None:
+        tracer = NullTracer()
+    full = tracer.full
+    hops = [-1] * num_nodes
+    source = [-1] * num_nodes
+    frontier = []
+    for s in seeds:
+        if not 0 <= s < num_nodes:
+            raise ValueError(f"Seed nodes must be between 0 and {num_nodes - 1}")
+        if hops[s] == -1:
+            hops[s] = 0
+            source[s] = s
+            frontier.append(s)
+    if tracer.enabled:
+        tracer.emit('msbfs_start', len(frontier))
+    reached = len(frontier)
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for u in frontier:
+            origin = source[u]
+            for v, _ in adjacency[u]:
+                if hops[v] == -1:
+                    hops[v] = level
+                    source[v] = origin
+                    next_frontier.append(v)
+        if full and next_frontier:
+            tracer.emit('msbfs_level', level, len(next_frontier))
+        reached += len(next_frontier)
+        frontier = next_frontier
+    if tracer.enabled:
+        tracer.emit('msbfs_done', reached)
+    return hops, source
+
+
+class Components(Graph):
+    """Graph that knows its connected components at all times, even while edges are added."""
+    allow_negative_weights = True  # weights are ignored
+
+    def __init__(self, num_nodes, csr=None):
+        super().__init__(num_nodes, csr=csr)
+        self.union_find = UnionFind.from_edges(num_nodes, self.edges)
+
+    def add_edge(self, u, v, weight=1):
+        super().add_edge(u, v, weight)
+        self.union_find.union(u, v)
+
+    def connected(self, u, v):
+        self.check_node(u)
+        self.check_node(v, "Goal")
+        return self.union_find.connected(u, v)
+
+    def num_components(self):
+        return self.union_find.count
+
+    def labels(self):
+        return self.union_find.labels()
+
+    def multi_source_bfs(self, seeds, tracer=None):
+        """Hop distances from the nearest seed: (hops, source), see multi_source_bfs."""
+        hops, source = multi_source_bfs(self.graph, self.num_nodes, seeds, tracer)
+        self.stats = {'visited_count': sum(1 for h in hops if h != -1)}
+        return hops, source
+
+
+def save_labels(path, num_nodes, csr, labels, count, digest=None):
+    digest = digest or csr_digest(num_nodes, csr)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_HEADER.pack(num_nodes, count, labels.typecode.encode(), digest.encode()))
+        f.write(labels)
+    os.replace(tmp, path)
+
+
+def load_labels(path, num_nodes, csr, digest=None):
+    """Map saved component labels into memory: (labels, count), or None if missing or stale."""
+    try:
+        with open(path, 'rb') as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError):
+        return None
+    pos = len(_MAGIC) + _HEADER.size
+    if len(view) < pos or view[:len(_MAGIC)] != _MAGIC:
+        return None
+    stored_nodes, count, typecode, stored_digest = _HEADER.unpack(view[len(_MAGIC):pos])
+    if stored_nodes != num_nodes or stored_digest.decode() != (digest or csr_digest(num_nodes, csr)):
+        return None
+    try:
+        labels, = map_arrays(view, pos, ((typecode.decode(), num_nodes),))
+    except ValueError:
+        return None
+    return labels, count
+
+
+def components_for(path, num_nodes, csr, digest=None):
+    """Component labels of a graph and their count, computed once.
+
+    Looked up in the in-process cache, then at ``path`` (if given); newly
+    computed labels go to both.
+    """
+    digest = digest or csr_digest(num_nodes, csr)
+    with _recent_lock:
+        entry = _recent.get(digest)
+        if entry is not None:
+            _recent.move_to_end(digest)
+            return entry
+    entry = load_labels(path, num_nodes, csr, digest) if path else None
+    if entry is None:
+        uf = UnionFind.from_edges(num_nodes, csr[1])
+        entry = uf.labels(), uf.count
+        if path:
+            save_labels(path, num_nodes, csr, entry[0], entry[1], digest)
+    with _recent_lock:
+        _recent[digest] = entry
+        while len(_recent) > COMPONENTS_CACHE_SIZE:
+            _recent.popitem(last=False)
+    return entry
@@ -0,0 +1,205 @@
+from array import array
+import hashlib
+import mmap
+import os
+import struct
+
+
+class CSRAdjacency:
+    """Read-only adjacency view over CSR arrays; graph[u] yields (v, weight) pairs."""
+    __slots__ = ('offsets', 'targets', 'weights')
+
+    def __init__(self, offsets, targets, weights):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, u):
+        lo = self.offsets[u]
+        hi = self.offsets[u + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.targets, self.weights))
+
+
+class EdgeArray:
+    """Read-only edge list over parallel u/v/weight arrays; iterates as (u, v, weight)."""
+    __slots__ = ('us', 'vs', 'ws', '_min_weight')
+
+    def __init__(self, us, vs, ws):
+        self.us = us
+        self.vs = vs
+        self.ws = ws
+        self._min_weight = None
+
+    def __len__(self):
+        return len(self.us)
+
+    def __iter__(self):
+        return zip(self.us, self.vs, self.ws)
+
+    def __getitem__(self, i):
+        return (self.us[i], self.vs[i], self.ws[i])
+
+    def min_weight(self):
+        if self._min_weight is None:
+            self._min_weight = min(self.ws) if len(self.ws) else 0
+        return self._min_weight
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.us, self.vs, self.ws))
+
+
+def typecode_of(arr):
+    """Typecode of an array.array or of a typed memoryview (e.g. over an mmap)."""
+    return getattr(arr, 'typecode', None) or arr.format
+
+
+def _index_typecode(limit):
+    return 'i' if limit < 2 ** 31 else 'q'
+
+
+def _weight_array(weights):
+    """Store integer weights as int64 and fall back to float64 otherwise."""
+    try:
+        return array('q', weights)
+    except (TypeError, OverflowError):
+        return array('d', weights)
+
+
+def build_csr(num_nodes, edges):
+    """Build (CSRAdjacency, EdgeArray) for an undirected graph in one bulk pass.
+
+    Neighbours of each vertex keep edge insertion order, so traversals visit
+    vertices in exactly the same order as the list-of-tuples layout.
+    """
+    idx = _index_typecode(num_nodes)
+    us = array(idx)
+    vs = array(idx)
+    ws = []
+    for u, v, w in edges:
+        us.append(u)
+        vs.append(v)
+        ws.append(w)
+    ws = _weight_array(ws)
+    if us and (min(min(us), min(vs)) < 0 or max(max(us), max(vs)) >= num_nodes):
+        raise ValueError(f"Nodes must be between 0 and {num_nodes - 1}")
+
+    offsets = array('q', bytes(8 * (num_nodes + 1)))
+    for u in us:
+        offsets[u + 1] += 1
+    for v in vs:
+        offsets[v + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+
+    total = offsets[num_nodes]
+    targets = array(idx, bytes(array(idx).itemsize * total))
+    weights = array(ws.typecode, bytes(ws.itemsize * total))
+    cursor = array('q', offsets)
+    for u, v, w in zip(us, vs, ws):
+        pos = cursor[u]
+        targets[pos] = v
+        weights[pos] = w
+        cursor[u] = pos + 1
+        pos = cursor[v]
+        targets[pos] = u
+        weights[pos] = w
+        cursor[v] = pos + 1
+    return CSRAdjacency(offsets, targets, weights), EdgeArray(us, vs, ws)
+
+
+# On-disk layout: magic, header (num_nodes, num_edges, index/weight typecodes),
+# then the raw us, vs, ws, offsets, targets and weights arrays (native byte order).
+# load_csr(mmap=True) maps these arrays in place instead of reading them.
+_MAGIC = b'CSRG1\0'
+_HEADER = struct.Struct('<qqcc')
+
+
+def _header(num_nodes, edges):
+    return _HEADER.pack(num_nodes, len(edges), typecode_of(edges.us).encode(), typecode_of(edges.ws).encode())
+
+
+def _layout(num_nodes, num_edges, idx, wt):
+    return ((idx, num_edges), (idx, num_edges), (wt, num_edges),
+            ('q', num_nodes + 1), (idx, 2 * num_edges), (wt, 2 * num_edges))
+
+
+def _from_arrays(num_nodes, arrays):
+    us, vs, ws, offsets, targets, weights = arrays
+    return num_nodes, (CSRAdjacency(offsets, targets, weights), EdgeArray(us, vs, ws))
+
+
+def save_csr(path, num_nodes, csr):
+    """Write a CSR graph to ``path`` atomically (write to a temp file, then rename)."""
+    adjacency, edges = csr
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_header(num_nodes, edges))
+        for arr in (edges.us, edges.vs, edges.ws, adjacency.offsets, adjacency.targets, adjacency.weights):
+            f.write(arr)
+    os.replace(tmp, path)
+
+
+def load_csr(path, mmap=False):
+    """Read a graph written by save_csr; returns (num_nodes, (CSRAdjacency, EdgeArray)).
+
+    With ``mmap=True`` the file is memory-mapped and the arrays are typed
+    memoryviews into the mapping: nothing is parsed or copied, pages are read
+    lazily and processes mapping the same file share them in the page cache.
+    """
+    if mmap:
+        return _map_csr(path)
+    with open(path, 'rb') as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a CSR graph file")
+        num_nodes, num_edges, idx, wt = _HEADER.unpack(f.read(_HEADER.size))
+        arrays = []
+        for typecode, count in _layout(num_nodes, num_edges, idx.decode(), wt.decode()):
+            arr = array(typecode)
+            arr.fromfile(f, count)
+            arrays.append(arr)
+    return _from_arrays(num_nodes, arrays)
+
+
+def _map_csr(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < len(_MAGIC) + _HEADER.size:
+            raise ValueError(f"{path} is not a CSR graph file")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if view[:len(_MAGIC)] != _MAGIC:
+        raise ValueError(f"{path} is not a CSR graph file")
+    pos = len(_MAGIC) + _HEADER.size
+    num_nodes, num_edges, idx, wt = _HEADER.unpack(view[len(_MAGIC):pos])
+    return _from_arrays(num_nodes, map_arrays(view, pos, _layout(num_nodes, num_edges, idx.decode(), wt.decode())))
+
+
+def map_arrays(view, pos, layout):
+    """Typed memoryviews over consecutive (typecode, count) arrays starting at byte ``pos`` of view."""
+    arrays = []
+    for typecode, count in layout:
+        size = array(typecode).itemsize * count
+        if pos + size > len(view):
+            raise ValueError("Graph file is truncated")
+        arrays.append(view[pos:pos + size].cast(typecode))
+        pos += size
+    return arrays
+
+
+def csr_digest(num_nodes, csr):
+    """Content hash of a graph: identical uploads get the same id in every worker."""
+    edges = csr[1]
+    h = hashlib.sha1()
+    h.update(_header(num_nodes, edges))
+    for arr in (edges.us, edges.vs, edges.ws):
+        h.update(arr.tobytes())
+    return h.hexdigest()
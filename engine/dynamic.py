@@ -0,0 +1,215 @@
+"""Single-source shortest paths kept up to date while edges change.
+
+``DynamicDijkstra.track(start)`` runs Dijkstra once and keeps its
+``dist``/``prev`` tree. Each edge insertion, deletion or reweight then
+repairs only the part of the tree it affects:
+
+* a lighter edge (insertion or decrease) can only shorten paths through
+  it, so Dijkstra restarts from its endpoints and stops where distances
+  stop improving;
+* a heavier edge (deletion or increase) only matters if it is a tree edge.
+  The subtree below it loses its distances, each of its vertices takes the
+  best offer from a neighbour outside the subtree, and Dijkstra runs
+  inside the subtree from there.
+
+Parallel edges are kept separately; only the lightest one between two
+vertices counts.
+"""
+import heapq
+
+from .search import Dijkstra
+from .tracing import NullTracer
+
+
+class DynamicAdjacency:
+    """Mutable adjacency; graph[u] yields (v, weight) pairs like CSRAdjacency."""
+    __slots__ = ('neighbors',)
+
+    def __init__(self, num_nodes, edges=()):
+        self.neighbors = [{} for _ in range(num_nodes)]  # u -> {v: [weights of parallel edges]}
+        for u, v, w in edges:
+            self.add(u, v, w)
+
+    def __len__(self):
+        return len(self.neighbors)
+
+    def __getitem__(self, u):
+        return ((v, min(ws)) for v, ws in self.neighbors[u].items())
+
+    def weight(self, u, v):
+        """Weight of the lightest u-v edge, inf if there is none."""
+        ws = self.neighbors[u].get(v)
+        return min(ws) if ws else float('inf')
+
+    def add(self, u, v, weight):
+        self.neighbors[u].setdefault(v, []).append(weight)
+        if u != v:
+            self.neighbors[v].setdefault(u, []).append(weight)
+
+    def remove(self, u, v, weight=None):
+        """Remove one u-v edge (the lightest unless ``weight`` is given); returns its weight."""
+        ws = self.neighbors[u].get(v)
+        if not ws or (weight is not None and weight not in ws):
+            raise ValueError(f"No edge ({u}, {v}){'' if weight is None else f' with weight {weight}'}")
+        if weight is None:
+            weight = min(ws)
+        for a, b in ((u, v), (v, u)) if u != v else ((u, v),):
+            ws = self.neighbors[a][b]
+            ws.remove(weight)
+            if not ws:
+                del self.neighbors[a][b]
+        return weight
+
+    def edges(self):
+        """Current edges as (u, v, weight) triples, each once."""
+        for u, row in enumerate(self.neighbors):
+            for v, ws in row.items():
+                if u <= v:
+                    for w in ws:
+                        yield u, v, w
+
+
+class DynamicDijkstra(Dijkstra):
+    """Dijkstra whose shortest-path tree from one start survives edge updates.
+
+    Edges can be added, removed and reweighted at any time; once ``track``
+    has been called, every change also repairs ``dist`` and ``prev``.
+    """
+
+    def __init__(self, num_nodes, csr=None):
+        super().__init__(num_nodes, csr=csr)
+        self.graph = DynamicAdjacency(num_nodes, self.edges)
+        # The adjacency is the only copy of the edges and is never frozen into CSR
+        self.edges = None
+        self.frozen = True
+        self.start = None
+        self.dist = None
+        self.prev = None
+        self._children = None
+
+    def edge_list(self):
+        return list(self.graph.edges())
+
+    def track(self, start, tracer=None):
+        """Run Dijkstra from start and keep its tree up to date from now on; returns (dist, prev)."""
+        self.dist, self.prev = self.dijkstra(start, tracer)
+        self.start = start
+        self._children = [set() for _ in range(self.num_nodes)]
+        for v, p in enumerate(self.prev):
+            if p != -1:
+                self._children[p].add(v)
+        return self.dist, self.prev
+
+    def path(self, target):
+        """Current shortest path from the tracked start to target; [] if unreachable."""
+        return self.reconstruct_path(self.prev, target, self.start)
+
+    def add_edge(self, u, v, weight=1):
+        self.insert_edge(u, v, weight)
+
+    def insert_edge(self, u, v, weight=1, tracer=None):
+        self._check_edge(u, v, weight)
+        old = self.graph.weight(u, v)
+        self.graph.add(u, v, weight)
+        return self._repair(u, v, old, tracer)
+
+    def delete_edge(self, u, v, weight=None, tracer=None):
+        """Remove one u-v edge (the lightest unless ``weight`` is given)."""
+        self._check_edge(u, v, 0)
+        old = self.graph.weight(u, v)
+        self.graph.remove(u, v, weight)
+        return self._repair(u, v, old, tracer)
+
+    def update_weight(self, u, v, weight, old_weight=None, tracer=None):
+        """Change the weight of one u-v edge (the lightest unless ``old_weight`` is given)."""
+        self._check_edge(u, v, weight)
+        old = self.graph.weight(u, v)
+        self.graph.remove(u, v, old_weight)
+        self.graph.add(u, v, weight)
+        return self._repair(u, v, old, tracer)
+
+    def _check_edge(self, u, v, weight):
+        if not (0 <= u < self.num_nodes and 0 <= v < self.num_nodes):
+            raise ValueError(f"Nodes must be between 0 and {self.num_nodes - 1}")
+        if weight < 0:
+            raise ValueError("Edge weight cannot be negative")
+
+    def _set_parent(self, v, parent):
+        old = self.prev[v]
+        if old != -1:
+            self._children[old].discard(v)
+        self.prev[v] = parent
+        if parent != -1:
+            self._children[parent].add(v)
+
+    def _repair(self, u, v, old, tracer):
+        """Fix the tree after the lightest u-v edge went from ``old`` to its current weight.
+
+        Returns the number of vertices whose distance changed.
+        """
+        if tracer is None:
+            tracer = NullTracer()
+        self.stats = {'affected': 0, 'visited_count': 0}
+        new = self.graph.weight(u, v)
+        if self.dist is None or u == v or new == old:
+            return 0
+        dist = self.dist
+        before = {}
+        heap = []
+        if new < old:
+            for a, b in ((u, v), (v, u)):
+                nd = dist[a] + new
+                if nd < dist[b]:
+                    before.setdefault(b, dist[b])
+                    dist[b] = nd
+                    self._set_parent(b, a)
+                    heap.append((nd, b))
+        else:
+            if self.prev[v] == u:
+                root = v
+            elif self.prev[u] == v:
+                root = u
+            else:
+                return 0  # Not a tree edge: no shortest path used it
+            # Every vertex whose tree path runs through the edge has to find a new one
+            affected = [root]
+            for x in affected:
+                affected.extend(self._children[x])
+            inf = float('inf')
+            for x in affected:
+                before[x] = dist[x]
+                dist[x] = inf
+                self._set_parent(x, -1)
+            for x in affected:
+                for y, w in self.graph[x]:
+                    if dist[y] + w < dist[x]:
+                        dist[x] = dist[y] + w
+                        self._set_parent(x, y)
+                if dist[x] < inf:
+                    heap.append((dist[x], x))
+        heapq.heapify(heap)
+        visited_count = self._propagate(heap, before)
+        changed = sum(1 for x, d in before.items() if dist[x] != d)
+        self.stats = {'affected': changed, 'visited_count': visited_count}
+        if tracer.enabled:
+            tracer.emit('dyn_repair', u, v, changed, visited_count)
+        return changed
+
+    def _propagate(self, heap, before):
+        """Dijkstra from the repaired vertices until distances stop improving."""
+        dist = self.dist
+        graph = self.graph
+        visited_count = 0
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            visited_count += 1
+            for y, w in graph[x]:
+                nd = d + w
+                if nd < dist[y]:
+                    before.setdefault(y, dist[y])
+                    dist[y] = nd
+                    self._set_parent(y, x)
+                    heapq.heappush(heap, (nd, y))
+        return visited_count
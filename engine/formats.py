@@ -0,0 +1,112 @@
+"""Encodings of query results: JSON, MessagePack or a compact binary layout.
+
+JSON has no infinity, so unreachable distances become null there (and nil
+in MessagePack). The binary layout keeps ``dist`` and ``path`` as packed
+little-endian arrays that a browser can view as typed arrays without
+parsing:
+
+* a 32-byte header: magic ``K34R``, version, the dist typecode (``q``
+  int64, ``d`` float64, ``-`` no dist), the dist and path lengths and the
+  length of the trailer;
+* ``dist``: int64 with INT_UNREACHABLE, or float64 with +inf, for
+  unreachable vertices;
+* ``path`` as int64;
+* a UTF-8 JSON trailer with the other fields of the result.
+
+Arrays are byte-swapped on big-endian hosts, so the layout is the same
+whatever machine wrote it.
+
+MessagePack is optional: ``HAVE_MSGPACK`` is False when the msgpack
+package is not installed and the format is then not offered.
+"""
+from array import array
+import json
+import struct
+import sys
+
+try:
+    import msgpack
+    HAVE_MSGPACK = True
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+    HAVE_MSGPACK = False
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+BINARY = 'application/vnd.k34.result'
+
+INT_UNREACHABLE = 2 ** 63 - 1
+
+_MAGIC = b'K34R'
+_VERSION = 1
+_HEADER = struct.Struct('<4sBc2xqqI4x')  # magic, version, dist typecode, dist length, path length, trailer length
+
+
+def _swap_little(packed):
+    """``packed`` in little-endian byte order (the array is changed in place)."""
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed
+
+
+def json_result(result):
+    """The result dict with unreachable (inf) distances as None, as JSON requires."""
+    if result.get('dist'):
+        result = dict(result, dist=[None if d == float('inf') else d for d in result['dist']])
+    return result
+
+
+def formats():
+    """Result content types this server can produce, preferred first."""
+    return [JSON, MSGPACK, BINARY] if HAVE_MSGPACK else [JSON, BINARY]
+
+
+def encode_msgpack(result):
+    return msgpack.packb(json_result(result))
+
+
+def encode_binary(result):
+    rest = {k: v for k, v in result.items() if k not in ('dist', 'path')}
+    dist = result.get('dist')
+    inf = float('inf')
+    if dist is None:
+        typecode = '-'
+        packed = array('q')
+        if 'dist' in result:
+            rest['dist'] = None  # Bellman-Ford found a negative cycle
+    elif all(d == inf or (isinstance(d, int) and d < INT_UNREACHABLE) for d in dist):
+        typecode = 'q'
+        packed = array('q', [INT_UNREACHABLE if d == inf else d for d in dist])
+    else:
+        typecode = 'd'
+        packed = array('d', dist)
+    path = array('q', result.get('path') or [])
+    trailer = json.dumps(rest, ensure_ascii=False).encode()
+    header = _HEADER.pack(_MAGIC, _VERSION, typecode.encode(), len(packed), len(path), len(trailer))
+    return b''.join((header, _swap_little(packed).tobytes(), _swap_little(path).tobytes(), trailer))
+
+
+def decode_binary(data):
+    """Inverse of encode_binary; unreachable distances come back as inf."""
+    magic, version, typecode, num_dist, num_path, trailer_len = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a binary query result")
+    pos = _HEADER.size
+    result = {}
+    typecode = typecode.decode()
+    if typecode != '-':
+        dist = array(typecode)
+        dist.frombytes(data[pos:pos + 8 * num_dist])
+        _swap_little(dist)
+        pos += 8 * num_dist
+        if typecode == 'q':
+            result['dist'] = [float('inf') if d == INT_UNREACHABLE else d for d in dist]
+        else:
+            result['dist'] = dist.tolist()
+    path = array('q')
+    path.frombytes(data[pos:pos + 8 * num_path])
+    _swap_little(path)
+    pos += 8 * num_path
+    result['path'] = path.tolist()
+    result.update(json.loads(data[pos:pos + trailer_len].decode()))
+    return result
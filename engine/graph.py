@@ -0,0 +1,67 @@
+import numbers
+
+from .csr import build_csr
+
+
+class Graph:
+    """Base class for undirected weighted graph representation."""
+    allow_negative_weights = False
+
+    def __init__(self, num_nodes, csr=None):
+        if num_nodes <= 0:
+            raise ValueError("Number of nodes must be positive")
+        self.num_nodes = num_nodes
+        self.stats = {}
+        if csr is None:
+            self.graph = [[] for _ in range(num_nodes)]
+            self.edges = []
+            self.frozen = False
+        else:
+            adjacency, edges = csr
+            if len(adjacency) != num_nodes:
+                raise ValueError(f"CSR adjacency has {len(adjacency)} nodes, expected {num_nodes}")
+            if not self.allow_negative_weights and edges.min_weight() < 0:
+                raise ValueError("Edge weight cannot be negative")
+            self.graph = adjacency
+            self.edges = edges
+            self.frozen = True
+
+    @classmethod
+    def from_edges(cls, num_nodes, edges, *args, **kwargs):
+        """Build a frozen, CSR-backed graph from (u, v, weight) triples in one pass."""
+        return cls(num_nodes, *args, csr=build_csr(num_nodes, edges), **kwargs)
+
+    def freeze(self):
+        """Convert the adjacency lists to the compact CSR layout; the graph becomes read-only."""
+        if not self.frozen:
+            self.graph, self.edges = build_csr(self.num_nodes, self.edges)
+            self.frozen = True
+        return self
+
+    def add_edge(self, u, v, weight=1):
+        """Add an undirected edge to the graph."""
+        if self.frozen:
+            raise ValueError("Cannot add edges to a frozen graph")
+        if not (0 <= u < self.num_nodes and 0 <= v < self.num_nodes):
+            raise ValueError(f"Nodes must be between 0 and {self.num_nodes - 1}")
+        if weight < 0 and not self.allow_negative_weights:
+            raise ValueError("Edge weight cannot be negative")
+        self.graph[u].append((v, weight))
+        self.graph[v].append((u, weight))  # Undirected graph
+        self.edges.append((u, v, weight))
+
+    def check_node(self, node, name="Start"):
+        # None, booleans and non-integers (e.g. from request JSON) are invalid too, not only out-of-range numbers
+        if not isinstance(node, numbers.Integral) or isinstance(node, bool) or not 0 <= node < self.num_nodes:
+            raise ValueError(f"{name} node must be between 0 and {self.num_nodes - 1}")
+
+    def reconstruct_path(self, prev, target, start):
+        """Reconstruct the path from start to target; [] if target is unreachable."""
+        self.check_node(target, "Target")
+        path = []
+        node = target
+        while node != -1:
+            path.append(node)
+            node = prev[node]
+        path = path[::-1]
+        return path if path[0] == start else []
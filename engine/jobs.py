@@ -0,0 +1,332 @@
+"""Background jobs: run long queries in their own processes, with limits.
+
+A web request submits a query and gets a job id back at once. The job
+runs in a separate process, so it never ties up a web worker, can be
+killed when it runs past its time limit or is cancelled, and gets an
+address-space limit (RLIMIT_AS) so a runaway search fails with
+MemoryError instead of taking the machine down.
+
+Everything a client asks about lives in a directory shared by all web
+workers (like the graph registry): ``<id>.json`` is the job record,
+``<id>.steps`` the step text as JSON lines (appended while the job runs)
+and ``<id>.result.json`` the result. Any worker can therefore answer a
+poll, a stream or a cancel request; the worker that owns the job notices
+the ``<id>.cancel`` marker and kills the process.
+
+At most ``workers`` jobs run at once on the machine: each running job
+holds an exclusive lock on one of the ``slot-<i>.lock`` files, and jobs
+without a free slot wait in their owner's queue.
+"""
+from collections import deque
+import errno
+import fcntl
+import json
+import multiprocessing
+import os
+import resource
+import threading
+import time
+import uuid
+
+from .cache import ResultCache
+from .formats import json_result
+from .query import run_query
+from .registry import GraphRegistry
+from .tracing import TRACE_SUMMARY, Tracer, format_event
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+TIMEOUT = 'timeout'
+FINISHED = (DONE, FAILED, CANCELLED, TIMEOUT)
+
+POLL_INTERVAL = 0.05
+
+
+class FileTracer(Tracer):
+    """Appends each step's text to a file as a JSON line, flushed in batches for readers following it."""
+
+    def __init__(self, f, mode=TRACE_SUMMARY, batch_size=200):
+        super().__init__(mode)
+        self.f = f
+        self.batch_size = batch_size
+        self.pending = 0
+
+    def emit(self, *event):
+        self.f.write(json.dumps(format_event(event), ensure_ascii=False) + '\n')
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.f.flush()
+        self.pending = 0
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """Job records, steps and results as files in a directory shared by every web worker."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, job_id, suffix='.json'):
+        if not job_id.isalnum():
+            raise KeyError(job_id)
+        return os.path.join(self.directory, job_id + suffix)
+
+    def _write(self, path, data):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def create(self, spec):
+        job_id = uuid.uuid4().hex
+        open(self.path(job_id, '.steps'), 'w').close()
+        self._write(self.path(job_id), {'job_id': job_id, 'status': QUEUED, 'algorithm': spec['algorithm'],
+                                        'created': time.time(), 'owner': os.getpid()})
+        return job_id
+
+    def get(self, job_id):
+        """The job record, or None for an unknown id."""
+        try:
+            with open(self.path(job_id), encoding='utf-8') as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        if record['status'] not in FINISHED and not _alive(record['owner']):
+            record = self.update(job_id, status=FAILED, error="Job was lost when its web worker exited")
+        return record
+
+    def update(self, job_id, **fields):
+        with open(self.path(job_id), encoding='utf-8') as f:
+            record = json.load(f)
+        record.update(fields)
+        self._write(self.path(job_id), record)
+        return record
+
+    def finish(self, job_id, status, result=None, error=None):
+        if result is not None:
+            self._write(self.path(job_id, '.result.json'), json_result(result))
+        return self.update(job_id, status=status, finished=time.time(), error=error)
+
+    def result(self, job_id):
+        try:
+            with open(self.path(job_id, '.result.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def read_steps(self, job_id, offset=0):
+        """Step lines written since byte ``offset``: (lines, new offset). Only complete lines are read."""
+        with open(self.path(job_id, '.steps'), 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        lines = [json.loads(line) for line in data[:end].splitlines()]
+        return lines, offset + end
+
+    def request_cancel(self, job_id):
+        open(self.path(job_id, '.cancel'), 'w').close()
+
+    def cancel_requested(self, job_id):
+        return os.path.exists(self.path(job_id, '.cancel'))
+
+    def cleanup(self, max_age):
+        """Delete finished jobs older than max_age seconds."""
+        now = time.time()
+        for name in os.listdir(self.directory):
+            job_id, ext = os.path.splitext(name)
+            if ext != '.json' or not job_id.isalnum():
+                continue
+            record = self.get(job_id)
+            if record and record['status'] in FINISHED and now - record.get('finished', now) > max_age:
+                for suffix in ('.json', '.steps', '.result.json', '.cancel'):
+                    try:
+                        os.remove(self.path(job_id, suffix))
+                    except FileNotFoundError:
+                        pass
+
+
+def follow(store, job_id, poll_interval=0.1):
+    """Yield ``{'steps': [...]}`` batches while the job runs, then ``{'result': ...}`` or ``{'error': ...}``.
+
+    Same messages as streaming.stream_query.
+    """
+    offset = 0
+    while True:
+        record = store.get(job_id)
+        lines, offset = store.read_steps(job_id, offset)
+        if lines:
+            yield {'steps': lines}
+        if record['status'] in FINISHED:
+            break
+        time.sleep(poll_interval)
+    if record['status'] == DONE:
+        yield {'result': store.result(job_id)}
+    else:
+        yield {'error': record.get('error') or record['status']}
+
+
+def _execute(directory, job_id, spec, graph_dir, cache_path, memory_bytes):
+    """Body of a job process."""
+    if memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    store = JobStore(directory)
+    try:
+        registry = GraphRegistry(graph_dir)
+        graph_id = spec['graph_id']
+        num_nodes, csr = registry.get(graph_id)
+        algo = spec['algorithm']
+        heuristic = spec.get('heuristic') or None
+        landmarks = hierarchy = None
+        if algo == 'astar' and heuristic is None:
+            landmarks = registry.landmarks(graph_id, num_nodes, csr)
+        elif algo == 'ch':
+            hierarchy = registry.hierarchy(graph_id, num_nodes, csr)
+        cache = ResultCache(path=cache_path) if cache_path else None
+        with open(store.path(job_id, '.steps'), 'a', encoding='utf-8') as f:
+            tracer = FileTracer(f, spec.get('trace', TRACE_SUMMARY))
+            result = run_query(algo, num_nodes, csr=csr, start=spec.get('start'), end=spec.get('end'),
+                               heuristic=heuristic, tracer=tracer, search=spec.get('search', 'full'), cache=cache,
+                               graph_id=graph_id, landmarks=landmarks, hierarchy=hierarchy, k=spec.get('k'))
+            tracer.flush()
+        store.finish(job_id, DONE, result=result)
+    except MemoryError:
+        store.finish(job_id, FAILED, error="Job exceeded its memory limit")
+    except OSError as e:
+        # mmap and other system calls report the address-space limit as ENOMEM
+        store.finish(job_id, FAILED, error="Job exceeded its memory limit" if e.errno == errno.ENOMEM else str(e))
+    except Exception as e:
+        store.finish(job_id, FAILED, error=str(e))
+
+
+class JobManager:
+    """Runs submitted jobs of one web worker, at most ``workers`` at a time across all of them.
+
+    ``spec`` is a dict with the registry ``graph_id`` and the run_query
+    arguments ('algorithm', 'start', 'end', 'heuristic', 'search', 'trace', 'k').
+    A background thread starts queued jobs when a slot is free and kills
+    jobs that are cancelled or run longer than ``timeout`` seconds.
+    """
+
+    def __init__(self, store, graph_dir, workers=2, timeout=300, memory_bytes=None, max_queued=100,
+                 cache_path=None, max_age=3600):
+        self.store = store
+        self.graph_dir = graph_dir
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_bytes = memory_bytes
+        self.max_queued = max_queued
+        self.cache_path = cache_path
+        self.max_age = max_age
+        self._queue = deque()  # (job_id, spec)
+        self._running = {}  # job_id -> (process, slot file, monotonic start)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        methods = multiprocessing.get_all_start_methods()
+        # forkserver: cheap starts without forking this multi-threaded web process
+        self._context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        if 'forkserver' in methods:
+            self._context.set_forkserver_preload([__name__])
+
+    def submit(self, spec):
+        """Queue a job; returns its id. Raises OverflowError when the queue is full."""
+        with self._lock:
+            if len(self._queue) >= self.max_queued:
+                raise OverflowError("Too many queued jobs")
+            job_id = self.store.create(spec)
+            self._queue.append((job_id, spec))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True)
+                self._thread.start()
+        self._wake.set()
+        self.store.cleanup(self.max_age)
+        return job_id
+
+    def cancel(self, job_id):
+        """Ask for a job to stop, whichever worker owns it; returns its record (None if unknown)."""
+        record = self.store.get(job_id)
+        if record is not None and record['status'] not in FINISHED:
+            self.store.request_cancel(job_id)
+            self._wake.set()
+        return record
+
+    def _acquire_slot(self):
+        for i in range(self.workers):
+            f = open(os.path.join(self.store.directory, f'slot-{i}.lock'), 'w')
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return f
+            except BlockingIOError:
+                f.close()
+        return None
+
+    def _loop(self):
+        while True:
+            self._wake.wait(POLL_INTERVAL if self._running or self._queue else None)
+            self._wake.clear()
+            try:
+                self._check_running()
+                self._start_queued()
+            except Exception:  # pragma: no cover - keep the monitor alive whatever happens
+                pass
+
+    def _check_running(self):
+        store = self.store
+        for job_id, (process, slot, started) in list(self._running.items()):
+            if process.is_alive():
+                if store.cancel_requested(job_id):
+                    status, error = CANCELLED, None
+                elif time.monotonic() - started > self.timeout:
+                    status, error = TIMEOUT, f"Job exceeded the time limit of {self.timeout} s"
+                else:
+                    continue
+                process.kill()
+                process.join()
+                # The job may have finished just before it was killed
+                if store.get(job_id)['status'] not in FINISHED:
+                    store.finish(job_id, status, error=error)
+            else:
+                process.join()
+                if store.get(job_id)['status'] not in FINISHED:
+                    store.finish(job_id, FAILED, error=f"Job process exited with code {process.exitcode}")
+            slot.close()
+            del self._running[job_id]
+
+    def _start_queued(self):
+        with self._lock:
+            for job_id, spec in list(self._queue):
+                if self.store.cancel_requested(job_id):
+                    self._queue.remove((job_id, spec))
+                    self.store.finish(job_id, CANCELLED)
+        while True:
+            with self._lock:
+                if not self._queue:
+                    return
+                job_id, spec = self._queue[0]
+                slot = self._acquire_slot()
+                if slot is None:
+                    return
+                self._queue.popleft()
+            # Marked running before the process starts, so its own 'done' can never be overwritten
+            self.store.update(job_id, status=RUNNING, started=time.time())
+            process = self._context.Process(
+                target=_execute, args=(self.store.directory, job_id, spec, self.graph_dir, self.cache_path,
+                                       self.memory_bytes), daemon=True)
+            process.start()
+            self._running[job_id] = (process, slot, time.monotonic())
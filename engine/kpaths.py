@@ -0,0 +1,78 @@
+"""Yen's k shortest loopless paths.
+
+Each new path deviates from an earlier one at some spur vertex: the root
+(the prefix up to the spur) is kept, and a Dijkstra search from the spur
+to the goal may neither revisit the root nor leave the spur along an edge
+that an already found path with the same root takes. Those restrictions
+are passed to ``Dijkstra.masked_path`` as banned vertices and edges, so
+every spur search runs on the one shared adjacency instead of a copy of
+the graph with edges removed.
+
+One Dijkstra from the goal gives every vertex its exact distance to the
+goal in the unmasked graph. Masking only removes paths, so that distance
+stays a consistent lower bound and the spur searches use it to head
+straight for the goal (A*) instead of settling a ball around the spur.
+"""
+import heapq
+
+from .search import Dijkstra
+from .tracing import NullTracer
+
+DEFAULT_K = 3
+
+
+class KShortestPaths(Dijkstra):
+    def edge_weight(self, u, v):
+        """Weight of the lightest u-v edge (parallel edges are allowed)."""
+        return min(w for x, w in self.graph[u] if x == v)
+
+    def k_shortest(self, start, goal, k=DEFAULT_K, tracer=None):
+        """Up to ``k`` loopless start-goal paths, shortest first: [(distance, path), ...]."""
+        if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+            raise ValueError("Number of paths k must be a positive integer")
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        self.check_node(start)
+        potential, _ = self.dijkstra(goal)
+        searches = 2
+        settled = self.stats['visited_count']
+        distance, path = self.masked_path(start, goal, potential=potential)
+        settled += self.stats['visited_count']
+        found = [(distance, path)] if path else []
+        candidates = []  # heap of (distance, path)
+        seen = {tuple(path)}
+        if found and tracer.enabled:
+            tracer.emit('yen_path', 1, path, distance)
+        while found and len(found) < k:
+            _, last = found[-1]
+            root_cost = 0
+            for i in range(len(last) - 1):
+                spur = last[i]
+                root = last[:i + 1]
+                banned_edges = {}
+                for _, p in found:
+                    if len(p) > i + 1 and p[:i + 1] == root:
+                        banned_edges.setdefault(p[i], set()).add(p[i + 1])
+                        banned_edges.setdefault(p[i + 1], set()).add(p[i])
+                if full:
+                    tracer.emit('yen_spur', spur, sum(map(len, banned_edges.values())) // 2, i)
+                spur_distance, spur_path = self.masked_path(spur, goal, root[:-1], banned_edges, potential)
+                searches += 1
+                settled += self.stats['visited_count']
+                if spur_path:
+                    candidate = root[:-1] + spur_path
+                    key = tuple(candidate)
+                    if key not in seen:
+                        seen.add(key)
+                        heapq.heappush(candidates, (root_cost + spur_distance, candidate))
+                root_cost += self.edge_weight(spur, last[i + 1])
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates))
+            if tracer.enabled:
+                tracer.emit('yen_path', len(found), found[-1][1], found[-1][0])
+        self.stats = {'visited_count': settled, 'searches': searches}
+        if tracer.enabled:
+            tracer.emit('yen_done', len(found), searches)
+        return found
@@ -0,0 +1,162 @@
+"""Landmark (ALT) lower bounds for A*.
+
+Preprocessing picks ``k`` landmarks by farthest-point selection and stores
+the shortest distance from every landmark to every vertex. For any
+landmark L the triangle inequality gives |d(L, t) - d(L, v)| <= d(v, t),
+so the maximum over all landmarks is an admissible and consistent A*
+heuristic towards the goal t.
+
+Tables are saved next to the graph (``<graph>.landmarks``) together with
+the graph's content hash and memory-mapped when loaded, so only the first
+query on a graph pays for preprocessing. Tables of graphs that are not
+stored anywhere (no path) live only in a small in-process LRU keyed by
+the content hash.
+"""
+from array import array
+from collections import OrderedDict
+import mmap
+import os
+import struct
+import threading
+
+from .csr import csr_digest, typecode_of
+
+DEFAULT_LANDMARKS = 8
+LANDMARKS_CACHE_SIZE = 8
+
+_MAGIC = b'ALT1\0\0'
+_HEADER = struct.Struct('<qqc40s')  # num_nodes, k, distance typecode, graph digest
+
+_recent = OrderedDict()  # digest -> LandmarkTable
+_recent_lock = threading.Lock()
+
+
+class LandmarkTable:
+    """Distances from each landmark to every vertex (``missing`` when unreachable)."""
+
+    def __init__(self, landmarks, rows, typecode):
+        self.landmarks = landmarks
+        self.rows = rows
+        self.typecode = typecode
+        self.missing = -1 if typecode == 'q' else float('inf')
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def heuristic(self, goal):
+        return LandmarkHeuristic(self, goal)
+
+
+class LandmarkHeuristic:
+    """Lazy heuristic list for one goal: ``h[v]`` is computed when A* first asks for it."""
+
+    def __init__(self, table, goal):
+        self.missing = table.missing
+        self.num_nodes = len(table.rows[0]) if table.rows else 0
+        # Only landmarks that reach the goal bound anything
+        self.pairs = [(row, row[goal]) for row in table.rows if row[goal] != table.missing]
+        self.unreachable = [row for row in table.rows if row[goal] == table.missing]
+
+    def __len__(self):
+        return self.num_nodes
+
+    def __getitem__(self, v):
+        missing = self.missing
+        # A landmark reaching exactly one of v and the goal puts them in different components
+        for row in self.unreachable:
+            if row[v] != missing:
+                return float('inf')
+        best = 0
+        for row, to_goal in self.pairs:
+            to_v = row[v]
+            if to_v == missing:
+                return float('inf')
+            bound = to_goal - to_v if to_goal > to_v else to_v - to_goal
+            if bound > best:
+                best = bound
+        return best
+
+
+def build_landmarks(num_nodes, csr, k=DEFAULT_LANDMARKS):
+    """Farthest-point landmark selection; runs k + 1 single-source searches."""
+    from .search import Dijkstra  # search imports this module
+    graph = Dijkstra(num_nodes, csr=csr)
+    inf = float('inf')
+    typecode = 'd' if typecode_of(csr[1].ws) == 'd' else 'q'
+    missing = -1 if typecode == 'q' else inf
+    landmarks = []
+    rows = []
+    # The first landmark is the vertex farthest from vertex 0, each next one the
+    # vertex farthest from every landmark so far; unreachable vertices count as farthest
+    far, _ = graph.dijkstra(0)
+    for _ in range(min(k, num_nodes)):
+        candidate = max(range(num_nodes), key=far.__getitem__)
+        if landmarks and far[candidate] == 0:
+            break
+        dist, _ = graph.dijkstra(candidate)
+        landmarks.append(candidate)
+        rows.append(array(typecode, (missing if d == inf else d for d in dist)))
+        far = dist if len(landmarks) == 1 else [d if d < f else f for d, f in zip(dist, far)]
+    return LandmarkTable(landmarks, rows, typecode)
+
+
+def save_landmarks(path, num_nodes, csr, table, digest=None):
+    digest = digest or csr_digest(num_nodes, csr)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_HEADER.pack(num_nodes, len(table), table.typecode.encode(), digest.encode()))
+        f.write(array('q', table.landmarks))
+        for row in table.rows:
+            f.write(row)
+    os.replace(tmp, path)
+
+
+def load_landmarks(path, num_nodes, csr, digest=None):
+    """Map a saved table into memory; None if it is missing or belongs to a different graph.
+
+    ``digest`` is the graph's csr_digest when the caller already knows it.
+    """
+    try:
+        with open(path, 'rb') as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError):
+        return None
+    pos = len(_MAGIC) + _HEADER.size
+    if len(view) < pos or view[:len(_MAGIC)] != _MAGIC:
+        return None
+    stored_nodes, k, typecode, stored_digest = _HEADER.unpack(view[len(_MAGIC):pos])
+    typecode = typecode.decode()
+    if stored_nodes != num_nodes or stored_digest.decode() != (digest or csr_digest(num_nodes, csr)):
+        return None
+    row_size = array(typecode).itemsize * num_nodes
+    if len(view) != pos + 8 * k + k * row_size:
+        return None
+    landmarks = view[pos:pos + 8 * k].cast('q').tolist()
+    pos += 8 * k
+    rows = [view[pos + i * row_size:pos + (i + 1) * row_size].cast(typecode) for i in range(k)]
+    return LandmarkTable(landmarks, rows, typecode)
+
+
+def landmarks_for(path, num_nodes, csr, k=DEFAULT_LANDMARKS, digest=None):
+    """Landmark table of a graph, built once.
+
+    Looked up in the in-process cache, then at ``path`` (if given, whatever
+    its k); a newly built table goes to both.
+    """
+    digest = digest or csr_digest(num_nodes, csr)
+    with _recent_lock:
+        table = _recent.get(digest)
+        if table is not None:
+            _recent.move_to_end(digest)
+            return table
+    table = load_landmarks(path, num_nodes, csr, digest) if path else None
+    if table is None:
+        table = build_landmarks(num_nodes, csr, k)
+        if path:
+            save_landmarks(path, num_nodes, csr, table, digest)
+    with _recent_lock:
+        _recent[digest] = table
+        while len(_recent) > LANDMARKS_CACHE_SIZE:
+            _recent.popitem(last=False)
+    return table
@@ -0,0 +1,238 @@
+"""Node positions for drawing graphs, and level-of-detail views of large ones.
+
+A full layout is a force-directed (Fruchterman-Reingold) placement of every
+vertex, computed once per graph: it is kept in a small in-process LRU keyed
+by the graph's content hash and, with a path, saved next to the graph
+(``<graph>.layout``) and memory-mapped on later runs. Each step is a dense
+n x n NumPy operation, so full layouts are only made up to
+``LAYOUT_MAX_NODES`` vertices.
+
+Bigger graphs are drawn as a level-of-detail view: the path, its k-hop
+neighbourhood and, for everything else, one aggregated cluster per visible
+vertex (the hidden vertices a BFS from the visible ones reaches through
+it first). A path longer than the view (e.g. a BFS visit order) is thinned
+to its endpoints and evenly spaced vertices in between. Only that small
+graph is laid out.
+
+Requires NumPy.
+"""
+from collections import OrderedDict, deque
+import mmap
+import os
+import struct
+import threading
+
+from .csr import csr_digest, map_arrays
+from .vectorized import HAVE_NUMPY, as_numpy, np
+
+LAYOUT_MAX_NODES = 2000
+LOD_MAX_NODES = 300
+DEFAULT_HOPS = 1
+LAYOUT_CACHE_SIZE = 8
+
+_MAGIC = b'LAY1\0\0'
+_HEADER = struct.Struct('<q40s')  # num_nodes, graph digest
+
+_recent = OrderedDict()  # digest -> positions
+_recent_lock = threading.Lock()
+
+
+def force_layout(num_nodes, us, vs, seed=42, iterations=50):
+    """Fruchterman-Reingold positions as a (num_nodes, 2) array scaled to [-1, 1]."""
+    if not HAVE_NUMPY:
+        raise ImportError("NumPy is required for graph layouts")
+    pos = np.random.default_rng(seed).random((num_nodes, 2))
+    if num_nodes <= 1:
+        return np.zeros((num_nodes, 2))
+    adjacency = np.zeros((num_nodes, num_nodes))
+    adjacency[us, vs] = 1
+    adjacency[vs, us] = 1
+    np.fill_diagonal(adjacency, 0)
+    k = np.sqrt(1.0 / num_nodes)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        # Pairwise distances from |a - b|^2 = |a|^2 + |b|^2 - 2ab, without an n x n x 2 array
+        square = (pos ** 2).sum(axis=1)
+        distance = square[:, None] + square[None, :] - 2 * pos @ pos.T
+        np.sqrt(np.maximum(distance, 0.0001, out=distance), out=distance)
+        # Every pair repels, edges also attract; displacement_i = sum_j force_ij (pos_i - pos_j)
+        force = k * k / distance ** 2 - adjacency * distance / k
+        displacement = force.sum(axis=1)[:, None] * pos - force @ pos
+        length = np.sqrt((displacement ** 2).sum(axis=-1))
+        length[length < 0.01] = 0.1
+        pos += displacement * (temperature / length)[:, None]
+        temperature -= cooling
+    pos -= pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    return pos / scale if scale > 0 else pos
+
+
+def save_layout(path, num_nodes, csr, positions, digest=None):
+    digest = digest or csr_digest(num_nodes, csr)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_HEADER.pack(num_nodes, digest.encode()))
+        f.write(np.ascontiguousarray(positions, dtype=np.float64).tobytes())
+    os.replace(tmp, path)
+
+
+def load_layout(path, num_nodes, csr, digest=None):
+    """Map a saved layout into memory; None if it is missing or belongs to a different graph."""
+    try:
+        with open(path, 'rb') as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError):
+        return None
+    pos = len(_MAGIC) + _HEADER.size
+    if len(view) < pos or view[:len(_MAGIC)] != _MAGIC:
+        return None
+    stored_nodes, stored_digest = _HEADER.unpack(view[len(_MAGIC):pos])
+    if stored_nodes != num_nodes or stored_digest.decode() != (digest or csr_digest(num_nodes, csr)):
+        return None
+    try:
+        coords, = map_arrays(view, pos, (('d', 2 * num_nodes),))
+    except ValueError:
+        return None
+    return as_numpy(coords).reshape(num_nodes, 2)
+
+
+def layout_for(path, num_nodes, csr, digest=None):
+    """Full layout of a graph with at most LAYOUT_MAX_NODES vertices, computed once.
+
+    Looked up in the in-process cache, then at ``path`` (if given); a newly
+    computed layout goes to both.
+    """
+    if num_nodes > LAYOUT_MAX_NODES:
+        raise ValueError(f"Full layouts are limited to {LAYOUT_MAX_NODES} nodes")
+    digest = digest or csr_digest(num_nodes, csr)
+    with _recent_lock:
+        positions = _recent.get(digest)
+        if positions is not None:
+            _recent.move_to_end(digest)
+            return positions
+    positions = load_layout(path, num_nodes, csr, digest) if path else None
+    if positions is None:
+        edges = csr[1]
+        positions = force_layout(num_nodes, as_numpy(edges.us), as_numpy(edges.vs))
+        if path:
+            save_layout(path, num_nodes, csr, positions, digest)
+    with _recent_lock:
+        _recent[digest] = positions
+        while len(_recent) > LAYOUT_CACHE_SIZE:
+            _recent.popitem(last=False)
+    return positions
+
+
+class GraphView:
+    """A small drawable part of a graph.
+
+    ``nodes`` are the visible vertex ids (path first), ``edges`` the
+    (u, v, weight) edges between them (the lightest of parallel edges),
+    ``clusters`` (anchor, size) pairs for hidden vertices reached through
+    a visible anchor, and ``unreached`` the hidden vertices in components
+    without a visible vertex.
+    """
+    __slots__ = ('nodes', 'edges', 'clusters', 'unreached')
+
+    def __init__(self, nodes, edges, clusters, unreached):
+        self.nodes = nodes
+        self.edges = edges
+        self.clusters = clusters
+        self.unreached = unreached
+
+
+def _thin_path(path, max_nodes):
+    """The path's distinct vertices, cut down to max_nodes: both ends plus evenly spaced ones."""
+    order = list(dict.fromkeys(path))
+    if len(order) <= max_nodes:
+        return order
+    if max_nodes < 2:
+        return order[:1]
+    last = len(order) - 1
+    return list(dict.fromkeys(order[i * last // (max_nodes - 1)] for i in range(max_nodes)))
+
+
+def level_of_detail(num_nodes, csr, path, hops=DEFAULT_HOPS, max_nodes=LOD_MAX_NODES):
+    """GraphView of the path plus its ``hops``-hop neighbourhood (up to max_nodes vertices in all).
+
+    Without a path the view is centred on vertex 0; a longer path is thinned
+    to max_nodes vertices, the skipped ones end up in clusters.
+    """
+    adjacency = csr[0]
+    offsets = adjacency.offsets
+    targets = adjacency.targets
+    weights = adjacency.weights
+    kept = dict.fromkeys(_thin_path(path, max_nodes) if path else [0])
+    frontier = list(kept)
+    for _ in range(hops):
+        reached = []
+        for u in frontier:
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if v not in kept and len(kept) < max_nodes:
+                    kept[v] = None
+                    reached.append(v)
+        frontier = reached
+
+    edges = {}
+    for u in kept:
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if u < v and v in kept:
+                w = weights[i]
+                if w < edges.get((u, v), w + 1):
+                    edges[(u, v)] = w
+
+    # Multi-source BFS: every hidden vertex joins the cluster of the visible vertex reaching it first
+    owner = [-1] * num_nodes
+    for u in kept:
+        owner[u] = u
+    sizes = dict.fromkeys(kept, 0)
+    queue = deque(kept)
+    while queue:
+        u = queue.popleft()
+        anchor = owner[u]
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if owner[v] == -1:
+                owner[v] = anchor
+                sizes[anchor] += 1
+                queue.append(v)
+    clusters = [(anchor, size) for anchor, size in sizes.items() if size]
+    unreached = num_nodes - len(kept) - sum(size for _, size in clusters)
+    return GraphView(list(kept), [(u, v, w) for (u, v), w in edges.items()], clusters, unreached)
+
+
+def view_positions(view, positions=None, seed=42):
+    """Positions of a view's nodes and clusters: ({node: (x, y)}, [(x, y) per cluster]).
+
+    With the graph's full layout the visible vertices keep their places and
+    each cluster sits just outside its anchor; otherwise the view itself
+    (clusters included) is laid out.
+    """
+    if positions is not None:
+        coords = {u: (float(positions[u][0]), float(positions[u][1])) for u in view.nodes}
+        cx = sum(x for x, _ in coords.values()) / len(coords)
+        cy = sum(y for _, y in coords.values()) / len(coords)
+        placed = []
+        for anchor, _ in view.clusters:
+            x, y = coords[anchor]
+            dx, dy = x - cx, y - cy
+            norm = (dx * dx + dy * dy) ** 0.5 or 1.0
+            placed.append((x + 0.08 * dx / norm, y + 0.08 * dy / norm))
+        return coords, placed
+    if len(view.nodes) > LOD_MAX_NODES or len(view.clusters) > len(view.nodes):
+        raise ValueError(f"Views without a full layout are limited to {LOD_MAX_NODES} nodes")
+    index = {u: i for i, u in enumerate(view.nodes)}
+    us = [index[u] for u, _, _ in view.edges]
+    vs = [index[v] for _, v, _ in view.edges]
+    for i, (anchor, _) in enumerate(view.clusters):
+        us.append(index[anchor])
+        vs.append(len(view.nodes) + i)
+    pos = force_layout(len(view.nodes) + len(view.clusters), np.array(us, dtype=np.int64),
+                       np.array(vs, dtype=np.int64), seed=seed)
+    coords = {u: (float(pos[i][0]), float(pos[i][1])) for u, i in index.items()}
+    placed = [(float(x), float(y)) for x, y in pos[len(view.nodes):]]
+    return coords, placed
@@ -0,0 +1,237 @@
+"""Load large graphs from files.
+
+Two formats are accepted:
+
+* text edge lists (SNAP, CSV or TSV): one ``u v [weight]`` edge per line,
+  separated by whitespace, tabs or commas. Lines starting with ``#`` or
+  ``%`` are comments. A missing weight counts as 1 and extra columns are
+  ignored. Unless ``num_nodes`` is given the graph has ``max id + 1`` nodes.
+* the binary CSR format written by ``save_csr``. It is memory-mapped, so
+  loading it costs no parsing at all.
+
+Text files are read in fixed-size chunks. With NumPy each chunk is parsed
+and the CSR is built with array operations; without it the loader streams
+the lines through ``build_csr``.
+
+Convert a text edge list once, then load the binary file::
+
+    python -m engine.loaders edges.txt graph.csr
+"""
+import io
+import os
+import sys
+
+from .csr import _MAGIC, CSRAdjacency, EdgeArray, build_csr, load_csr, save_csr
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+    HAVE_NUMPY = False
+
+CHUNK_SIZE = 16 * 2 ** 20
+_COMMENTS = (b'#', b'%')
+_DTYPES = {'i': 'int32', 'q': 'int64', 'd': 'float64'}
+
+
+def is_binary_graph(path):
+    with open(path, 'rb') as f:
+        return f.read(len(_MAGIC)) == _MAGIC
+
+
+def load_graph(path, num_nodes=None, mmap=True, verify=False):
+    """Load a graph file in either format; returns (num_nodes, csr).
+
+    ``verify`` checks that a binary file is a consistent graph, for files
+    that did not come from save_csr on this machine (e.g. uploads).
+    """
+    if is_binary_graph(path):
+        stored_nodes, csr = load_csr(path, mmap=mmap)
+        if num_nodes is not None and num_nodes != stored_nodes:
+            raise ValueError(f"Graph file has {stored_nodes} nodes, expected {num_nodes}")
+        if verify:
+            check_csr(stored_nodes, csr)
+        return stored_nodes, csr
+    return read_edge_list(path, num_nodes)
+
+
+def check_csr(num_nodes, csr):
+    """Raise ValueError unless the arrays describe a valid graph with num_nodes nodes."""
+    adjacency, edges = csr
+    offsets = adjacency.offsets
+    if num_nodes <= 0 or offsets[0] != 0 or offsets[num_nodes] != 2 * len(edges):
+        raise ValueError("Corrupt graph file: bad offsets")
+    if HAVE_NUMPY:
+        ordered = bool((np.diff(np.frombuffer(offsets, dtype=np.int64)) >= 0).all())
+    else:
+        ordered = all(offsets[i] <= offsets[i + 1] for i in range(num_nodes))
+    if not ordered:
+        raise ValueError("Corrupt graph file: bad offsets")
+    for ids in (edges.us, edges.vs, adjacency.targets):
+        if len(ids) and (min(ids) < 0 or max(ids) >= num_nodes):
+            raise ValueError(f"Nodes must be between 0 and {num_nodes - 1}")
+
+
+def read_edge_list(path, num_nodes=None, chunk_size=CHUNK_SIZE):
+    """Parse a text edge list into (num_nodes, csr)."""
+    if HAVE_NUMPY:
+        return _read_numpy(path, num_nodes, chunk_size)
+    edges = list(_iter_edges(path, chunk_size))
+    if num_nodes is None:
+        num_nodes = 1 + max((max(u, v) for u, v, _ in edges), default=-1)
+    if num_nodes <= 0:
+        raise ValueError("Graph file contains no edges")
+    return num_nodes, build_csr(num_nodes, edges)
+
+
+def _chunks(path, chunk_size):
+    """Yield blocks of whole lines from the file."""
+    with open(path, 'rb') as f:
+        rest = b''
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            data = rest + data
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                rest = data
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+        if rest:
+            yield rest + b'\n'
+
+
+def _parse_line(line, lineno):
+    fields = line.replace(b',', b' ').split()
+    if len(fields) < 2:
+        raise ValueError(f"Line {lineno}: expected 'u v [weight]'")
+    try:
+        u, v = int(fields[0]), int(fields[1])
+        if len(fields) < 3:
+            return u, v, 1
+        try:
+            return u, v, int(fields[2])
+        except ValueError:
+            return u, v, float(fields[2])
+    except ValueError:
+        raise ValueError(f"Line {lineno}: invalid number in {line.strip().decode(errors='replace')!r}")
+
+
+def _iter_lines(path, chunk_size):
+    """Yield (line number, line) for every non-blank, non-comment line."""
+    lineno = 0
+    for chunk in _chunks(path, chunk_size):
+        for line in chunk.splitlines():
+            lineno += 1
+            line = line.strip()
+            if line and not line.startswith(_COMMENTS):
+                yield lineno, line
+
+
+def _iter_edges(path, chunk_size):
+    for lineno, line in _iter_lines(path, chunk_size):
+        yield _parse_line(line, lineno)
+
+
+def _parse_chunk(chunk, first_line):
+    """Parse a block of lines into a (rows, 3) array of u, v, weight.
+
+    The fast path hands the whole block to NumPy's C parser, which only
+    accepts it when every line has the same number of fields; extra columns
+    are then dropped and a missing weight column becomes 1. A block whose
+    lines disagree (or that has a bad number) is parsed again line by line,
+    with the same rules, reporting the number of a bad line.
+    """
+    if not any(line.strip() and not line.lstrip().startswith(_COMMENTS) for line in chunk.splitlines()):
+        return np.zeros((0, 3), dtype=np.int64)  # only comments: NumPy would warn about an empty input
+    # One comment character keeps NumPy on its fast path; '%' never occurs in a number
+    text = chunk.replace(b',', b' ').replace(b'%', b'#').decode('ascii', errors='replace')
+    floating = '.' in text or 'e' in text or 'E' in text or 'n' in text
+    try:
+        values = np.loadtxt(io.StringIO(text), dtype=np.float64 if floating else np.int64, comments='#', ndmin=2)
+    except ValueError:
+        values = None
+    if values is not None and values.shape[1] >= 2:
+        if values.shape[1] >= 3:
+            return values[:, :3]
+        return np.column_stack([values, np.ones(len(values), dtype=values.dtype)])
+    rows = []
+    for lineno, line in enumerate(chunk.splitlines(), first_line):
+        line = line.strip()
+        if line and not line.startswith(_COMMENTS):
+            rows.append(_parse_line(line, lineno))
+    floating = any(isinstance(w, float) for _, _, w in rows)
+    return np.array(rows, dtype=np.float64 if floating else np.int64).reshape(len(rows), 3)
+
+
+def _read_numpy(path, num_nodes, chunk_size):
+    us, vs, ws = [], [], []
+    first_line = 1
+    for chunk in _chunks(path, chunk_size):
+        block = _parse_chunk(chunk, first_line)
+        first_line += chunk.count(b'\n')
+        if block.dtype == np.float64 and not np.array_equal(block[:, :2], np.floor(block[:, :2])):
+            raise ValueError("Node ids must be integers")
+        us.append(block[:, 0].astype(np.int64))
+        vs.append(block[:, 1].astype(np.int64))
+        ws.append(block[:, 2])
+    us = np.concatenate(us) if us else np.zeros(0, dtype=np.int64)
+    vs = np.concatenate(vs) if vs else np.zeros(0, dtype=np.int64)
+    ws = np.concatenate(ws) if ws else np.zeros(0, dtype=np.int64)
+    if ws.dtype == np.float64 and np.array_equal(ws, np.floor(ws)) and np.abs(ws).max(initial=0) < 2 ** 53:
+        ws = ws.astype(np.int64)
+    if not len(us):
+        raise ValueError("Graph file contains no edges")
+    if num_nodes is None:
+        num_nodes = int(max(us.max(), vs.max())) + 1
+    if num_nodes <= 0:
+        raise ValueError("Graph file contains no edges")
+    return num_nodes, csr_from_numpy(num_nodes, us, vs, ws)
+
+
+def _view(values, typecode):
+    """Typed memoryview over a NumPy array, so the CSR shares its buffer without a copy."""
+    return memoryview(np.ascontiguousarray(values, dtype=_DTYPES[typecode])).cast('B').cast(typecode)
+
+
+def csr_from_numpy(num_nodes, us, vs, ws):
+    """Vectorized build_csr over NumPy edge arrays; same layout and neighbour order."""
+    if len(us) and (min(us.min(), vs.min()) < 0 or max(us.max(), vs.max()) >= num_nodes):
+        raise ValueError(f"Nodes must be between 0 and {num_nodes - 1}")
+    idx = 'i' if num_nodes < 2 ** 31 else 'q'
+    wt = 'd' if ws.dtype.kind == 'f' else 'q'
+    m = len(us)
+    # Edge i contributes slot 2i (u -> v) and 2i + 1 (v -> u); a stable sort by
+    # source keeps each vertex's neighbours in edge insertion order.
+    src = np.empty(2 * m, dtype=np.int64)
+    src[0::2] = us
+    src[1::2] = vs
+    dst = np.empty(2 * m, dtype=np.int64)
+    dst[0::2] = vs
+    dst[1::2] = us
+    if num_nodes * 2 * m < 2 ** 62:
+        # Unique keys (source, slot) give the stable order with the faster unstable sort
+        order = np.argsort(src * (2 * m) + np.arange(2 * m))
+    else:
+        order = np.argsort(src, kind='stable')
+    offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=num_nodes), out=offsets[1:])
+    adjacency = CSRAdjacency(_view(offsets, 'q'), _view(dst[order], idx), _view(np.repeat(ws, 2)[order], wt))
+    return adjacency, EdgeArray(_view(us, idx), _view(vs, idx), _view(ws, wt))
+
+
+def main(argv):
+    if len(argv) != 2:
+        print("usage: python -m engine.loaders EDGE_LIST OUTPUT")
+        return 2
+    num_nodes, csr = load_graph(argv[0], mmap=False)
+    save_csr(argv[1], num_nodes, csr)
+    print(f"{argv[1]}: {num_nodes} nodes, {len(csr[1])} edges, {os.path.getsize(argv[1])} bytes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,123 @@
+"""Per-request phase timings and search counters, exported as Prometheus text.
+
+A request fills a :class:`Phases` as it goes (decoding, graph building,
+preprocessing, the search, step text, serialization) and picks up the
+counters the algorithm keeps in ``graph.stats``. :class:`Metrics` adds
+finished requests up and renders them in the Prometheus text format.
+
+Each gunicorn worker has its own Metrics, so every sample carries a
+``pid`` label: a scrape sees one worker, and sums over pids give the
+whole server.
+"""
+from contextlib import contextmanager
+import os
+import threading
+import time
+
+# graph.stats key -> counter name
+SEARCH_COUNTERS = {
+    'visited_count': 'search_settled',
+    'update_count': 'search_relaxations',
+    'heap_pushes': 'search_heap_pushes',
+}
+
+_HELP = {
+    'requests': ('counter', "Requests handled, by endpoint and HTTP status."),
+    'request_seconds': ('summary', "Wall time of whole requests."),
+    'phase_seconds': ('summary', "Wall time spent in each phase of a request."),
+    'search_settled': ('counter', "Vertices settled or visited by searches."),
+    'search_relaxations': ('counter', "Distance updates (edge relaxations) made by searches."),
+    'search_heap_pushes': ('counter', "Priority queue pushes made by searches."),
+}
+
+
+class Phases:
+    """Wall time of each phase of one request, plus the counters of its search."""
+
+    def __init__(self):
+        self.times = {}
+        self.stats = {}
+        self.algorithm = None
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - t0
+
+    def server_timing(self):
+        """Value for a Server-Timing header (durations in ms), shown by browser dev tools."""
+        return ', '.join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.times.items())
+
+    def summary(self):
+        return {'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in self.times.items()},
+                'stats': dict(self.stats)}
+
+
+def _labels(labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels)
+
+
+class Metrics:
+    """Thread-safe counters and summaries (count + sum) with a Prometheus text rendering."""
+
+    def __init__(self, prefix='k34_'):
+        self.prefix = prefix
+        self._counters = {}  # (name, labels) -> value
+        self._summaries = {}  # (name, labels) -> [count, sum]
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._summaries.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += value
+
+    def record(self, endpoint, status, seconds, phases):
+        """Add one finished request."""
+        self.inc('requests', endpoint=endpoint, status=status)
+        self.observe('request_seconds', seconds, endpoint=endpoint)
+        for name, spent in phases.times.items():
+            self.observe('phase_seconds', spent, endpoint=endpoint, phase=name)
+        if phases.algorithm:
+            for key, name in SEARCH_COUNTERS.items():
+                if key in phases.stats:
+                    self.inc(name, phases.stats[key], algorithm=phases.algorithm)
+
+    def render(self, samples=()):
+        """Prometheus text format; ``samples`` adds (name, type, help, value) values read at scrape time."""
+        # Read at scrape time: workers forked after the app was loaded share their parent's Metrics
+        pid = (('pid', os.getpid()),)
+        with self._lock:
+            counters = sorted(self._counters.items())
+            summaries = sorted(self._summaries.items())
+        out = []
+        declared = set()
+
+        def declare(name, kind, text):
+            if name not in declared:
+                declared.add(name)
+                out.append(f"# HELP {self.prefix}{name} {text}")
+                out.append(f"# TYPE {self.prefix}{name} {kind}")
+
+        for (name, labels), value in counters:
+            kind, text = _HELP[name]
+            declare(name + '_total', kind, text)
+            out.append(f"{self.prefix}{name}_total{{{_labels(labels + pid)}}} {value}")
+        for (name, labels), (count, total) in summaries:
+            kind, text = _HELP[name]
+            declare(name, kind, text)
+            out.append(f"{self.prefix}{name}_count{{{_labels(labels + pid)}}} {count}")
+            out.append(f"{self.prefix}{name}_sum{{{_labels(labels + pid)}}} {total:.6f}")
+        for name, kind, text, value in samples:
+            declare(name, kind, text)
+            out.append(f"{self.prefix}{name}{{{_labels(pid)}}} {value}")
+        return '\n'.join(out) + '\n'
@@ -0,0 +1,102 @@
+"""Minimum spanning trees: Kruskal and Prim.
+
+Kruskal sorts ``self.edges`` by weight once and keeps every edge whose
+ends a UnionFind still sees as separate; Prim grows the tree from a start
+vertex with a heap of candidate edges (lazy deletion, like Dijkstra).
+Both return the same total weight. On a disconnected graph they return a
+minimum spanning forest, one tree per connected component.
+"""
+import heapq
+
+from .components import UnionFind
+from .graph import Graph
+from .tracing import NullTracer
+
+
+class MST(Graph):
+    allow_negative_weights = True  # a spanning tree only compares weights
+
+    def kruskal(self, tracer=None):
+        """Minimum spanning forest by Kruskal: (total weight, [(u, v, weight), ...])."""
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        edges = self.edges
+        if hasattr(edges, 'us'):
+            us, vs, ws = edges.us, edges.vs, edges.ws
+        else:
+            us, vs, ws = ([e[i] for e in edges] for i in range(3))
+        if tracer.enabled:
+            tracer.emit('mst_start', 'Kruskal', self.num_nodes, len(ws))
+        uf = UnionFind(self.num_nodes)
+        union = uf.union
+        tree = []
+        total = 0
+        examined = 0
+        for i in sorted(range(len(ws)), key=ws.__getitem__):
+            examined += 1
+            u, v, w = us[i], vs[i], ws[i]
+            if union(u, v):
+                tree.append((u, v, w))
+                total += w
+                if full:
+                    tracer.emit('mst_take', u, v, w)
+                if uf.count == 1:
+                    break  # spanning tree complete, the remaining edges would all close cycles
+            elif full:
+                tracer.emit('mst_skip', u, v, w)
+        self.stats = {'visited_count': examined, 'trees': uf.count}
+        if tracer.enabled:
+            tracer.emit('mst_done', 'Kruskal', total, len(tree), uf.count)
+        return total, tree
+
+    def prim(self, start=0, tracer=None):
+        """Minimum spanning forest by Prim from ``start``: (total weight, [(u, v, weight), ...]).
+
+        When the heap runs dry before every vertex is in a tree, a new tree
+        is started from the lowest-numbered vertex still outside.
+        """
+        self.check_node(start)
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        graph = self.graph
+        if tracer.enabled:
+            tracer.emit('mst_start', 'Prim', self.num_nodes, len(self.edges))
+        in_tree = bytearray(self.num_nodes)
+        best = [float('inf')] * self.num_nodes  # lightest known edge into each vertex outside the tree
+        tree = []
+        total = 0
+        trees = 0
+        heap_pushes = 0
+        root = start
+        next_root = 0
+        while root is not None:
+            trees += 1
+            heap = [(0, -1, root)]
+            while heap:
+                w, u, v = heapq.heappop(heap)
+                if in_tree[v]:
+                    continue
+                in_tree[v] = 1
+                if u != -1:
+                    tree.append((u, v, w))
+                    total += w
+                    if full:
+                        tracer.emit('mst_take', u, v, w)
+                for x, wx in graph[v]:
+                    # Only an edge lighter than the best one seen can change x's key (lazy decrease-key)
+                    if wx < best[x] and not in_tree[x]:
+                        best[x] = wx
+                        heapq.heappush(heap, (wx, v, x))
+                        heap_pushes += 1
+            root = None
+            while next_root < self.num_nodes:
+                if not in_tree[next_root]:
+                    root = next_root
+                    break
+                next_root += 1
+        self.stats = {'visited_count': self.num_nodes, 'heap_pushes': heap_pushes, 'trees': trees}
+        if tracer.enabled:
+            tracer.emit('mst_done', 'Prim', total, len(tree), trees)
+        return total, tree
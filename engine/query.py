@@ -0,0 +1,177 @@
+"""Single entry point that runs one algorithm query on a graph."""
+from .cache import RecordingTracer, query_key
+from .ch import CH
+from .csr import build_csr, csr_digest
+from .kpaths import DEFAULT_K, KShortestPaths
+from .metrics import Phases
+from .mst import MST
+from .search import BFS, DFS, Dijkstra, BellmanFord, AStar
+from .tracing import NullTracer
+
+# Dijkstra search strategies: settle the whole graph, stop at the target, or search from both ends
+SEARCH_MODES = ('full', 'target', 'bidirectional')
+
+ALGORITHMS = {
+    'bfs': BFS,
+    'dfs': DFS,
+    'dijkstra': Dijkstra,
+    'bellmanford': BellmanFord,
+    'astar': AStar,
+    'ch': CH,
+    'kruskal': MST,
+    'prim': MST,
+    'yen': KShortestPaths,
+}
+
+# Point-to-point algorithms fast enough, or with results specific enough to one query, never to be cached
+UNCACHED = ('ch', 'yen')
+
+
+def make_graph(algo, num_nodes, csr, heuristic=None, landmarks=None, hierarchy=None):
+    """Instantiate the algorithm class for ``algo`` over an already built CSR.
+
+    A* without a heuristic (None or empty) uses landmark bounds; 'ch' builds
+    its contraction hierarchy unless ``hierarchy`` is given.
+    """
+    if algo not in ALGORITHMS:
+        raise KeyError(algo)
+    if algo == 'astar':
+        return AStar(num_nodes, heuristic or None, csr=csr, landmarks=landmarks)
+    if algo == 'ch':
+        return CH(num_nodes, csr=csr, hierarchy=hierarchy)
+    return ALGORITHMS[algo](num_nodes, csr=csr)
+
+
+def run_query(algo, num_nodes, edges=None, start=None, end=None, heuristic=None, tracer=None, csr=None,
+              search='full', cache=None, graph_id=None, landmarks=None, hierarchy=None, phases=None,
+              components=None, k=None):
+    """Run one query and return a result dict ({'path': ...} plus 'dist' for shortest paths).
+
+    Either ``edges`` or a prebuilt ``csr`` (as returned by build_csr) must be given.
+    For Dijkstra, ``search`` picks one of SEARCH_MODES; the point-to-point modes
+    return only the start-end 'distance' instead of the whole 'dist' array, and
+    every Dijkstra result reports how many vertices were 'settled'.
+
+    With a ResultCache, 'full' searches are looked up by graph content,
+    algorithm, start and trace mode, so asking again from the same start
+    (with any end) reuses the stored dist/prev and replays the steps. A
+    search whose trace has more events than the cache could hold
+    (ResultCache.max_events) is not cached, and its steps are not copied.
+    ``graph_id`` is the graph's csr_digest when the caller already has it.
+    ``landmarks`` is a precomputed LandmarkTable for A* without a heuristic,
+    ``hierarchy`` a precomputed contraction hierarchy for 'ch'. CH queries are
+    point-to-point and fast enough that they are never cached.
+    'kruskal' and 'prim' return a minimum spanning forest ('mst' edges, its
+    'weight' and number of 'trees'); Prim grows it from ``start`` (default 0).
+    'yen' returns the ``k`` (default DEFAULT_K) shortest loopless start-end
+    'paths' with their 'distances'; 'path' is the shortest of them.
+    ``components`` are the graph's component labels (components_for): a
+    point-to-point query (A*, CH, Dijkstra 'target'/'bidirectional') between
+    two components then returns "no path" without searching.
+    With ``phases`` (a metrics.Phases), the time spent building the graph,
+    searching and assembling the answer is recorded in it, along with the
+    search counters (none on a cache hit).
+    """
+    if search not in SEARCH_MODES:
+        raise ValueError(f"Search mode must be one of {', '.join(SEARCH_MODES)}")
+    if phases is None:
+        phases = Phases()
+    if csr is None:
+        with phases.phase('build'):
+            csr = build_csr(num_nodes, edges)
+    graph = make_graph(algo, num_nodes, csr, heuristic, landmarks, hierarchy)
+    if tracer is None:
+        tracer = NullTracer()
+    if components is not None and is_point_to_point(algo, search) and end is not None:
+        graph.check_node(start)
+        graph.check_node(end, "Goal")
+        if components[start] != components[end]:
+            if tracer.enabled:
+                tracer.emit('not_connected', start, end)
+            phases.stats = {'visited_count': 0}
+            return _no_path(algo)
+    if k is None:
+        k = DEFAULT_K
+    if cache is None or search != 'full' or algo in UNCACHED:
+        with phases.phase('search'):
+            raw = _search(graph, algo, start, end, tracer, search, k)
+    else:
+        with phases.phase('cache'):
+            key = query_key(graph_id or csr_digest(num_nodes, csr), algo, start, end, heuristic, tracer.mode)
+            entry = cache.get(key)
+        if entry is None:
+            # Traces too long to cache are not kept in memory past the cache's size either
+            recorder = RecordingTracer(tracer, cache.max_events())
+            with phases.phase('search'):
+                raw = _search(graph, algo, start, end, recorder, search, k)
+            if recorder.complete:
+                with phases.phase('cache'):
+                    cache.put(key, (recorder.events, raw))
+        else:
+            events, raw = entry
+            with phases.phase('replay'):
+                for event in events:
+                    tracer.emit(*event)
+    phases.stats = dict(graph.stats)
+    with phases.phase('answer'):
+        return _answer(graph, algo, start, end, raw, search)
+
+
+def is_point_to_point(algo, search):
+    """Whether the query only answers for one start-end pair (no 'dist' over all vertices)."""
+    return algo in ('astar', 'ch', 'yen') or (algo == 'dijkstra' and search != 'full')
+
+
+def _no_path(algo):
+    """Result of a point-to-point query between vertices that are not connected."""
+    if algo == 'astar':
+        return {'path': []}
+    if algo == 'yen':
+        return {'paths': [], 'distances': [], 'path': []}
+    return {'distance': None, 'path': [], 'settled': 0}
+
+
+def _search(graph, algo, start, end, tracer, search, k=DEFAULT_K):
+    """Run the search itself; the result does not depend on ``end`` unless the algorithm needs it."""
+    if algo in ('kruskal', 'prim'):
+        weight, tree = graph.kruskal(tracer) if algo == 'kruskal' else graph.prim(start or 0, tracer)
+        return {'mst': tree, 'weight': weight, 'trees': graph.stats['trees']}
+    if algo == 'yen':
+        found = graph.k_shortest(start, end, k, tracer)
+        return {'paths': [p for _, p in found], 'distances': [d for d, _ in found],
+                'path': found[0][1] if found else []}
+    if algo == 'bfs':
+        return {'path': graph.bfs(start, tracer)}
+    if algo == 'dfs':
+        return {'path': graph.dfs(start, tracer)}
+    if algo == 'astar':
+        return {'path': graph.a_star(start, end, tracer)}
+    if algo == 'ch':
+        distance, path = graph.query(start, end, tracer)
+        return {'distance': distance if path else None, 'path': path, 'settled': graph.stats['visited_count']}
+    if algo == 'dijkstra':
+        if search == 'bidirectional':
+            distance, path = graph.bidirectional(start, end, tracer)
+            return {'distance': distance if path else None, 'path': path,
+                    'settled': graph.stats['visited_count']}
+        dist, prev = graph.dijkstra(start, tracer, targets=[end] if search == 'target' else None)
+        return {'dist': dist, 'prev': prev, 'settled': graph.stats['visited_count']}
+    dist, prev = graph.bellman_ford(start, tracer)
+    return {'dist': dist, 'prev': prev, 'negative_cycle': graph.negative_cycle}
+
+
+def _answer(graph, algo, start, end, raw, search):
+    """Build the result for ``end`` from a single-source search."""
+    if 'prev' not in raw:
+        return raw
+    dist, prev = raw['dist'], raw['prev']
+    if algo == 'dijkstra':
+        path = graph.reconstruct_path(prev, end, start)
+        result = {'path': path, 'settled': raw['settled']}
+        if search == 'target':
+            result['distance'] = dist[end] if path else None
+        else:
+            result['dist'] = dist
+        return result
+    path = graph.reconstruct_path(prev, end, start) if dist is not None else []
+    return {'dist': dist, 'path': path, 'negative_cycle': raw['negative_cycle']}
@@ -0,0 +1,145 @@
+"""Server-side graph registry: upload a graph once, query it many times.
+
+Graphs are identified by a content hash and written to a shared directory,
+so every gunicorn worker can serve any graph id. Each worker keeps the
+graphs it has used in a memory-bounded LRU cache in front of that store.
+
+With ``max_age`` set, graphs nobody has uploaded or loaded for that many
+seconds are deleted from the store, together with the preprocessing
+files kept next to them.
+"""
+from collections import OrderedDict
+import os
+import threading
+import time
+
+from .ch import hierarchy_for
+from .components import components_for
+from .csr import build_csr, csr_digest, load_csr, save_csr
+from .landmarks import landmarks_for
+from .layout import layout_for
+from .loaders import load_graph
+
+SUFFIXES = ('.graph', '.landmarks', '.ch', '.components', '.layout')
+
+
+class GraphRegistry:
+    def __init__(self, directory, max_bytes=256 * 2 ** 20, max_age=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.cached_bytes = 0
+        self._cache = OrderedDict()  # graph_id -> (num_nodes, csr, nbytes)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, graph_id, suffix='.graph'):
+        if not graph_id.isalnum():
+            raise KeyError(graph_id)
+        return os.path.join(self.directory, graph_id + suffix)
+
+    def put(self, num_nodes, edges):
+        """Build and store a graph; returns its id. Re-uploading the same graph is cheap."""
+        if num_nodes <= 0:
+            raise ValueError("Number of nodes must be positive")
+        return self.put_csr(num_nodes, build_csr(num_nodes, edges))
+
+    def put_file(self, path, num_nodes=None):
+        """Store a graph read from an edge-list or binary graph file; returns its id."""
+        num_nodes, csr = load_graph(path, num_nodes, verify=True)
+        return self.put_csr(num_nodes, csr)
+
+    def put_csr(self, num_nodes, csr):
+        graph_id = csr_digest(num_nodes, csr)
+        path = self._path(graph_id)
+        if not self._touch(path):
+            save_csr(path, num_nodes, csr)
+            self.cleanup()
+        self._remember(graph_id, num_nodes, csr)
+        return graph_id
+
+    def get(self, graph_id):
+        """Return (num_nodes, csr) for a stored graph; raises KeyError if unknown."""
+        with self._lock:
+            entry = self._cache.get(graph_id)
+            if entry is not None:
+                self._cache.move_to_end(graph_id)
+        path = self._path(graph_id)
+        if not self._touch(path):
+            raise KeyError(graph_id)
+        if entry is not None:
+            return entry[0], entry[1]
+        # Memory-mapped: workers share the pages and loading costs no parsing
+        num_nodes, csr = load_csr(path, mmap=True)
+        self._remember(graph_id, num_nodes, csr)
+        return num_nodes, csr
+
+    def landmarks(self, graph_id, num_nodes, csr):
+        """ALT landmark table of a graph, built on first use and stored next to it."""
+        return landmarks_for(self._path(graph_id, '.landmarks'), num_nodes, csr, digest=graph_id)
+
+    def hierarchy(self, graph_id, num_nodes, csr):
+        """Contraction hierarchy of a graph, built on first use and stored next to it."""
+        return hierarchy_for(self._path(graph_id, '.ch'), num_nodes, csr, digest=graph_id)
+
+    def components(self, graph_id, num_nodes, csr):
+        """Component labels and count of a graph, computed on first use and stored next to it."""
+        return components_for(self._path(graph_id, '.components'), num_nodes, csr, digest=graph_id)
+
+    def layout(self, graph_id, num_nodes, csr):
+        """Full drawing layout of a graph, computed on first use and stored next to it."""
+        return layout_for(self._path(graph_id, '.layout'), num_nodes, csr, digest=graph_id)
+
+    def cleanup(self):
+        """Delete graphs not uploaded or loaded for max_age seconds, with their side files."""
+        if self.max_age is None:
+            return
+        cutoff = time.time() - self.max_age
+        expired = set()
+        for name in os.listdir(self.directory):
+            graph_id, dot, suffix = name.partition('.')
+            if dot + suffix not in SUFFIXES or not graph_id.isalnum():
+                continue
+            # A graph's side files expire with it; one left without its graph goes by its own age
+            for path in (self._path(graph_id), os.path.join(self.directory, name)):
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        expired.add(graph_id)
+                    break
+                except FileNotFoundError:
+                    pass
+        for graph_id in expired:
+            # The graph goes first, so a half-deleted graph is never served
+            for suffix in SUFFIXES:
+                try:
+                    os.remove(self._path(graph_id, suffix))
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                old = self._cache.pop(graph_id, None)
+                if old is not None:
+                    self.cached_bytes -= old[2]
+
+    def _touch(self, path):
+        """Mark a stored graph as used (for cleanup); False if it is not in the store."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def __contains__(self, graph_id):
+        return graph_id in self._cache or os.path.exists(self._path(graph_id))
+
+    def _remember(self, graph_id, num_nodes, csr):
+        nbytes = csr[0].nbytes() + csr[1].nbytes()
+        with self._lock:
+            old = self._cache.pop(graph_id, None)
+            if old is not None:
+                self.cached_bytes -= old[2]
+            self._cache[graph_id] = (num_nodes, csr, nbytes)
+            self.cached_bytes += nbytes
+            # Evict least recently used graphs, but always keep the one just used
+            while self.cached_bytes > self.max_bytes and len(self._cache) > 1:
+                _, (_, _, evicted) = self._cache.popitem(last=False)
+                self.cached_bytes -= evicted
@@ -0,0 +1,493 @@
+from collections import deque, namedtuple
+import heapq
+
+from .csr import build_csr
+from .graph import Graph
+from .landmarks import build_landmarks
+from .tracing import NullTracer
+
+
+class BFS(Graph):
+    """Breadth-First Search implementation."""
+    allow_negative_weights = True  # weights are ignored
+
+    def bfs(self, start, tracer=None):
+        self.check_node(start)
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        visited = [False] * self.num_nodes
+        queue = deque([start])
+        visited[start] = True
+        path = []
+        step = 1
+        if tracer.enabled:
+            tracer.emit('bfs_start', start)
+        while queue:
+            current = queue.popleft()
+            path.append(current)
+            step += 1
+            if full:
+                tracer.emit('bfs_pop', step, current)
+            for neighbor, _ in self.graph[current]:
+                if not visited[neighbor]:
+                    visited[neighbor] = True
+                    queue.append(neighbor)
+                    if full:
+                        tracer.emit('bfs_push', neighbor)
+        self.stats = {'visited_count': len(path)}
+        if tracer.enabled:
+            tracer.emit('bfs_done', len(path))
+            tracer.emit('visited_count', len(path))
+            tracer.emit('order', path)
+        return path
+
+
+DFSResult = namedtuple('DFSResult', 'pre post discovery finish parent')
+
+
+class DFS(Graph):
+    """Depth-First Search implementation."""
+    allow_negative_weights = True  # weights are ignored
+
+    def dfs(self, start, tracer=None):
+        """Return the visit (pre-)order of a depth-first search from start."""
+        return self.dfs_tree(start, tracer).pre
+
+    def dfs_tree(self, start, tracer=None):
+        """Depth-first search with an explicit stack.
+
+        Visits vertices in the same order as the recursive formulation but
+        needs no recursion, so it works on arbitrarily deep graphs. Returns a
+        DFSResult with pre- and post-order lists, discovery/finish timestamps
+        (-1 for unreached vertices) and the DFS-tree parent of every vertex.
+        """
+        self.check_node(start)
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        # Walk the CSR arrays with one integer cursor per vertex: the stack then
+        # holds plain ints, which keeps it cheap even a million frames deep.
+        adjacency = self.graph if self.frozen else build_csr(self.num_nodes, self.edges)[0]
+        offsets = adjacency.offsets
+        targets = adjacency.targets
+        cursor = list(offsets)
+        discovery = [-1] * self.num_nodes
+        finish = [-1] * self.num_nodes
+        parent = [-1] * self.num_nodes
+        pre = []
+        post = []
+        if tracer.enabled:
+            tracer.emit('dfs_start', start)
+        discovery[start] = 0
+        clock = 1
+        pre.append(start)
+        if full:
+            tracer.emit('dfs_visit', 1, start)
+        stack = [start]
+        while stack:
+            u = stack[-1]
+            i = cursor[u]
+            end = offsets[u + 1]
+            while i < end and discovery[targets[i]] != -1:
+                i += 1
+            if i < end:
+                v = targets[i]
+                cursor[u] = i + 1
+                if full:
+                    tracer.emit('dfs_descend', v, u)
+                parent[v] = u
+                discovery[v] = clock
+                clock += 1
+                pre.append(v)
+                if full:
+                    tracer.emit('dfs_visit', len(pre), v)
+                stack.append(v)
+            else:
+                stack.pop()
+                finish[u] = clock
+                clock += 1
+                post.append(u)
+        self.stats = {'visited_count': len(pre)}
+        if tracer.enabled:
+            tracer.emit('dfs_done', len(pre))
+            tracer.emit('visited_count', len(pre))
+            tracer.emit('order', pre)
+        return DFSResult(pre, post, discovery, finish, parent)
+
+
+class Dijkstra(Graph):
+    """Dijkstra's algorithm implementation for shortest paths."""
+    def dijkstra(self, start, tracer=None, targets=None):
+        """Single-source shortest paths; returns (dist, prev).
+
+        With ``targets`` the search stops as soon as every target is settled.
+        Distances and paths are then final for the targets (and every vertex
+        settled before them) but only tentative for the rest of the graph.
+        """
+        self.check_node(start)
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        graph = self.graph
+        dist = [float('inf')] * self.num_nodes
+        dist[start] = 0
+        prev = [-1] * self.num_nodes
+        heap = [(0, start)]
+        visited_count = 0
+        update_count = 0
+        remaining = None
+        if targets is not None:
+            remaining = set(targets)
+            for t in remaining:
+                self.check_node(t, "Target")
+        if tracer.enabled:
+            tracer.emit('sp_init', start)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            visited_count += 1
+            if full:
+                tracer.emit('dij_settle', u, d)
+            if remaining is not None and u in remaining:
+                remaining.discard(u)
+                if not remaining:
+                    break
+            for v, w in graph[u]:
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+                    update_count += 1
+                    if full:
+                        tracer.emit('dij_relax', v, nd, u)
+        self.stats = {'visited_count': visited_count, 'update_count': update_count,
+                      'heap_pushes': update_count + 1}
+        if tracer.enabled:
+            tracer.emit('dij_done', visited_count)
+            tracer.emit('update_count', update_count)
+        return dist, prev
+
+    def bidirectional(self, start, goal, tracer=None):
+        """Point-to-point shortest path searching from both ends at once.
+
+        Valid because Graph edges are undirected: the backward search uses the
+        same adjacency. Stops once the two frontiers' minimum keys add up to at
+        least the best meeting distance. Returns (distance, path), with
+        (inf, []) when goal is unreachable.
+        """
+        self.check_node(start)
+        self.check_node(goal, "Goal")
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        graph = self.graph
+        inf = float('inf')
+        n = self.num_nodes
+        dist = ([inf] * n, [inf] * n)
+        prev = ([-1] * n, [-1] * n)
+        heaps = ([(0, start)], [(0, goal)])
+        dist[0][start] = 0
+        dist[1][goal] = 0
+        best = 0 if start == goal else inf
+        meet = start if start == goal else -1
+        visited_count = 0
+        update_count = 0
+        if tracer.enabled:
+            tracer.emit('sp_init', start)
+        forward_heap, backward_heap = heaps
+        while forward_heap and backward_heap:
+            if forward_heap[0][0] + backward_heap[0][0] >= best:
+                break
+            side = 0 if forward_heap[0][0] <= backward_heap[0][0] else 1
+            heap = heaps[side]
+            d, u = heapq.heappop(heap)
+            mine = dist[side]
+            if d > mine[u]:
+                continue
+            visited_count += 1
+            if full:
+                tracer.emit('bidi_settle', u, 'xuôi' if side == 0 else 'ngược', d)
+            other = dist[1 - side]
+            parent = prev[side]
+            for v, w in graph[u]:
+                nd = d + w
+                if nd < mine[v]:
+                    mine[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+                    update_count += 1
+                    if full:
+                        tracer.emit('dij_relax', v, nd, u)
+                if mine[v] + other[v] < best:
+                    best = mine[v] + other[v]
+                    meet = v
+        self.stats = {'visited_count': visited_count, 'update_count': update_count,
+                      'heap_pushes': update_count + 2}
+        if tracer.enabled:
+            tracer.emit('bidi_done', visited_count)
+            tracer.emit('update_count', update_count)
+        if meet == -1:
+            return inf, []
+        path = []
+        node = meet
+        while node != -1:
+            path.append(node)
+            node = prev[0][node]
+        path.reverse()
+        node = prev[1][meet]
+        while node != -1:
+            path.append(node)
+            node = prev[1][node]
+        return best, path
+
+    def masked_path(self, start, goal, banned_nodes=(), banned_edges=None, potential=None):
+        """Point-to-point Dijkstra that never enters ``banned_nodes`` or uses ``banned_edges``.
+
+        ``banned_edges`` maps a vertex u to the set of neighbours v whose u-v
+        edges are off limits (list both directions). Masking instead of
+        copying the graph lets many related searches share one adjacency, as
+        Yen's spur searches do. ``potential`` optionally gives a consistent
+        lower bound on every vertex's distance to ``goal`` (inf where goal is
+        unreachable); the queue is then ordered by distance plus bound, as in
+        A*. Returns (distance, path), (inf, []) when goal cannot be reached.
+        """
+        self.check_node(start)
+        self.check_node(goal, "Goal")
+        graph = self.graph
+        inf = float('inf')
+        dist = {start: 0}
+        prev = {start: -1}
+        blocked = bytearray(self.num_nodes)
+        for u in banned_nodes:
+            blocked[u] = 1
+        if banned_edges is None:
+            banned_edges = {}
+        if potential is None:
+            potential = [0] * self.num_nodes
+        heap = [(potential[start], start)]
+        visited_count = 0
+        update_count = 0
+        while heap:
+            key, u = heapq.heappop(heap)
+            d = dist[u]
+            if key > d + potential[u]:
+                continue
+            visited_count += 1
+            if u == goal:
+                break
+            skip = banned_edges.get(u, ())
+            for v, w in graph[u]:
+                if blocked[v] or v in skip:
+                    continue
+                nd = d + w
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    prev[v] = u
+                    if potential[v] != inf:
+                        heapq.heappush(heap, (nd + potential[v], v))
+                        update_count += 1
+        self.stats = {'visited_count': visited_count, 'update_count': update_count,
+                      'heap_pushes': update_count + 1}
+        if goal not in dist or blocked[start]:
+            return inf, []
+        path = []
+        node = goal
+        while node != -1:
+            path.append(node)
+            node = prev[node]
+        path.reverse()
+        return dist[goal], path
+
+
+class BellmanFord(Graph):
+    """Bellman-Ford algorithm implementation for shortest paths."""
+    allow_negative_weights = True
+    METHODS = ('queue', 'passes')
+
+    def bellman_ford(self, start, tracer=None, method='queue'):
+        """Single-source shortest paths with arbitrary edge weights.
+
+        ``queue`` (SPFA-style) works in rounds and only rescans vertices
+        whose distance changed in the previous round; ``passes`` sweeps every
+        edge per pass but stops at the first pass without an update.
+
+        Edges are undirected, so a negative edge u - v reachable from start
+        is itself a negative cycle u -> v -> u, and with no reachable
+        negative edge there is no negative cycle. Returns (dist, prev), or
+        (None, None) with the cycle stored in self.negative_cycle.
+        """
+        self.check_node(start)
+        if method not in self.METHODS:
+            raise ValueError(f"Method must be one of {', '.join(self.METHODS)}")
+        if tracer is None:
+            tracer = NullTracer()
+        dist = [float('inf')] * self.num_nodes
+        dist[start] = 0
+        prev = [-1] * self.num_nodes
+        has_negative = (self.edges.min_weight() if self.frozen
+                        else min((w for _, _, w in self.edges), default=0)) < 0
+        if tracer.enabled:
+            tracer.emit('sp_init', start)
+        if method == 'queue':
+            update_count, rounds, cycle = self._relax_rounds(start, dist, prev, has_negative, tracer)
+        else:
+            update_count, rounds, cycle = self._relax_passes(dist, prev, has_negative, tracer)
+        self.stats = {'update_count': update_count, 'rounds': rounds}
+        self.negative_cycle = cycle
+        if cycle is not None:
+            if tracer.enabled:
+                tracer.emit('negative_cycle', cycle)
+            return None, None
+        if tracer.enabled:
+            tracer.emit('bf_done', update_count)
+        return dist, prev
+
+    def _relax_rounds(self, start, dist, prev, has_negative, tracer):
+        full = tracer.full
+        graph = self.graph
+        queued = [False] * self.num_nodes
+        current = [start]
+        update_count = 0
+        rounds = 0
+        while current:
+            rounds += 1
+            if full:
+                tracer.emit('bf_pass', rounds)
+            following = []
+            for u in current:
+                du = dist[u]
+                for v, w in graph[u]:
+                    if has_negative and w < 0:
+                        return update_count, rounds, [u, v, u]
+                    nd = du + w
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        prev[v] = u
+                        update_count += 1
+                        if full:
+                            tracer.emit('bf_relax', u, v, nd)
+                        if not queued[v]:
+                            queued[v] = True
+                            following.append(v)
+            for v in following:
+                queued[v] = False
+            current = following
+        return update_count, rounds, None
+
+    def _relax_passes(self, dist, prev, has_negative, tracer):
+        full = tracer.full
+        inf = float('inf')
+        update_count = 0
+        rounds = 0
+        for i in range(self.num_nodes - 1):
+            rounds += 1
+            if full:
+                tracer.emit('bf_pass', i + 1)
+            changed = False
+            for u, v, w in self.edges:
+                if has_negative and w < 0 and (dist[u] != inf or dist[v] != inf):
+                    return update_count, rounds, [u, v, u] if dist[u] != inf else [v, u, v]
+                if dist[u] + w < dist[v]:
+                    dist[v] = dist[u] + w
+                    prev[v] = u
+                    update_count += 1
+                    changed = True
+                    if full:
+                        tracer.emit('bf_relax', u, v, dist[v])
+                if dist[v] + w < dist[u]:
+                    dist[u] = dist[v] + w
+                    prev[u] = v
+                    update_count += 1
+                    changed = True
+                    if full:
+                        tracer.emit('bf_relax', v, u, dist[u])
+            if not changed:
+                if full:
+                    tracer.emit('bf_converged', i + 1)
+                break
+        if has_negative:
+            # A negative edge whose endpoint was only reached late in the last pass
+            for u, v, w in self.edges:
+                if w < 0 and (dist[u] != inf or dist[v] != inf):
+                    return update_count, rounds, [u, v, u] if dist[u] != inf else [v, u, v]
+        return update_count, rounds, None
+
+
+class AStar(Graph):
+    """A* algorithm implementation for shortest path with heuristic.
+
+    Without a heuristic list, A* uses landmark (ALT) lower bounds: the
+    ``landmarks`` table if given, otherwise one built on the first query.
+    """
+    def __init__(self, num_nodes, heuristic=None, csr=None, landmarks=None):
+        super().__init__(num_nodes, csr=csr)
+        if heuristic is not None and len(heuristic) != num_nodes:
+            raise ValueError(f"Heuristic list must have {num_nodes} values")
+        self.heuristic = heuristic
+        self.landmarks = landmarks
+
+    def add_edge(self, u, v, weight=1):
+        super().add_edge(u, v, weight)
+        self.landmarks = None  # bounds from the old graph may overestimate now
+
+    def landmark_table(self):
+        if self.landmarks is None:
+            csr = (self.graph, self.edges) if self.frozen else build_csr(self.num_nodes, self.edges)
+            self.landmarks = build_landmarks(self.num_nodes, csr)
+        return self.landmarks
+
+    def a_star(self, start, goal, tracer=None):
+        self.check_node(start)
+        self.check_node(goal, "Goal")
+        if tracer is None:
+            tracer = NullTracer()
+        full = tracer.full
+        heuristic = self.heuristic
+        if heuristic is None:
+            table = self.landmark_table()
+            heuristic = table.heuristic(goal)
+            if tracer.enabled:
+                tracer.emit('astar_landmarks', len(table))
+        graph = self.graph
+        g_score = [float('inf')] * self.num_nodes
+        g_score[start] = 0
+        parent = [-1] * self.num_nodes
+        closed = [False] * self.num_nodes
+        # (f, -g, node): on equal f prefer the deeper node
+        open_set = [(heuristic[start], 0, start)]
+        step = 0
+        pushes = 1
+        if tracer.enabled:
+            tracer.emit('astar_init', start, heuristic[start])
+        while open_set:
+            f, neg_g, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue  # stale entry superseded by a better push (lazy deletion)
+            closed[current] = True
+            g = -neg_g
+            step += 1
+            if full:
+                tracer.emit('astar_expand', step, current, f, g)
+            if current == goal:
+                if full:
+                    tracer.emit('astar_goal', goal)
+                break
+            for neighbor, weight in graph[current]:
+                if closed[neighbor]:
+                    continue
+                new_g = g + weight
+                if new_g < g_score[neighbor]:
+                    g_score[neighbor] = new_g
+                    parent[neighbor] = current
+                    new_f = new_g + heuristic[neighbor]
+                    heapq.heappush(open_set, (new_f, -new_g, neighbor))
+                    pushes += 1
+                    if full:
+                        tracer.emit('astar_push', neighbor, new_f, new_g, heuristic[neighbor])
+        self.stats = {'visited_count': step, 'heap_pushes': pushes}
+        if tracer.enabled:
+            tracer.emit('astar_done', step)
+        return self.reconstruct_path(parent, goal, start) if closed[goal] else []
@@ -0,0 +1,98 @@
+"""Step events saved on disk and read back a page at a time.
+
+A long trace can be many MB of text while the client only shows the
+first screen. Instead of putting it in the response, the events go to a
+directory shared by every web worker as JSON lines (``<id>.steps``, one
+``[code, *args]`` per line). An index of line offsets (``<id>.idx``) lets
+any worker read steps ``offset`` to ``offset + limit`` with two seeks,
+however long the trace.
+"""
+from array import array
+import json
+import os
+import time
+import uuid
+
+from .tracing import TRACE_FULL, Tracer, format_event
+
+
+class StepWriter(Tracer):
+    """Tracer that appends events to a step file instead of keeping them in memory."""
+
+    def __init__(self, store, mode=TRACE_FULL):
+        super().__init__(mode)
+        self.store = store
+        self.steps_id = uuid.uuid4().hex
+        self.count = 0
+        self._offsets = array('q', [0])
+        self._f = open(store.path(self.steps_id, '.steps.tmp'), 'w', encoding='utf-8')
+
+    def emit(self, *event):
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        self._f.write(line)
+        self._offsets.append(self._offsets[-1] + len(line.encode()))
+        self.count += 1
+
+    def close(self):
+        """Publish the steps (index first, so a visible step file always has one)."""
+        self._f.close()
+        with open(self.store.path(self.steps_id, '.idx'), 'wb') as f:
+            f.write(self._offsets)
+        os.replace(self.store.path(self.steps_id, '.steps.tmp'), self.store.path(self.steps_id, '.steps'))
+        return self.steps_id
+
+    def discard(self):
+        self._f.close()
+        os.remove(self.store.path(self.steps_id, '.steps.tmp'))
+
+
+class StepStore:
+    def __init__(self, directory, max_age=3600):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, steps_id, suffix):
+        if not steps_id.isalnum():
+            raise KeyError(steps_id)
+        return os.path.join(self.directory, steps_id + suffix)
+
+    def writer(self, mode=TRACE_FULL):
+        """A StepWriter for one query; call its close() once the query is done."""
+        self.cleanup()
+        return StepWriter(self, mode)
+
+    def page(self, steps_id, offset=0, limit=200):
+        """Steps offset..offset+limit as records, and the total number of steps.
+
+        Raises KeyError for an unknown (or expired) id.
+        """
+        try:
+            f = open(self.path(steps_id, '.steps'), 'rb')
+        except FileNotFoundError:
+            raise KeyError(steps_id) from None
+        with f, open(self.path(steps_id, '.idx'), 'rb') as idx:
+            total = os.fstat(idx.fileno()).st_size // 8 - 1
+            offset = max(0, min(offset, total))
+            end = min(offset + max(0, limit), total)
+            idx.seek(offset * 8)
+            bounds = array('q')
+            bounds.frombytes(idx.read((end - offset + 1) * 8))
+            f.seek(bounds[0])
+            data = f.read(bounds[-1] - bounds[0])
+        records = []
+        for i, line in enumerate(data.splitlines(), offset):
+            code, *args = json.loads(line)
+            records.append({'index': i, 'code': code, 'args': args, 'text': format_event((code, *args))})
+        return records, total
+
+    def cleanup(self):
+        """Delete steps older than max_age seconds."""
+        cutoff = time.time() - self.max_age
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
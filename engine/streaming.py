@@ -0,0 +1,91 @@
+"""Run a query while streaming its steps to the caller as they happen.
+
+The algorithm runs in a worker thread with a QueueTracer whose queue is
+bounded: when the consumer (an HTTP client reading a streamed response)
+falls behind, emit() blocks and the search pauses, so server memory stays
+bounded by ``max_pending`` events instead of growing with the step count.
+Closing the generator early cancels the search.
+"""
+import queue
+import threading
+
+from .query import run_query
+from .tracing import TRACE_FULL, Tracer, format_event
+
+_DONE = object()
+
+
+class StreamCancelled(Exception):
+    """Raised inside the algorithm thread once the consumer has gone away."""
+
+
+class QueueTracer(Tracer):
+    """Tracer that hands events to a bounded queue instead of storing them."""
+
+    def __init__(self, mode=TRACE_FULL, max_pending=1000):
+        super().__init__(mode)
+        self.queue = queue.Queue(max_pending)
+        self.cancelled = threading.Event()
+
+    def emit(self, *event):
+        self.put(event)
+
+    def put(self, item):
+        while True:
+            if self.cancelled.is_set():
+                raise StreamCancelled()
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def stream_query(mode=TRACE_FULL, batch_size=200, max_pending=1000, **query):
+    """Generator running ``run_query(**query)`` and yielding messages as dicts.
+
+    Yields ``{'steps': [...]}`` batches of formatted step text while the
+    search runs, then one final ``{'result': {...}}`` or ``{'error': '...'}``.
+    """
+    tracer = QueueTracer(mode, max_pending)
+    outcome = {}
+
+    def work():
+        try:
+            outcome['result'] = run_query(tracer=tracer, **query)
+        except StreamCancelled:
+            return
+        except Exception as e:
+            outcome['error'] = e
+        try:
+            tracer.put(_DONE)
+        except StreamCancelled:
+            pass
+
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    try:
+        done = False
+        while not done:
+            batch = []
+            item = tracer.queue.get()
+            while True:
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(format_event(item))
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    item = tracer.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                yield {'steps': batch}
+        thread.join()
+        if 'error' in outcome:
+            yield {'error': str(outcome['error'])}
+        else:
+            yield {'result': outcome['result']}
+    finally:
+        tracer.cancelled.set()
@@ -0,0 +1,104 @@
+"""Step tracing for the graph algorithms.
+
+Algorithms record steps as compact tuples ``(code, *args)`` instead of
+formatted strings. Text is only produced by :func:`format_event` when a
+caller actually asks for it, so ``none`` and ``summary`` modes keep the hot
+loops free of string building.
+"""
+
+TRACE_NONE = 'none'
+TRACE_SUMMARY = 'summary'
+TRACE_FULL = 'full'
+TRACE_MODES = (TRACE_NONE, TRACE_SUMMARY, TRACE_FULL)
+
+TEMPLATES = {
+    'bfs_start': "Bước 1: Đặt đỉnh bắt đầu {0} vào hàng đợi và đánh dấu đã thăm.",
+    'bfs_pop': "\nBước {0}: Lấy đỉnh {1} ra khỏi hàng đợi, duyệt các đỉnh kề:",
+    'bfs_push': "  → Thêm đỉnh {0} vào hàng đợi và đánh dấu đã thăm.",
+    'bfs_done': "\nKết thúc BFS. Số bước duyệt: {0}",
+    'dfs_start': "\nBắt đầu DFS từ đỉnh {0}.",
+    'dfs_visit': "\nBước {0}: Đến đỉnh {1}, duyệt các đỉnh kề:",
+    'dfs_descend': "  → Đi sâu đến đỉnh {0} từ đỉnh {1}.",
+    'dfs_done': "\nKết thúc DFS. Số bước duyệt: {0}",
+    'visited_count': "Số đỉnh đã duyệt: {0}",
+    'order': "Thứ tự duyệt: {0}",
+    'sp_init': "Khởi tạo khoảng cách từ đỉnh {0} đến các đỉnh khác là vô cùng, riêng {0} là 0.",
+    'dij_settle': "\nXét đỉnh {0} với khoảng cách hiện tại {1}.",
+    'dij_relax': "  → Cập nhật khoảng cách đến đỉnh {0}: {1} (qua {2})",
+    'dij_done': "\nKết thúc Dijkstra. Số đỉnh đã xét: {0}",
+    'bidi_settle': "\nXét đỉnh {0} (chiều {1}) với khoảng cách hiện tại {2}.",
+    'bidi_done': "\nKết thúc Dijkstra hai chiều. Số đỉnh đã xét: {0}",
+    'ch_start': "Truy vấn CH từ {0} đến {1}: tìm kiếm lên hai chiều trên {2} cạnh hướng lên.",
+    'ch_meet': "  → Hai chiều gặp nhau tại đỉnh {0}, độ dài tốt nhất hiện tại {1}.",
+    'ch_done': "\nKết thúc truy vấn CH. Số đỉnh đã xét: {0}",
+    'dyn_repair': "Cạnh ({0}, {1}) thay đổi: {2} đỉnh đổi khoảng cách, đã xét lại {3} đỉnh.",
+    'msbfs_start': "BFS nhiều nguồn: bắt đầu từ {0} đỉnh nguồn cùng lúc.",
+    'msbfs_level': "  → Mức {0}: thêm {1} đỉnh cách nguồn gần nhất {0} bước.",
+    'msbfs_done': "\nKết thúc BFS nhiều nguồn. Số đỉnh tới được: {0}",
+    'not_connected': "Đỉnh {0} và đỉnh {1} thuộc hai thành phần liên thông khác nhau: không có đường đi, bỏ qua tìm kiếm.",
+    'update_count': "Số lần cập nhật khoảng cách: {0}",
+    'bf_pass': "\nLặp lần thứ {0}:",
+    'bf_relax': "  → Cập nhật khoảng cách: {0} → {1} = {2}",
+    'bf_converged': "  → Không còn cập nhật nào ở lần lặp thứ {0}, dừng sớm.",
+    'negative_cycle': "Đồ thị có chu trình âm! Chu trình: {0}",
+    'bf_done': "\nKết thúc Bellman-Ford. Số lần cập nhật khoảng cách: {0}",
+    'astar_landmarks': "Heuristic: cận dưới từ {0} landmark (bất đẳng thức tam giác).",
+    'astar_init': "Khởi tạo: Đưa đỉnh bắt đầu {0} vào hàng đợi ưu tiên với heuristic = {1}.",
+    'astar_expand': "\nBước {0}: Lấy đỉnh {1} ra khỏi hàng đợi (f = {2}, g = {3}).",
+    'astar_goal': "  → Đã đến đỉnh đích {0}.",
+    'astar_push': "  → Thêm đỉnh {0} vào hàng đợi với f = {1} (g = {2}, heuristic = {3}).",
+    'astar_done': "\nKết thúc A*. Số bước mở rộng đỉnh: {0}",
+    'mst_start': "Bắt đầu {0}: tìm cây khung nhỏ nhất trên {1} đỉnh, {2} cạnh.",
+    'mst_take': "  → Chọn cạnh ({0}, {1}) trọng số {2}.",
+    'mst_skip': "  → Bỏ cạnh ({0}, {1}) trọng số {2}: tạo thành chu trình.",
+    'mst_done': "\nKết thúc {0}. Tổng trọng số cây khung: {1}, số cạnh: {2}, số cây: {3}",
+    'yen_path': "\nĐường đi ngắn thứ {0}: {1} (độ dài {2})",
+    'yen_spur': "  → Rẽ nhánh tại đỉnh {0}: bỏ {1} cạnh đã dùng và {2} đỉnh của đoạn gốc.",
+    'yen_done': "\nKết thúc Yen. Tìm được {0} đường đi sau {1} lần chạy Dijkstra.",
+}
+
+
+def format_event(event):
+    """Turn one ``(code, *args)`` event into its Vietnamese step text."""
+    return TEMPLATES[event[0]].format(*event[1:])
+
+
+class Tracer:
+    """Collects step events according to the trace mode.
+
+    ``full`` records every step, ``summary`` only the start/end lines and
+    ``none`` nothing at all. Algorithms test ``tracer.full`` /
+    ``tracer.enabled`` before emitting, so disabled events are never even
+    built. Subclasses override :meth:`emit` to send events elsewhere.
+    """
+
+    def __init__(self, mode=TRACE_FULL):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Trace mode must be one of {', '.join(TRACE_MODES)}")
+        self.mode = mode
+        self.enabled = mode != TRACE_NONE
+        self.full = mode == TRACE_FULL
+        self.events = []
+
+    def emit(self, *event):
+        self.events.append(event)
+
+    def lines(self):
+        return [format_event(e) for e in self.events]
+
+
+class PrintTracer(Tracer):
+    """Prints each step as it happens (CLI)."""
+
+    def emit(self, *event):
+        print(format_event(event))
+
+
+class NullTracer(Tracer):
+    """Records nothing; the default for batch use."""
+
+    def __init__(self):
+        super().__init__(TRACE_NONE)
+
+    def emit(self, *event):
+        pass
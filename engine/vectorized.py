@@ -0,0 +1,166 @@
+"""NumPy-backed Bellman-Ford and BFS kernels for dense-edge batch work.
+
+Both classes are drop-in subclasses of the pure-Python ones. They run whole
+passes / whole BFS levels as array operations over the CSR and edge arrays
+(viewed with np.frombuffer, no copy). A ``full`` tracer needs per-step
+events, so in that case they fall back to the pure-Python loop.
+
+NumPy is optional: ``HAVE_NUMPY`` is False when it is not installed and the
+classes then raise ImportError on construction.
+"""
+from .csr import build_csr, typecode_of
+from .search import BFS, BellmanFord
+from .tracing import NullTracer
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+    HAVE_NUMPY = False
+
+_DTYPES = {'i': 'int32', 'q': 'int64', 'd': 'float64'}
+
+
+def as_numpy(arr):
+    """Zero-copy NumPy view of an array.array or typed memoryview."""
+    return np.frombuffer(arr, dtype=_DTYPES[typecode_of(arr)])
+
+
+class _NumpyGraph:
+    def __init__(self, *args, **kwargs):
+        if not HAVE_NUMPY:
+            raise ImportError("NumPy is required for the vectorized engine")
+        super().__init__(*args, **kwargs)
+
+    def _csr(self):
+        if self.frozen:
+            return self.graph, self.edges
+        return build_csr(self.num_nodes, self.edges)
+
+
+def bfs_levels(adjacency, num_nodes, start):
+    """Return the BFS levels from start as a list of vertex arrays, each in queue order."""
+    offsets = as_numpy(adjacency.offsets)
+    targets = as_numpy(adjacency.targets)
+    visited = np.zeros(num_nodes, dtype=bool)
+    visited[start] = True
+    frontier = np.array([start], dtype=np.int64)
+    levels = [frontier]
+    while True:
+        first = offsets[frontier]
+        counts = offsets[frontier + 1] - first
+        total = int(counts.sum())
+        if total == 0:
+            break
+        # Index of every neighbour slot of the frontier, in frontier order
+        before = np.cumsum(counts) - counts
+        slots = np.arange(total) + np.repeat(first - before, counts)
+        neighbors = targets[slots]
+        neighbors = neighbors[~visited[neighbors]]
+        if neighbors.size == 0:
+            break
+        _, keep = np.unique(neighbors, return_index=True)
+        frontier = neighbors[np.sort(keep)].astype(np.int64)
+        visited[frontier] = True
+        levels.append(frontier)
+    return levels
+
+
+class NumpyBFS(_NumpyGraph, BFS):
+    """BFS that expands one whole frontier per step.
+
+    The visit order is identical to BFS.bfs: neighbours of the frontier are
+    gathered in frontier order and only the first occurrence of each newly
+    seen vertex is kept, exactly as the FIFO queue would.
+    """
+    def bfs(self, start, tracer=None):
+        if tracer is not None and tracer.full:
+            return super().bfs(start, tracer)
+        self.check_node(start)
+        if tracer is None:
+            tracer = NullTracer()
+        if tracer.enabled:
+            tracer.emit('bfs_start', start)
+        levels = bfs_levels(self._csr()[0], self.num_nodes, start)
+        path = np.concatenate(levels).tolist()
+        self.stats = {'visited_count': len(path), 'levels': len(levels)}
+        if tracer.enabled:
+            tracer.emit('bfs_done', len(path))
+            tracer.emit('visited_count', len(path))
+            tracer.emit('order', path)
+        return path
+
+
+class NumpyBellmanFord(_NumpyGraph, BellmanFord):
+    """Bellman-Ford where each pass relaxes every edge at once with np.minimum.at.
+
+    Passes are Jacobi-style (each reads the previous pass's distances), so
+    the pass count can differ from the in-place loop, but the distances are
+    exactly the same and prev is a valid shortest-path tree. On ties the
+    chosen predecessor may differ from the pure-Python classes. Integer
+    weights are summed in int64 (unreached vertices hold a sentinel), so
+    distances stay exact past 2**53.
+    """
+    def bellman_ford(self, start, tracer=None, method='queue'):
+        if tracer is not None and tracer.full:
+            return super().bellman_ford(start, tracer, method)
+        self.check_node(start)
+        if tracer is None:
+            tracer = NullTracer()
+        adjacency, edges = self._csr()
+        us = as_numpy(edges.us).astype(np.int64)
+        vs = as_numpy(edges.vs).astype(np.int64)
+        integral = typecode_of(edges.ws) != 'd'
+        dtype = np.int64 if integral else np.float64
+        unreached = np.iinfo(np.int64).max if integral else np.inf
+        ws = as_numpy(edges.ws).astype(dtype)
+        src = np.concatenate((us, vs))
+        dst = np.concatenate((vs, us))
+        weight = np.concatenate((ws, ws))
+        n = self.num_nodes
+        dist = np.full(n, unreached, dtype=dtype)
+        dist[start] = 0
+        prev = np.full(n, -1, dtype=np.int64)
+        if tracer.enabled:
+            tracer.emit('sp_init', start)
+
+        self.negative_cycle = None
+        negative = np.flatnonzero(ws < 0)
+        if negative.size:
+            # Undirected: a reachable negative edge is a negative cycle u -> v -> u
+            reached = np.zeros(n, dtype=bool)
+            reached[np.concatenate(bfs_levels(adjacency, n, start))] = True
+            hit = negative[reached[us[negative]] | reached[vs[negative]]]
+            if hit.size:
+                u, v = int(us[hit[0]]), int(vs[hit[0]])
+                self.negative_cycle = [u, v, u] if reached[u] else [v, u, v]
+                self.stats = {'update_count': 0, 'rounds': 0}
+                if tracer.enabled:
+                    tracer.emit('negative_cycle', self.negative_cycle)
+                return None, None
+
+        update_count = 0
+        rounds = 0
+        for _ in range(n - 1):
+            rounds += 1
+            base = dist[src]
+            candidate = base + weight
+            # Adding to the int64 sentinel wraps around: edges out of unreached vertices stay unreached
+            candidate[base == unreached] = unreached
+            relaxed = dist.copy()
+            np.minimum.at(relaxed, dst, candidate)
+            improved = relaxed < dist
+            if not improved.any():
+                break
+            # Record, for each improved vertex, an edge that achieved the new minimum
+            winners = improved[dst] & (candidate == relaxed[dst])
+            prev[dst[winners]] = src[winners]
+            update_count += int(improved.sum())
+            dist = relaxed
+
+        self.stats = {'update_count': update_count, 'rounds': rounds}
+        if tracer.enabled:
+            tracer.emit('bf_done', update_count)
+        dist = [float('inf') if d == unreached else d for d in dist.tolist()]
+        return dist, prev.tolist()
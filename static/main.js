@@ -9,6 +9,9 @@ const summaryDiv = document.getElementById('summary');
 const graphDiv = document.getElementById('graph');
 
 let network = null;
+// Đồ thị lớn hơn ngưỡng này (số đỉnh + số cạnh) chỉ vẽ phần quanh đường đi do server thu gọn
+// (đường đi, đỉnh lân cận và các cụm gộp), với vị trí tính sẵn và không có hiệu ứng
+const RENDER_FULL_LIMIT = 1500;
 
 const COMPLEXITY_INFO = {
     bfs: {
@@ -43,6 +46,44 @@ const COMPLEXITY_INFO = {
         formula: 'O(E)',
         calc: (V, E) => `O(${E})`,
         result: (V, E) => `O(${E})`
+    },
+    ch: {
+        // Truy vấn chỉ duyệt phần đồ thị hướng lên (sau bước tiền xử lý co đỉnh)
+        label: 'Contraction Hierarchy (truy vấn)',
+        formula: 'O(√V log V)',
+        calc: (V, E) => `O(√${V} × log₂${V})`,
+        result: (V, E) => {
+            const val = Math.sqrt(V) * Math.log2(V > 0 ? V : 1);
+            return `O(${val.toFixed(2)})`;
+        }
+    },
+    kruskal: {
+        label: 'Kruskal',
+        formula: 'O(E log E)',
+        calc: (V, E) => `O(${E} × log₂${E})`,
+        result: (V, E) => {
+            const val = E * Math.log2(E > 0 ? E : 1);
+            return `O(${val.toFixed(2)})`;
+        }
+    },
+    prim: {
+        label: 'Prim',
+        formula: 'O(E log V)',
+        calc: (V, E) => `O(${E} × log₂${V})`,
+        result: (V, E) => {
+            const val = E * Math.log2(V > 0 ? V : 1);
+            return `O(${val.toFixed(2)})`;
+        }
+    },
+    yen: {
+        // Mỗi đường đi mới chạy Dijkstra từ tối đa V đỉnh rẽ nhánh
+        label: 'Yen (k đường đi)',
+        formula: 'O(K × V × (V + E) log V)',
+        calc: (V, E) => `O(K × ${V} × (${V} + ${E}) × log₂${V})`,
+        result: (V, E) => {
+            const val = V * (V + E) * Math.log2(V > 0 ? V : 1);
+            return `O(K × ${val.toFixed(2)})`;
+        }
     }
 };
 
@@ -159,7 +200,7 @@ function addEdgeRow(tbody, numNodes, allowNegative) {
 
 function createHeuristicInput(numNodes) {
     const labelEl = document.createElement('label');
-    labelEl.textContent = `Nhập heuristic cho từng đỉnh, ${numNodes} số nguyên không âm):`;
+    labelEl.textContent = `Nhập heuristic cho từng đỉnh, ${numNodes} số nguyên không âm (để trống: tự động tính bằng landmark):`;
     const inputEl = document.createElement('input');
     inputEl.type = 'text';
     inputEl.id = 'heuristic';
@@ -186,28 +227,152 @@ function getEdgeListFromTable() {
     return edges;
 }
 
-function showSteps(steps) {
-    // Đánh số thứ tự cho từng bước, bỏ qua dòng trống
-    let html = '';
+// Trả về hàm thêm một lô bước vào khu vực hiển thị; số thứ tự bước được giữ giữa các lô
+function createStepRenderer() {
     let stepNum = 1;
-    for (let s of steps) {
-        if (s.trim() === '') continue;
-        // Nếu đã có 'Bước' ở đầu thì giữ nguyên, nếu không thì thêm số thứ tự
-        if (/^Bước\s*\d+/.test(s.trim())) {
-            html += `<div>${s}</div>`;
+    stepsDiv.innerHTML = '';
+    return function appendSteps(steps) {
+        const fragment = document.createDocumentFragment();
+        for (let s of steps) {
+            // Bỏ qua dòng trống
+            if (s.trim() === '') continue;
+            const div = document.createElement('div');
+            // Nếu đã có 'Bước' ở đầu thì giữ nguyên, nếu không thì thêm số thứ tự
+            if (/^Bước\s*\d+/.test(s.trim())) {
+                div.textContent = s;
+            } else {
+                const b = document.createElement('b');
+                b.textContent = `Bước ${stepNum}:`;
+                div.appendChild(b);
+                div.appendChild(document.createTextNode(' ' + s));
+                stepNum++;
+            }
+            fragment.appendChild(div);
+        }
+        stepsDiv.appendChild(fragment);
+        // Đợi trình duyệt vẽ xong lô này rồi mới đọc lô tiếp theo (backpressure)
+        return new Promise(resolve => requestAnimationFrame(() => resolve()));
+    };
+}
+
+function showSteps(steps) {
+    return createStepRenderer()(steps);
+}
+
+// Các bước được lưu trên server (steps: 'paged'); mỗi trang chỉ được tải khi người dùng cuộn tới cuối danh sách
+const STEPS_PAGE_SIZE = 200;
+let stepPager = null;
+
+function stopStepPages() {
+    if (!stepPager) return;
+    stepPager.observer.disconnect();
+    stepPager.sentinel.remove();
+    stepPager = null;
+}
+
+function showStepPages(stepsId, total) {
+    stopStepPages();
+    const appendSteps = createStepRenderer();
+    if (!total) return;
+    const sentinel = document.createElement('div');
+    stepsDiv.insertAdjacentElement('afterend', sentinel);
+    const pager = { sentinel, next: 0, loading: false };
+    pager.observer = new IntersectionObserver(async (entries) => {
+        if (!entries.some(entry => entry.isIntersecting) || pager.loading || pager.next === null) return;
+        pager.loading = true;
+        try {
+            const res = await fetch(`/steps/${stepsId}?offset=${pager.next}&limit=${STEPS_PAGE_SIZE}`);
+            const page = await res.json();
+            if (!res.ok) throw new Error(page.error);
+            // Kết quả cũ đến muộn sau khi đã chạy truy vấn mới thì bỏ qua
+            if (stepPager !== pager) return;
+            await appendSteps(page.steps.map(step => step.text));
+            pager.next = page.next;
+        } catch (err) {
+            console.error('Lỗi khi tải các bước:', err);
+            pager.next = null;
+        } finally {
+            pager.loading = false;
+        }
+        if (stepPager !== pager) return;
+        if (pager.next === null) {
+            stopStepPages();
         } else {
-            html += `<div><b>Bước ${stepNum}:</b> ${s}</div>`;
-            stepNum++;
+            // Quan sát lại để được gọi ngay nếu cuối danh sách vẫn còn trong màn hình
+            pager.observer.unobserve(sentinel);
+            pager.observer.observe(sentinel);
         }
-    }
-    stepsDiv.innerHTML = html;
+    });
+    stepPager = pager;
+    pager.observer.observe(sentinel);
 }
 
 function showSummary(text) {
     summaryDiv.textContent = text;
 }
 
-function showGraph(numNodes, edges, path=[]) {
+const GRAPH_STYLE = [
+    {
+        selector: 'node',
+        style: {
+            'background-color': '#1976d2',
+            'label': 'data(label)',
+            'color': '#fff',
+            'text-valign': 'center',
+            'text-halign': 'center',
+            'font-size': '18px',
+            'width': 40,
+            'height': 40,
+            'font-weight': 'bold',
+            'border-width': 2,
+            'border-color': '#fff'
+        }
+    },
+    {
+        selector: 'edge',
+        style: {
+            'width': 3,
+            'line-color': '#b0bec5',
+            'target-arrow-color': '#b0bec5',
+            'target-arrow-shape': 'triangle',
+            'curve-style': 'bezier',
+            'label': 'data(label)',
+            'font-size': '14px',
+            'text-background-color': '#fff',
+            'text-background-opacity': 1,
+            'text-background-padding': 2
+        }
+    },
+    {
+        selector: 'edge.highlighted',
+        style: {
+            'line-color': '#e53935',
+            'target-arrow-color': '#e53935',
+            'width': 5
+        }
+    },
+    {
+        // Cụm gộp các đỉnh bị ẩn trong chế độ thu gọn, nhãn là số đỉnh trong cụm
+        selector: 'node.cluster',
+        style: {
+            'background-color': '#cfd8dc',
+            'color': '#37474f',
+            'font-size': '12px',
+            'width': 'data(size)',
+            'height': 'data(size)'
+        }
+    },
+    {
+        selector: 'edge.cluster',
+        style: {
+            'line-style': 'dashed',
+            'label': '',
+            'target-arrow-shape': 'none'
+        }
+    }
+];
+
+function resetGraphArea() {
     // Xóa nội dung cũ
     graphDiv.innerHTML = '';
     // Đảm bảo icon tooltip luôn có mặt nếu đã chọn thuật toán
@@ -233,6 +398,24 @@ function showGraph(numNodes, edges, path=[]) {
         tooltipIcon.style.display = 'inline-block';
         graphDiv.appendChild(tooltipIcon);
     }
+}
+
+function edgeKeys(path, treeEdges) {
+    // Khóa "u_v" (cả hai chiều) của các cạnh cần tô: cạnh trên đường đi và cạnh của cây khung
+    const keys = new Set();
+    for (let i = 0; i < path.length-1; ++i) {
+        keys.add(`${path[i]}_${path[i+1]}`);
+        keys.add(`${path[i+1]}_${path[i]}`);
+    }
+    for (const [u, v] of treeEdges) {
+        keys.add(`${u}_${v}`);
+        keys.add(`${v}_${u}`);
+    }
+    return keys;
+}
+
+function showGraph(numNodes, edges, path=[], treeEdges=[]) {
+    resetGraphArea();
     // Tạo node và edge cho Cytoscape
     const cyNodes = Array.from({length: numNodes}, (_, i) => ({ data: { id: i.toString(), label: i.toString() } }));
     const cyEdges = edges.map(([u, v, w], idx) => ({
@@ -257,51 +440,18 @@ function showGraph(numNodes, edges, path=[]) {
             if (edge) edge.classes = 'highlighted';
         }
     }
+    // Cây khung được tô ngay, không có hiệu ứng từng bước
+    if (treeEdges.length) {
+        const onTree = edgeKeys([], treeEdges);
+        cyEdges.forEach(e => {
+            if (onTree.has(`${e.data.source}_${e.data.target}`)) e.classes = 'highlighted';
+        });
+    }
     // Khởi tạo Cytoscape
     const cy = cytoscape({
         container: graphDiv,
         elements: [ ...cyNodes, ...cyEdges ],
-        style: [
-            {
-                selector: 'node',
-                style: {
-                    'background-color': '#1976d2',
-                    'label': 'data(label)',
-                    'color': '#fff',
-                    'text-valign': 'center',
-                    'text-halign': 'center',
-                    'font-size': '18px',
-                    'width': 40,
-                    'height': 40,
-                    'font-weight': 'bold',
-                    'border-width': 2,
-                    'border-color': '#fff'
-                }
-            },
-            {
-                selector: 'edge',
-                style: {
-                    'width': 3,
-                    'line-color': '#b0bec5',
-                    'target-arrow-color': '#b0bec5',
-                    'target-arrow-shape': 'triangle',
-                    'curve-style': 'bezier',
-                    'label': 'data(label)',
-                    'font-size': '14px',
-                    'text-background-color': '#fff',
-                    'text-background-opacity': 1,
-                    'text-background-padding': 2
-                }
-            },
-            {
-                selector: 'edge.highlighted',
-                style: {
-                    'line-color': '#e53935',
-                    'target-arrow-color': '#e53935',
-                    'width': 5
-                }
-            }
-        ],
+        style: GRAPH_STYLE,
         layout: {
             name: 'cose',
             animate: true,
@@ -328,7 +478,62 @@ function showGraph(numNodes, edges, path=[]) {
     }
 }
 
+function showGraphView(view, path=[], treeEdges=[]) {
+    resetGraphArea();
+    // Vị trí do server tính sẵn (preset), không chạy bố cục và không có hiệu ứng
+    const SCALE = 400;
+    const onPath = edgeKeys(path, treeEdges);
+    const showLabels = view.edges.length <= 100;
+    const elements = view.nodes.map(n => ({
+        data: { id: n.id.toString(), label: n.id.toString() },
+        position: { x: n.x * SCALE, y: n.y * SCALE }
+    }));
+    view.edges.forEach(([u, v, w], idx) => elements.push({
+        data: { id: `e${u}_${v}_${idx}`, source: u.toString(), target: v.toString(),
+                label: showLabels ? w.toString() : '', weight: w },
+        classes: onPath.has(`${u}_${v}`) ? 'highlighted' : ''
+    }));
+    view.clusters.forEach((c, idx) => {
+        elements.push({
+            data: { id: `c${idx}`, label: c.size.toString(), size: 20 + 4 * Math.sqrt(c.size) },
+            position: { x: c.x * SCALE, y: c.y * SCALE },
+            classes: 'cluster'
+        });
+        elements.push({ data: { id: `ce${idx}`, source: `c${idx}`, target: c.anchor.toString() }, classes: 'cluster' });
+    });
+    cytoscape({
+        container: graphDiv,
+        elements: elements,
+        style: GRAPH_STYLE,
+        layout: { name: 'preset', fit: true }
+    });
+}
+
+async function renderGraph(numNodes, edges, path=[], treeEdges=[]) {
+    // Đồ thị nhỏ vẽ đầy đủ; đồ thị lớn nhờ server thu gọn quanh đường đi
+    if (numNodes + edges.length <= RENDER_FULL_LIMIT) {
+        showGraph(numNodes, edges, path, treeEdges);
+        return;
+    }
+    const res = await fetch('/graph-view', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({num_nodes: numNodes, edges: edges, path: path})
+    });
+    const view = await res.json();
+    if (!res.ok) {
+        alert(view.error || 'Lỗi server!');
+        return;
+    }
+    showGraphView(view, path, treeEdges);
+}
+
 function showGraphDict(numNodes, edges) {
+    if (numNodes + edges.length > RENDER_FULL_LIMIT) {
+        document.getElementById('graph-structure').textContent =
+            `Đồ thị lớn (${numNodes} đỉnh, ${edges.length} cạnh): không hiển thị toàn bộ cấu trúc.`;
+        return;
+    }
     // Dựng graph_dict dạng {i: [(v, w), ...], ...}
     const dict = {};
     for (let i = 0; i < numNodes; ++i) dict[i] = [];
@@ -393,6 +598,7 @@ algorithmSelect.addEventListener('change', () => {
     graphDiv.innerHTML = '';
     document.getElementById('graph-structure').textContent = '';
     if (network) network.destroy();
+    stopStepPages();
     const algo = algorithmSelect.value;
     showComplexity(algo, 0, 0);
     if (!algo) return;
@@ -412,7 +618,7 @@ algorithmSelect.addEventListener('change', () => {
         if (old) old.remove();
         const n = parseInt(numNodesInput.value) || 0;
         const m = parseInt(numEdgesInput.value) || 0;
-        const allowNegative = (algo === 'bellmanford');
+        const allowNegative = (algo === 'bellmanford' || algo === 'kruskal' || algo === 'prim');
         if (n > 0 && m >= 0) createEdgeTable(n, allowNegative, m);
         // Sau khi tạo bảng cạnh, thiết lập lại navigation
         setupTabEnterNavigation();
@@ -431,18 +637,22 @@ algorithmSelect.addEventListener('change', () => {
         });
     }
     let startInput = null, endInput = null;
-    if (algo === 'bfs' || algo === 'dfs') {
+    if (algo === 'bfs' || algo === 'dfs' || algo === 'prim') {
         startInput = createInput('Đỉnh bắt đầu (0 <= start < n):', 'start', 'number', 0, null, 0);
-    } else if (algo === 'dijkstra' || algo === 'bellmanford' || algo === 'astar') {
+    } else if (algo === 'dijkstra' || algo === 'bellmanford' || algo === 'astar' || algo === 'ch' || algo === 'yen') {
         startInput = createInput('Đỉnh bắt đầu (0 <= start < n):', 'start', 'number', 0, null, 0);
         endInput = createInput('Đỉnh kết thúc (0 <= end < n):', 'end', 'number', 0, null, 1);
     }
+    if (algo === 'yen') {
+        createInput('Số đường đi cần tìm (k >= 1):', 'k', 'number', 1, null, 3);
+    }
     // Thiết lập navigation cho tất cả input mới tạo
     setTimeout(setupTabEnterNavigation, 30);
 });
 
 algoForm.addEventListener('submit', async function(e) {
     e.preventDefault();
+    stopStepPages();
     stepsDiv.innerHTML = '';
     summaryDiv.innerHTML = '';
     graphDiv.innerHTML = '';
@@ -467,16 +677,17 @@ algoForm.addEventListener('submit', async function(e) {
             alert('Các đỉnh của cạnh phải nằm trong khoảng [0, n-1]!');
             return;
         }
-        if ((algo === 'dijkstra' || algo === 'astar') && w < 0) {
-            alert('Không được nhập cạnh có trọng số âm cho Dijkstra hoặc A*!');
+        if ((algo === 'dijkstra' || algo === 'astar' || algo === 'ch' || algo === 'yen') && w < 0) {
+            alert('Không được nhập cạnh có trọng số âm cho Dijkstra, A*, CH hoặc Yen!');
             return;
         }
     }
     let heuristic = [];
     if (algo === 'astar') {
         const hStr = document.getElementById('heuristic').value.trim();
-        heuristic = hStr.split(/\s+/).map(Number);
-        if (heuristic.length !== numNodes || heuristic.some(h => isNaN(h) || h < 0)) {
+        // Để trống: server tự dùng cận dưới landmark (ALT)
+        heuristic = hStr ? hStr.split(/\s+/).map(Number) : [];
+        if (hStr && (heuristic.length !== numNodes || heuristic.some(h => isNaN(h) || h < 0))) {
             alert('Heuristic phải là dãy số nguyên không âm, đủ số lượng đỉnh!');
             return;
         }
@@ -496,26 +707,48 @@ algoForm.addEventListener('submit', async function(e) {
             return;
         }
     }
+    let k = null;
+    if (document.getElementById('k')) {
+        k = parseInt(document.getElementById('k').value);
+        if (isNaN(k) || k < 1) {
+            alert('Số đường đi k phải là số nguyên dương!');
+            return;
+        }
+    }
     // Gửi dữ liệu lên API backend
     try {
-        const res = await fetch('/run-algorithm', {
+        const query = {algorithm: algo, start: start, end: end, heuristic: heuristic, k: k, steps: 'paged'};
+        let url = '/run-algorithm';
+        if (algo === 'ch') {
+            // CH chỉ chạy trên đồ thị đã tải lên kho: phân cấp được dựng một lần cho mọi truy vấn sau
+            const up = await fetch('/graphs', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({num_nodes: numNodes, edges: edges})
+            });
+            const uploaded = await up.json();
+            if (!up.ok) {
+                alert(uploaded.error || 'Lỗi server!');
+                return;
+            }
+            url = `/graphs/${uploaded.graph_id}/run`;
+        } else {
+            query.num_nodes = numNodes;
+            query.edges = edges;
+        }
+        const res = await fetch(url, {
             method: 'POST',
             headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify({
-                algorithm: algo,
-                num_nodes: numNodes,
-                edges: edges,
-                start: start,
-                end: end,
-                heuristic: heuristic
-            })
+            body: JSON.stringify(query)
         });
-        const data = await res.json();
         if (!res.ok) {
-            alert(data.error || 'Lỗi server!');
+            const err = await res.json();
+            alert(err.error || 'Lỗi server!');
             return;
         }
-        showSteps(data.steps || []);
+        const data = await res.json();
+        // Chỉ trang đầu của các bước được tải ngay, các trang sau tải khi cuộn xuống
+        showStepPages(data.steps_id, data.steps_total);
         // Hiển thị summary rõ ràng hơn cho từng thuật toán
         if (algo === 'bfs' || algo === 'dfs') {
             const path = data.path || [];
@@ -525,12 +758,15 @@ algoForm.addEventListener('submit', async function(e) {
                 summary += `\nĐộ dài đường đi: ${path.length-1}`;
             }
             showSummary(summary);
-            showGraph(numNodes, edges, path);
+            await renderGraph(numNodes, edges, path);
         } else if (algo === 'dijkstra' || algo === 'bellmanford') {
             const path = data.path || [];
             let summary = '';
             if (data.dist === null) {
                 summary = 'Đồ thị có chu trình âm!';
+                if (data.negative_cycle) {
+                    summary += `\nChu trình: [${data.negative_cycle.join(' → ')}]`;
+                }
             } else if (path.length) {
                 const cost = calcPathCost(edges, path);
                 summary = `Đường đi ngắn nhất từ ${start} đến ${end}: [${path.join(', ')}]`;
@@ -540,8 +776,9 @@ algoForm.addEventListener('submit', async function(e) {
                 summary = 'Không tồn tại đường đi.';
             }
             showSummary(summary);
-            showGraph(numNodes, edges, path);
-        } else if (algo === 'astar') {
+            // Có chu trình âm thì tô đỏ chu trình thay cho đường đi
+            await renderGraph(numNodes, edges, data.negative_cycle || path);
+        } else if (algo === 'astar' || algo === 'ch') {
             const path = data.path || [];
             let summary = '';
             if (path.length) {
@@ -553,7 +790,36 @@ algoForm.addEventListener('submit', async function(e) {
                 summary = 'Không tồn tại đường đi.';
             }
             showSummary(summary);
-            showGraph(numNodes, edges, path);
+            await renderGraph(numNodes, edges, path);
+        } else if (algo === 'kruskal' || algo === 'prim') {
+            const tree = data.mst || [];
+            let summary = `Tổng trọng số cây khung nhỏ nhất: ${data.weight}`;
+            summary += `\nSố cạnh của cây khung: ${tree.length}`;
+            if (data.trees > 1) {
+                summary += `\nĐồ thị không liên thông: rừng khung gồm ${data.trees} cây`;
+            }
+            if (tree.length <= 100) {
+                summary += `\nCác cạnh: ${tree.map(([u, v, w]) => `(${u}, ${v}, ${w})`).join(', ')}`;
+            }
+            showSummary(summary);
+            await renderGraph(numNodes, edges, [], tree);
+        } else if (algo === 'yen') {
+            const paths = data.paths || [];
+            let summary = '';
+            if (paths.length) {
+                summary = `${paths.length} đường đi ngắn nhất từ ${start} đến ${end}:`;
+                paths.forEach((p, i) => {
+                    summary += `\n${i + 1}. [${p.join(', ')}] (chi phí ${data.distances[i]})`;
+                });
+                if (paths.length < k) {
+                    summary += `\nChỉ có ${paths.length} đường đi không lặp đỉnh.`;
+                }
+            } else {
+                summary = 'Không tồn tại đường đi.';
+            }
+            showSummary(summary);
+            // Tô đường đi ngắn nhất (đường đầu tiên)
+            await renderGraph(numNodes, edges, data.path || []);
         }
     } catch (err) {
         console.error('Lỗi khi gọi API:', err);